@@ -1,9 +1,17 @@
 from django.contrib import admin, messages
-from django.db import transaction
 
-from .emails import send_invitation_email
-from .models import Invitation, InvitationRole, Profile, Role, User, UserRole
-from .services import provision_admin_only_invitation
+from .emails import enqueue_invitation_email
+from .models import (
+    Invitation,
+    InvitationEmail,
+    InvitationRole,
+    Profile,
+    RefreshToken,
+    Role,
+    User,
+    UserRole,
+)
+from .services import provision_admin_only_invitations
 
 
 def _is_profile_staff(user):
@@ -156,23 +164,21 @@ class InvitationAdmin(admin.ModelAdmin):
             obj.token_hash = Invitation.hash_token(raw_token)
         super().save_model(request, obj, form, change)
         if raw_token:
-            transaction.on_commit(
-                lambda: send_invitation_email(invitation=obj, raw_token=raw_token)
-            )
+            enqueue_invitation_email(invitation=obj, raw_token=raw_token)
 
     @admin.action(description="Provisionar acesso temporário (senha provisória)")
     def provision_temp_admin_access(self, request, queryset):
         total_ok = 0
-        for invitation in queryset:
-            try:
-                user, temp_password = provision_admin_only_invitation(
-                    invitation=invitation,
-                    provisioned_by=request.user,
-                )
-            except ValueError as exc:
+        results = provision_admin_only_invitations(
+            invitations=queryset,
+            provisioned_by=request.user,
+        )
+        for result in results:
+            invitation = result.invitation
+            if result.error:
                 self.message_user(
                     request,
-                    f"{invitation.email}: {exc}",
+                    f"{invitation.email}: {result.error}",
                     level=messages.ERROR,
                 )
                 continue
@@ -182,7 +188,8 @@ class InvitationAdmin(admin.ModelAdmin):
                 request,
                 (
                     f"{invitation.email} provisionado. "
-                    f"Login: {user.email} | Senha temporária: {temp_password}"
+                    f"Login: {result.user.email} | "
+                    f"Senha temporária: {result.temp_password}"
                 ),
                 level=messages.WARNING,  # destaque no admin
             )
@@ -199,3 +206,28 @@ class InvitationAdmin(admin.ModelAdmin):
 class InvitationRoleAdmin(SuperuserOnlyAdmin):
     list_display = ("id", "invitation", "role")
     list_filter = ("role",)
+
+
+@admin.register(InvitationEmail)
+class InvitationEmailAdmin(SuperuserOnlyAdmin):
+    list_display = (
+        "id",
+        "invitation",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("invitation__email",)
+    list_select_related = ("invitation",)
+    exclude = ("raw_token",)
+
+
+@admin.register(RefreshToken)
+class RefreshTokenAdmin(SuperuserOnlyAdmin):
+    list_display = ("id", "user", "family", "created_at", "expires_at", "revoked_at")
+    list_filter = ("revoked_at",)
+    search_fields = ("user__email", "family")
+    list_select_related = ("user",)
+    readonly_fields = ("jti", "family", "replaced_by")
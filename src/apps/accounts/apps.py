@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.accounts"
+
+    def ready(self):
+        from orgst.common.metrics import registry
+
+        from . import signals  # noqa: F401
+        from .metrics import accounts_metrics
+
+        registry.register_collector(accounts_metrics)
@@ -1,24 +1,51 @@
 from __future__ import annotations
 
+import secrets
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
 import jwt
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from ninja.constants import NOT_SET
 from ninja.security import HttpBearer
 
+from orgst.common.async_views import async_views_enabled
+
+from .keys import get_key_ring
+from .models import RefreshToken
+
 User = get_user_model()
 
 DEFAULT_ACCESS_MINUTES: int = getattr(settings, "JWT_ACCESS_MINUTES", 15)
-JWT_ALGORITHM: str = getattr(settings, "JWT_ALGORITHM", "HS256")
+DEFAULT_REFRESH_DAYS: int = getattr(settings, "JWT_REFRESH_DAYS", 14)
+
 
+def encode_jwt(payload: dict) -> str:
+    """Assina com a chave ativa (kid no header quando a chave é assimétrica)."""
+    key = get_key_ring().active
+    headers = {"kid": key.kid} if key.kid else None
+    return jwt.encode(payload, key.signing, algorithm=key.algorithm, headers=headers)
 
-def _jwt_secret() -> str:
+
+def decode_jwt(token: str, *, require: list[str]) -> dict:
     """
-    Em produção, prefira usar uma env separada (JWT_SECRET).
-    Se não existir, cai no SECRET_KEY do Django.
+    Verifica com a chave indicada pelo `kid` (já parseada no key ring).
+    Levanta jwt.PyJWTError se o token for inválido.
     """
-    return getattr(settings, "JWT_SECRET", settings.SECRET_KEY)
+    ring = get_key_ring()
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = ring.verification_key(kid)
+    if key is None:
+        raise jwt.InvalidKeyError("UNKNOWN_KID")
+    return jwt.decode(
+        token,
+        key.verifying,
+        algorithms=[key.algorithm],
+        options={"require": require},
+    )
 
 
 def create_access_token(user: User, *, minutes: int | None = None) -> str:
@@ -39,43 +66,183 @@ def create_access_token(user: User, *, minutes: int | None = None) -> str:
         "exp": int((now + timedelta(minutes=ttl)).timestamp()),
     }
 
-    return jwt.encode(payload, _jwt_secret(), algorithm=JWT_ALGORITHM)
+    return encode_jwt(payload)
+
+
+@dataclass(frozen=True)
+class TokenPair:
+    access: str
+    refresh: str
+
+
+def _issue_refresh(user: User, *, family=None) -> tuple[str, RefreshToken]:
+    now = datetime.now(UTC)
+    expires = now + timedelta(days=DEFAULT_REFRESH_DAYS)
+    record = RefreshToken.objects.create(
+        jti=secrets.token_urlsafe(24),
+        user=user,
+        expires_at=expires,
+        **({"family": family} if family else {}),
+    )
+
+    payload = {
+        "sub": str(user.id),
+        "typ": "refresh",
+        "jti": record.jti,
+        "fam": str(record.family),
+        "iat": int(now.timestamp()),
+        "exp": int(expires.timestamp()),
+    }
+    return encode_jwt(payload), record
+
+
+def create_refresh_token(user: User) -> str:
+    """
+    Gera um refresh token (JWT com typ "refresh") e registra o `jti`.
+    Claims: sub, typ, jti, fam (família de rotação), iat/exp.
+    """
+    token, _ = _issue_refresh(user)
+    return token
+
+
+def create_token_pair(user: User) -> TokenPair:
+    return TokenPair(
+        access=create_access_token(user), refresh=create_refresh_token(user)
+    )
+
+
+def _decode_refresh(token: str) -> dict:
+    try:
+        payload = decode_jwt(token, require=["exp", "iat", "sub", "jti"])
+    except jwt.PyJWTError:
+        raise ValueError("INVALID_REFRESH_TOKEN") from None
+    if payload.get("typ") != "refresh":
+        raise ValueError("INVALID_REFRESH_TOKEN")
+    return payload
+
+
+def revoke_refresh_family(family) -> int:
+    return RefreshToken.objects.filter(family=family, revoked_at__isnull=True).update(
+        revoked_at=timezone.now()
+    )
+
+
+def rotate_refresh_token(token: str) -> TokenPair:
+    """
+    Troca um refresh token válido por um par novo (sem hash de senha).
+
+    - o token apresentado é revogado e aponta para o sucessor;
+    - reapresentar um token já revogado revoga a família inteira
+      (`REFRESH_TOKEN_REUSED`), derrubando também quem o roubou.
+    """
+    payload = _decode_refresh(token)
+
+    with transaction.atomic():
+        record = (
+            RefreshToken.objects.select_for_update(of=("self",))
+            .select_related("user")
+            .filter(jti=payload["jti"], user_id=payload["sub"])
+            .first()
+        )
+        if record is None:
+            raise ValueError("INVALID_REFRESH_TOKEN")
+        if record.revoked_at is not None:
+            revoke_refresh_family(record.family)
+            reuse_detected = True
+        else:
+            reuse_detected = False
+            if not record.user.is_active:
+                raise ValueError("INVALID_REFRESH_TOKEN")
+
+            refresh, successor = _issue_refresh(record.user, family=record.family)
+            record.revoked_at = timezone.now()
+            record.replaced_by = successor.jti
+            record.save(update_fields=["revoked_at", "replaced_by"])
+
+    # fora do atomic: a revogação da família precisa ser commitada
+    if reuse_detected:
+        raise ValueError("REFRESH_TOKEN_REUSED")
+    return TokenPair(access=create_access_token(record.user), refresh=refresh)
+
+
+def revoke_refresh_token(token: str) -> None:
+    """Logout: revoga a família do token apresentado."""
+    payload = _decode_refresh(token)
+    family = (
+        RefreshToken.objects.filter(jti=payload["jti"], user_id=payload["sub"])
+        .values_list("family", flat=True)
+        .first()
+    )
+    if family is None:
+        raise ValueError("INVALID_REFRESH_TOKEN")
+    revoke_refresh_family(family)
+
+
+def purge_refresh_tokens(*, now=None) -> int:
+    """Apaga tokens vencidos; depois de expirados nem servem para detectar reuso."""
+    deleted, _ = RefreshToken.objects.filter(
+        expires_at__lte=now or timezone.now()
+    ).delete()
+    return deleted
+
+
+def access_token_user_id(token: str) -> str | None:
+    """`sub` de um access token válido, ou None (inválido, expirado, refresh)."""
+    try:
+        payload = decode_jwt(token, require=["exp", "iat", "sub"])
+    except jwt.PyJWTError:
+        return None
+
+    # Só aceita access token aqui
+    if payload.get("typ") != "access":
+        return None
+    return payload.get("sub") or None
 
 
 class JWTAuth(HttpBearer):
     """
     Autenticação Bearer para Django Ninja:
     - Lê Authorization: Bearer <token>
-    - Valida JWT (HS256 por padrão)
+    - Valida JWT (HS256 por padrão; EdDSA/RS256 com JWT_KEYS)
     - Seta request.user com o usuário autenticado
     """
 
     def authenticate(self, request, token: str) -> User | None:
-        try:
-            payload = jwt.decode(
-                token,
-                _jwt_secret(),
-                algorithms=[JWT_ALGORITHM],
-                options={"require": ["exp", "iat", "sub"]},
-            )
-
-            # Só aceita access token aqui
-            if payload.get("typ") != "access":
-                return None
-
-            user_id = payload.get("sub")
-            if not user_id:
-                return None
-
-            user = User.objects.filter(id=user_id, is_active=True).first()
-            if not user:
-                return None
-
-            # importante: manter request.user consistente para o resto do código
-            request.user = user
-            return user
-
-        except jwt.ExpiredSignatureError:
+        user_id = access_token_user_id(token)
+        if not user_id:
+            return None
+
+        user = User.objects.filter(id=user_id, is_active=True).first()
+        if not user:
+            return None
+
+        # importante: manter request.user consistente para o resto do código
+        request.user = user
+        return user
+
+
+class AsyncJWTAuth(JWTAuth):
+    """
+    Mesma regra do JWTAuth para operações `async def`: o Ninja aguarda o
+    `authenticate` no event loop em vez de mandar a auth para uma thread.
+    """
+
+    async def authenticate(self, request, token: str) -> User | None:
+        user_id = access_token_user_id(token)
+        if not user_id:
             return None
-        except jwt.PyJWTError:
+
+        user = await User.objects.filter(id=user_id, is_active=True).afirst()
+        if not user:
             return None
+
+        request.user = user
+        return user
+
+
+def read_auth():
+    """
+    `auth` das rotas com `async_variant`: AsyncJWTAuth quando API_ASYNC_VIEWS
+    registra a variante async; senão a auth padrão da API (JWTAuth).
+    """
+    return AsyncJWTAuth() if async_views_enabled() else NOT_SET
@@ -1,8 +1,45 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .hashing import check_password_constant_cost
+
+
+def find_user_by_identifier(identifier: str, *, fields: tuple[str, ...] = ()):
+    """
+    Busca por e-mail OU username (case-insensitive) numa única consulta.
+
+    Compara com Lower(email)/Lower(username), que batem com os índices
+    funcionais de User (iexact vira UPPER() e não usaria índice nenhum).
+    Se o identificador casar com o e-mail de um usuário e o username de
+    outro, o e-mail tem prioridade.
+    """
+    user_model = get_user_model()
+    needle = identifier.strip().lower()
+    if not needle:
+        return None
+
+    qs = user_model._default_manager.alias(
+        email_lower=Lower("email"), username_lower=Lower("username")
+    ).filter(Q(email_lower=needle) | Q(username_lower=needle))
+    if fields:
+        qs = qs.only(*{*fields, "email"})
+
+    candidates = list(qs[:2])
+    for user in candidates:
+        if user.email.lower() == needle:
+            return user
+    return candidates[0] if candidates else None
 
 
 class EmailOrUsernameBackend(ModelBackend):
+    """
+    Único backend de login: uma consulta indexada e, quando o usuário não
+    existe, um hash fictício com o mesmo custo (sem segunda passada pelo
+    ModelBackend padrão).
+    """
+
     def authenticate(self, request, username=None, password=None, **kwargs):
         user_model = get_user_model()
 
@@ -12,13 +49,9 @@ class EmailOrUsernameBackend(ModelBackend):
         if username is None or password is None:
             return None
 
-        user = user_model._default_manager.filter(email__iexact=username).first()
-        if user and user.check_password(password) and self.user_can_authenticate(user):
+        user = find_user_by_identifier(username)
+        if check_password_constant_cost(user, password) and self.user_can_authenticate(
+            user
+        ):
             return user
-
-        return super().authenticate(
-            request=request,
-            username=username,
-            password=password,
-            **kwargs,
-        )
+        return None
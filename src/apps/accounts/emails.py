@@ -1,9 +1,27 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Count, Min
+from django.template.loader import get_template
+from django.utils import timezone
 from django.utils.timezone import localtime
 
-from .models import Invitation
+from .models import EmailOutboxStatus, Invitation, InvitationEmail, InvitationStatus
+
+logger = logging.getLogger(__name__)
+
+INVITATION_EMAIL_SUBJECT = "ORGST DEV_PLATFORM v1.0.0"
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_BACKOFF_SECONDS = 30
+OUTBOX_MAX_BACKOFF_SECONDS = 60 * 60
 
 
 def build_invite_link(token: str) -> str:
@@ -11,23 +29,159 @@ def build_invite_link(token: str) -> str:
     return f"{base_url}?token={token}"
 
 
-def send_invitation_email(*, invitation: Invitation, raw_token: str) -> None:
-    invite_link = build_invite_link(raw_token)
+def build_invitation_message(
+    *, invitation: Invitation, raw_token: str
+) -> EmailMultiAlternatives:
     context = {
         "name": invitation.invitee_name,
-        "invite_link": invite_link,
+        "invite_link": build_invite_link(raw_token),
         "expires_at": localtime(invitation.expires_at).strftime("%d/%m/%Y %H:%M"),
     }
 
-    subject = "ORGST DEV_PLATFORM v1.0.0"
-    text_body = render_to_string("emails/invite.txt", context)
-    html_body = render_to_string("emails/invite.html", context)
-
+    # get_template passa pelo loader com cache: compila uma vez por processo
     message = EmailMultiAlternatives(
-        subject=subject,
-        body=text_body,
+        subject=INVITATION_EMAIL_SUBJECT,
+        body=get_template("emails/invite.txt").render(context),
         from_email=settings.DEFAULT_FROM_EMAIL,
         to=[invitation.email],
     )
-    message.attach_alternative(html_body, "text/html")
-    message.send(fail_silently=False)
+    message.attach_alternative(
+        get_template("emails/invite.html").render(context), "text/html"
+    )
+    return message
+
+
+def enqueue_invitation_email(*, invitation: Invitation, raw_token: str) -> None:
+    """Grava o e-mail no outbox (deve rodar na transação do convite)."""
+    InvitationEmail.objects.create(invitation=invitation, raw_token=raw_token)
+
+
+def enqueue_invitation_emails(items: list[tuple[Invitation, str]]) -> None:
+    """Versão em lote de `enqueue_invitation_email` (um INSERT por lote)."""
+    InvitationEmail.objects.bulk_create(
+        [InvitationEmail(invitation=inv, raw_token=token) for inv, token in items],
+        batch_size=500,
+    )
+
+
+@dataclass
+class OutboxDeliveryResult:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.retried + self.failed
+
+
+def _backoff(attempts: int) -> timedelta:
+    seconds = OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, OUTBOX_MAX_BACKOFF_SECONDS))
+
+
+def deliver_invitation_emails(
+    *,
+    batch_size: int = OUTBOX_BATCH_SIZE,
+    max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+) -> OutboxDeliveryResult:
+    """
+    Envia um lote do outbox reaproveitando uma única conexão SMTP.
+
+    As linhas do lote ficam travadas (skip_locked) durante o envio, então
+    vários workers podem rodar em paralelo sem duplicar mensagens.
+    """
+    result = OutboxDeliveryResult()
+    now = timezone.now()
+
+    with transaction.atomic():
+        batch = list(
+            InvitationEmail.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("invitation")
+            .filter(status=EmailOutboxStatus.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if not batch:
+            return result
+
+        connection = get_connection(fail_silently=False)
+        with connection:
+            for item in batch:
+                item.attempts += 1
+                try:
+                    if item.invitation.status != InvitationStatus.PENDING:
+                        raise ValueError("INVITATION_NOT_PENDING")
+                    message = build_invitation_message(
+                        invitation=item.invitation, raw_token=item.raw_token
+                    )
+                    connection.send_messages([message])
+                except ValueError as exc:
+                    item.status = EmailOutboxStatus.FAILED
+                    item.last_error = str(exc)
+                except Exception as exc:
+                    logger.warning(
+                        "invitation email %s failed (attempt %s): %s",
+                        item.id,
+                        item.attempts,
+                        exc,
+                    )
+                    item.last_error = str(exc)[:1000]
+                    if item.attempts >= max_attempts:
+                        item.status = EmailOutboxStatus.FAILED
+                    else:
+                        item.next_attempt_at = now + _backoff(item.attempts)
+                else:
+                    item.status = EmailOutboxStatus.SENT
+                    item.sent_at = timezone.now()
+                    item.last_error = ""
+
+                if item.status == EmailOutboxStatus.PENDING:
+                    result.retried += 1
+                else:
+                    # token puro não fica no banco depois de resolvido
+                    item.raw_token = ""
+                    if item.status == EmailOutboxStatus.SENT:
+                        result.sent += 1
+                    else:
+                        result.failed += 1
+                item.updated_at = timezone.now()
+
+        InvitationEmail.objects.bulk_update(
+            batch,
+            [
+                "status",
+                "attempts",
+                "next_attempt_at",
+                "last_error",
+                "sent_at",
+                "raw_token",
+                "updated_at",
+            ],
+        )
+
+    logger.info(
+        "invitation outbox: sent=%s retried=%s failed=%s",
+        result.sent,
+        result.retried,
+        result.failed,
+    )
+    return result
+
+
+def outbox_metrics() -> dict:
+    """Métricas de entrega do outbox (contagem por status + atraso da fila)."""
+    now = timezone.now()
+    counts = dict(
+        InvitationEmail.objects.values("status")
+        .annotate(n=Count("id"))
+        .values_list("status", "n")
+    )
+    pending = InvitationEmail.objects.filter(status=EmailOutboxStatus.PENDING)
+    oldest = pending.aggregate(m=Min("created_at"))["m"]
+    return {
+        "pending": counts.get(EmailOutboxStatus.PENDING, 0),
+        "sent": counts.get(EmailOutboxStatus.SENT, 0),
+        "failed": counts.get(EmailOutboxStatus.FAILED, 0),
+        "retrying": pending.filter(attempts__gt=0).count(),
+        "oldest_pending_seconds": int((now - oldest).total_seconds()) if oldest else 0,
+    }
@@ -0,0 +1,65 @@
+"""
+Hashers com parâmetros vindos do settings (calibrados com `benchmark_hashers`).
+
+Como `must_update` compara os parâmetros do hash salvo com os atuais, mudar
+o hasher preferido ou os parâmetros faz o Django re-hashear a senha no
+próximo login bem-sucedido, sem forçar reset.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self) -> int:
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt com custo definido por memória (N * r * 128 bytes) em vez de CPU.
+    `parallelism` fica em 1: o hashlib executa os blocos em sequência, então
+    p > 1 só multiplica o tempo por núcleo.
+    """
+
+    @property
+    def work_factor(self) -> int:
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self) -> int:
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self) -> int:
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+    @property
+    def maxmem(self) -> int:
+        # folga sobre o mínimo exigido pelo OpenSSL (128 * N * r); o piso
+        # garante verificar hashes antigos com N maior que o atual
+        needed = 2 * 128 * self.work_factor * self.block_size * self.parallelism
+        return max(needed, 64 * 1024 * 1024)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Requer `argon2-cffi` instalado (ver README)."""
+
+    @property
+    def time_cost(self) -> int:
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self) -> int:
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self) -> int:
+        return settings.PASSWORD_ARGON2_PARALLELISM
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import logging
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, get_hashers
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db.models import Count, Q
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+HASH_METRICS_PREFIX = "accounts:hash_cpu"
+HASH_METRIC_ENDPOINTS = ("auth_token", "register", "invitations_accept")
+# de quanto em quanto tempo o hash fictício acompanha a migração dos hashes
+DUMMY_HASH_TTL = 60 * 60
+
+_endpoint: ContextVar[str | None] = ContextVar("hash_endpoint", default=None)
+_dummy_hash: tuple[float, str] | None = None
+
+
+def _stored_majority_hasher():
+    """Hasher da maioria das senhas salvas (o preferido se não houver nenhuma)."""
+    hashers = get_hashers()
+    counts = get_user_model().objects.aggregate(
+        **{
+            f"h{i}": Count("pk", filter=Q(password__startswith=f"{h.algorithm}$"))
+            for i, h in enumerate(hashers)
+        }
+    )
+    best = max(range(len(hashers)), key=lambda i: (counts[f"h{i}"], -i))
+    return hashers[best]
+
+
+def dummy_password_hash() -> str:
+    """
+    Hash de uma senha aleatória com o algoritmo e os parâmetros que a maioria
+    das contas ainda usa: conferir contra ele custa o mesmo que conferir a
+    senha de um usuário existente, mesmo no meio de uma troca de hasher (o
+    rehash só acontece no login, então contas paradas ficam no antigo).
+    """
+    global _dummy_hash
+
+    now = time.monotonic()
+    if _dummy_hash is None or _dummy_hash[0] <= now:
+        hasher = _stored_majority_hasher()
+        encoded = hasher.encode(secrets.token_urlsafe(16), hasher.salt())
+        _dummy_hash = (now + DUMMY_HASH_TTL, encoded)
+    return _dummy_hash[1]
+
+
+@receiver(setting_changed)
+def _reset_dummy_hash(*, setting, **kwargs):
+    global _dummy_hash
+
+    if setting.startswith("PASSWORD_"):
+        _dummy_hash = None
+
+
+def check_password_constant_cost(user, password: str) -> bool:
+    """
+    Confere a senha pagando o custo de um hash mesmo quando o usuário não
+    existe ou está inativo, para não vazar pelo tempo de resposta quais
+    identificadores são válidos.
+    """
+    if user is None:
+        check_password(password, dummy_password_hash())
+        return False
+
+    # check_password refaz o hash com o hasher/parâmetros atuais quando o
+    # salvo está desatualizado (setter do AbstractBaseUser)
+    stored = user.password
+    valid = user.check_password(password)
+    if valid and user.password != stored:
+        endpoint = _endpoint.get()
+        if endpoint:
+            _incr(f"{HASH_METRICS_PREFIX}:{endpoint}:rehashes", 1)
+    return valid and user.is_active
+
+
+def _incr(key: str, delta: int) -> None:
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, delta)
+    except Exception:
+        logger.debug("hash metric %s not recorded", key)
+
+
+@contextmanager
+def hash_cpu(endpoint: str):
+    """
+    Mede o tempo de CPU da thread (time.thread_time, sem espera de I/O)
+    gasto no bloco e acumula por endpoint no cache compartilhado.
+    """
+    token = _endpoint.set(endpoint)
+    start = time.thread_time()
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+        micros = int((time.thread_time() - start) * 1_000_000)
+        _incr(f"{HASH_METRICS_PREFIX}:{endpoint}:calls", 1)
+        _incr(f"{HASH_METRICS_PREFIX}:{endpoint}:us", micros)
+
+
+def hash_metrics() -> dict[str, dict]:
+    keys = [
+        f"{HASH_METRICS_PREFIX}:{endpoint}:{field}"
+        for endpoint in HASH_METRIC_ENDPOINTS
+        for field in ("calls", "us", "rehashes")
+    ]
+    values = cache.get_many(keys)
+    metrics = {}
+    for endpoint in HASH_METRIC_ENDPOINTS:
+        calls = values.get(f"{HASH_METRICS_PREFIX}:{endpoint}:calls", 0)
+        micros = values.get(f"{HASH_METRICS_PREFIX}:{endpoint}:us", 0)
+        metrics[endpoint] = {
+            "calls": calls,
+            "cpu_seconds": round(micros / 1_000_000, 6),
+            "avg_cpu_ms": round(micros / calls / 1000, 3) if calls else 0.0,
+            "rehashes": values.get(f"{HASH_METRICS_PREFIX}:{endpoint}:rehashes", 0),
+        }
+    return metrics
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_KEY_SETTINGS = {
+    "JWT_SECRET",
+    "SECRET_KEY",
+    "JWT_ALGORITHM",
+    "JWT_KEYS",
+    "JWT_ACTIVE_KID",
+    "JWT_ACCEPT_HMAC",
+}
+
+
+@dataclass(frozen=True)
+class JWTKey:
+    kid: str | None
+    algorithm: str
+    signing: Any  # chave privada já parseada (ou o segredo HMAC); None = só verifica
+    verifying: Any
+
+    @property
+    def can_sign(self) -> bool:
+        return self.signing is not None
+
+
+@dataclass(frozen=True)
+class KeyRing:
+    """
+    Chaves parseadas uma vez por processo.
+
+    - Sem JWT_KEYS: HMAC (JWT_ALGORITHM, padrão HS256) com JWT_SECRET/SECRET_KEY.
+    - Com JWT_KEYS: chaves Ed25519 (EdDSA) ou RSA (RS256) identificadas por
+      `kid`; assina com JWT_ACTIVE_KID e verifica com qualquer uma, o que
+      permite rotação (chaves aposentadas podem ficar só com a pública).
+      Enquanto JWT_ACCEPT_HMAC estiver ligado, o segredo HMAC continua no
+      anel sob o kid None, só para verificar os tokens emitidos antes da troca.
+    """
+
+    active: JWTKey
+    keys: dict[str | None, JWTKey] = field(default_factory=dict)
+
+    def verification_key(self, kid: str | None) -> JWTKey | None:
+        return self.keys.get(kid)
+
+    def jwks(self) -> dict:
+        entries = []
+        for key in self.keys.values():
+            if key.kid is None:
+                continue  # segredo HMAC nunca é publicado
+            jwk = jwt.get_algorithm_by_name(key.algorithm).to_jwk(
+                key.verifying, as_dict=True
+            )
+            entries.append({**jwk, "kid": key.kid, "alg": key.algorithm, "use": "sig"})
+        return {"keys": entries}
+
+
+def _algorithm_for(public_key) -> str:
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    raise ValueError(f"UNSUPPORTED_JWT_KEY: {type(public_key).__name__}")
+
+
+def _read_pem(value: str) -> bytes:
+    # aceita o PEM inline ou o caminho de um arquivo
+    if value.lstrip().startswith("-----BEGIN"):
+        return value.encode()
+    path = Path(value)
+    if not path.is_absolute():
+        # relativo à raiz do projeto (onde fica o .env)
+        path = Path(settings.BASE_DIR).parent / path
+    return path.read_bytes()
+
+
+def _load_key(kid: str, value: str) -> JWTKey:
+    pem = _read_pem(value)
+    if b"PRIVATE KEY" in pem:
+        private = load_pem_private_key(pem, password=None)
+        public = private.public_key()
+    else:
+        private = None
+        public = load_pem_public_key(pem)
+    return JWTKey(
+        kid=kid, algorithm=_algorithm_for(public), signing=private, verifying=public
+    )
+
+
+def _hmac_key(*, can_sign: bool) -> JWTKey:
+    secret = getattr(settings, "JWT_SECRET", None) or settings.SECRET_KEY
+    algorithm = getattr(settings, "JWT_ALGORITHM", "HS256")
+    return JWTKey(
+        kid=None,
+        algorithm=algorithm,
+        signing=secret if can_sign else None,
+        verifying=secret,
+    )
+
+
+def _build_key_ring() -> KeyRing:
+    configured: dict[str, str] = getattr(settings, "JWT_KEYS", None) or {}
+    if not configured:
+        key = _hmac_key(can_sign=True)
+        return KeyRing(active=key, keys={None: key})
+
+    keys: dict[str | None, JWTKey] = {
+        kid: _load_key(kid, value) for kid, value in configured.items()
+    }
+    active_kid = getattr(settings, "JWT_ACTIVE_KID", None) or next(iter(keys))
+    active = keys.get(active_kid)
+    if active is None or not active.can_sign:
+        raise ValueError(f"JWT_ACTIVE_KID_WITHOUT_PRIVATE_KEY: {active_kid}")
+    if getattr(settings, "JWT_ACCEPT_HMAC", False):
+        # transição para JWT_KEYS: tokens HS256 sem kid (refresh de até
+        # JWT_REFRESH_DAYS) seguem válidos; desligar depois desse prazo
+        keys[None] = _hmac_key(can_sign=False)
+    return KeyRing(active=active, keys=keys)
+
+
+_key_ring: KeyRing | None = None
+_lock = threading.Lock()
+
+
+def get_key_ring() -> KeyRing:
+    global _key_ring
+
+    ring = _key_ring
+    if ring is None:
+        with _lock:
+            if _key_ring is None:
+                _key_ring = _build_key_ring()
+            ring = _key_ring
+    return ring
+
+
+def reset_key_ring() -> None:
+    global _key_ring
+
+    _key_ring = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(sender, setting, **kwargs):
+    # override_settings nos testes
+    if setting in _KEY_SETTINGS:
+        reset_key_ring()
@@ -0,0 +1,349 @@
+import json
+import logging
+import random
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import Profile, Role, User, UserRole
+from apps.community.models import Skill, UserSkill
+from apps.docs.models import Document, DocumentVersion, DocumentVisibility
+from apps.kanban.models import Board, Column, Task
+from apps.kanban.services import move_task, reorder_columns
+from apps.projects.models import Project
+from orgst.common.benchmark import (
+    HttpClient,
+    build_report,
+    compare_reports,
+    run_scenario,
+    write_report,
+)
+
+PASSWORD = "bench-Password-1"
+RESULTS_DIR = settings.BASE_DIR.parent / "benchmarks"
+# PNG 1x1 válido (o upload confere os magic bytes)
+PNG_1PX = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082"
+)
+
+SCENARIOS = (
+    "auth_token",
+    "accounts_me",
+    "docs_list",
+    "docs_get",
+    "docs_versions",
+    "community_members",
+    "avatar_upload",
+    "kanban_move_task",
+    "kanban_reorder_columns",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the hot API endpoints at fixed concurrency (p50/p95/p99 and "
+        "throughput) against the configured database and write a JSON report. "
+        "Seeds its own data and removes it afterwards unless --keep is given. "
+        "With --base-url the HTTP scenarios hit a running server (e.g. uvicorn "
+        "orgst.asgi:application) on the same database; kanban scenarios always "
+        "call the services in-process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--docs", type=int, default=200)
+        parser.add_argument("--versions", type=int, default=5, help="Per document")
+        parser.add_argument("--tasks", type=int, default=500)
+        parser.add_argument("--requests", type=int, default=200, help="Per scenario")
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--only", help=f"Comma-separated subset of: {', '.join(SCENARIOS)}"
+        )
+        parser.add_argument(
+            "--output", help="JSON path (default: benchmarks/<db>-<commit>.json)"
+        )
+        parser.add_argument("--compare", help="Previous JSON report to diff against")
+        parser.add_argument("--keep", action="store_true", help="Keep seeded rows")
+        parser.add_argument(
+            "--base-url",
+            help="Server to benchmark over HTTP, e.g. http://127.0.0.1:8000",
+        )
+
+    def handle(self, *args, **options):
+        names = SCENARIOS
+        if options["only"]:
+            names = tuple(n.strip() for n in options["only"].split(",") if n.strip())
+            unknown = set(names) - set(SCENARIOS)
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+        self.http = HttpClient(options["base_url"]) if options["base_url"] else None
+        self.rng = random.Random(options["seed"])
+        self.prefix = f"bench{self.rng.randrange(16**6):06x}"
+        scale = {k: options[k] for k in ("users", "docs", "versions", "tasks", "seed")}
+
+        self._seed(**scale)
+        try:
+            results = self._run(names, options)
+        finally:
+            if not options["keep"]:
+                self._cleanup()
+
+        report = build_report(
+            results,
+            scale=scale,
+            requests=options["requests"],
+            concurrency=options["concurrency"],
+            target=options["base_url"] or "in-process",
+        )
+        path = Path(
+            options["output"]
+            or RESULTS_DIR / f"{report['database']}-{report['commit'] or 'local'}.json"
+        )
+        write_report(report, path)
+
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text())
+            self.stdout.write("\nChange vs baseline (%):")
+            for row in compare_reports(baseline, report):
+                self.stdout.write(
+                    f"  {row['name']:<24} p50={row['p50_ms']} p95={row['p95_ms']} "
+                    f"p99={row['p99_ms']} rps={row['throughput_rps']}"
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"Report written to {path}"))
+
+    # ------------------------------------------------------------------ dados
+
+    def _seed(self, *, users: int, docs: int, versions: int, tasks: int, **_):
+        p = self.prefix
+        password = make_password(PASSWORD)  # um hash só: o custo é medido no login
+        self.users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{p}u{i}", email=f"{p}u{i}@bench.local", password=password
+                )
+                for i in range(max(users, 1))
+            ],
+            batch_size=1000,
+        )
+        Profile.objects.bulk_create(
+            [
+                Profile(
+                    user=u,
+                    display_name=f"Bench {i}",
+                    github_url="https://github.com/bench",
+                    linkedin_url="https://linkedin.com/in/bench",
+                )
+                for i, u in enumerate(self.users)
+            ],
+            batch_size=1000,
+        )
+
+        roles = list(Role.objects.all()) or [
+            Role.objects.create(key=f"{p}-member", label="Bench member")
+        ]
+        skills = Skill.objects.bulk_create(
+            [Skill(name=f"{p}-skill{i}") for i in range(10)]
+        )
+        UserRole.objects.bulk_create(
+            [UserRole(user=u, role=self.rng.choice(roles)) for u in self.users],
+            batch_size=1000,
+        )
+        UserSkill.objects.bulk_create(
+            [
+                UserSkill(user=u, skill=s)
+                for u in self.users
+                for s in self.rng.sample(skills, 3)
+            ],
+            batch_size=1000,
+        )
+
+        visibilities = list(DocumentVisibility.values)
+        self.docs = Document.objects.bulk_create(
+            [
+                Document(
+                    title=f"Bench doc {i}",
+                    slug=f"{p}-doc-{i}",
+                    summary="Benchmark document",
+                    visibility=self.rng.choice(visibilities),
+                    created_by=self.rng.choice(self.users),
+                )
+                for i in range(max(docs, 1))
+            ],
+            batch_size=1000,
+        )
+        DocumentVersion.objects.bulk_create(
+            [
+                DocumentVersion(
+                    document=d,
+                    version_number=n,
+                    body_md=f"# {d.title}\n\nRevision {n}.\n",
+                    authored_by=d.created_by,
+                )
+                for d in self.docs
+                for n in range(1, versions + 1)
+            ],
+            batch_size=1000,
+        )
+
+        owner = self.users[0]
+        self.project = Project.objects.create(name=f"{p} project", owner=owner)
+        self.board = Board.objects.create(project=self.project)
+        self.columns = Column.objects.bulk_create(
+            [
+                Column(board=self.board, name=name, position=i + 1)
+                for i, name in enumerate(("Backlog", "Doing", "Review", "Done"))
+            ]
+        )
+        per_column: dict[int, int] = {}
+        rows = []
+        for i in range(max(tasks, 1)):
+            column = self.columns[i % len(self.columns)]
+            per_column[column.id] = per_column.get(column.id, 0) + 1
+            rows.append(
+                Task(
+                    project=self.project,
+                    column=column,
+                    position=per_column[column.id],
+                    title=f"Task {i}",
+                    created_by=owner,
+                )
+            )
+        self.task_ids = [t.id for t in Task.objects.bulk_create(rows, batch_size=1000)]
+
+        self.tokens = [create_access_token(u) for u in self.users]
+
+    def _cleanup(self) -> None:
+        p = self.prefix
+        Project.objects.filter(pk=self.project.pk).delete()
+        Document.objects.filter(slug__startswith=f"{p}-").delete()
+        Skill.objects.filter(name__startswith=f"{p}-").delete()
+        User.objects.filter(username__startswith=p).delete()
+        Role.objects.filter(key=f"{p}-member").delete()
+
+    # -------------------------------------------------------------- cenários
+
+    def _transport(self):
+        return self.http or Client()
+
+    def _get(self, i: int, path: str):
+        token = self.tokens[i % len(self.tokens)]
+        return self._transport().get(path, headers={"Authorization": f"Bearer {token}"})
+
+    def _ok(self, response) -> bool:
+        return response.status_code < 400
+
+    def _scenario(self, name: str):
+        users = self.users
+        # get/versions em documentos que qualquer membro pode ver (sem 403)
+        docs = [
+            d for d in self.docs if d.visibility == DocumentVisibility.COMMUNITY
+        ] or self.docs
+
+        if name == "auth_token":
+            return lambda i: self._ok(
+                self._transport().post(
+                    "/api/v1/accounts/auth/token",
+                    {"identifier": users[i % len(users)].email, "password": PASSWORD},
+                    content_type="application/json",
+                )
+            )
+        if name == "accounts_me":
+            return lambda i: self._ok(self._get(i, "/api/v1/accounts/me"))
+        if name == "docs_list":
+            return lambda i: self._ok(self._get(i, "/api/v1/docs/docs"))
+        if name == "docs_get":
+            return lambda i: self._ok(
+                self._get(i, f"/api/v1/docs/docs/{docs[i % len(docs)].id}")
+            )
+        if name == "docs_versions":
+            return lambda i: self._ok(
+                self._get(i, f"/api/v1/docs/docs/{docs[i % len(docs)].id}/versions")
+            )
+        if name == "community_members":
+            return lambda i: self._ok(self._get(i, "/api/v1/community/members"))
+        if name == "avatar_upload":
+
+            def upload(i):
+                user = users[i % len(users)]
+                avatar = SimpleUploadedFile("a.png", PNG_1PX, "image/png")
+                token = self.tokens[i % len(self.tokens)]
+                return self._ok(
+                    self._transport().post(
+                        f"/api/v1/community/members/{user.id}/avatar",
+                        {"file": avatar},
+                        headers={"Authorization": f"Bearer {token}"},
+                    )
+                )
+
+            return upload
+        if name == "kanban_move_task":
+
+            def move(i):
+                task_id = self.task_ids[self.rng.randrange(len(self.task_ids))]
+                column = self.rng.choice(self.columns)
+                move_task(task_id, column.id, self.rng.randint(1, 50))
+                return True
+
+            return move
+        if name == "kanban_reorder_columns":
+
+            def reorder(i):
+                ids = [c.id for c in self.columns]
+                self.rng.shuffle(ids)
+                reorder_columns(self.board, ids)
+                return True
+
+            return reorder
+        raise CommandError(f"Unknown scenario: {name}")
+
+    def _run(self, names, options) -> list:
+        unlimited = {"ip": (10**9, 1), "identifier": (10**9, 1)}
+        results = []
+        # logs por request atrapalham a leitura (N+1 do middleware continua)
+        quiet = {
+            logging.getLogger("orgst.metrics"): logging.WARNING,
+            logging.getLogger("django.request"): logging.ERROR,
+        }
+        previous = {logger: logger.level for logger in quiet}
+        for logger, level in quiet.items():
+            logger.setLevel(level)
+        try:
+            with (
+                tempfile.TemporaryDirectory() as media_root,
+                override_settings(
+                    ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                    AUTH_RATE_LIMITS=unlimited,
+                    MEDIA_ROOT=media_root,
+                ),
+            ):
+                for name in names:
+                    result = run_scenario(
+                        name,
+                        self._scenario(name),
+                        requests=options["requests"],
+                        concurrency=options["concurrency"],
+                        warmup=options["warmup"],
+                    )
+                    results.append(result)
+                    self.stdout.write(
+                        f"{name:<24} p50={result.p50_ms:8.2f}ms "
+                        f"p95={result.p95_ms:8.2f}ms p99={result.p99_ms:8.2f}ms "
+                        f"{result.throughput_rps:8.1f} req/s errors={result.errors}"
+                    )
+                    for kind, count in result.error_kinds.items():
+                        self.stdout.write(f"{'':<24} {count:>5} x {kind}")
+        finally:
+            for logger, level in previous.items():
+                logger.setLevel(level)
+        return results
@@ -0,0 +1,132 @@
+import math
+import statistics
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.db.models.functions import Substr
+
+from apps.accounts.hashers import (
+    TunedArgon2PasswordHasher,
+    TunedPBKDF2PasswordHasher,
+    TunedScryptPasswordHasher,
+)
+from apps.accounts.models import User
+
+SAMPLE_PASSWORD = "correct horse battery staple"
+
+
+def _time_ms(fn, rounds: int) -> float:
+    fn()  # aquece (carrega biblioteca, aloca memória)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the configured password hashers on this machine and "
+        "recommend parameters for a target latency per hash"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=100.0,
+            help="Desired time for one hash on one core (default: 100)",
+        )
+        parser.add_argument("--rounds", type=int, default=3)
+
+    def handle(self, *args, **options):
+        target = options["target_ms"]
+        rounds = options["rounds"]
+        preferred = get_hashers()[0]
+        self.stdout.write(f"Preferred hasher: {preferred.algorithm}")
+        self.stdout.write(f"Target: {target:.0f} ms per hash\n")
+
+        recommendations: list[str] = []
+        for hasher in get_hashers():
+            if isinstance(hasher, TunedPBKDF2PasswordHasher):
+                recommendations += self._pbkdf2(hasher, target, rounds)
+            elif isinstance(hasher, TunedScryptPasswordHasher):
+                recommendations += self._scrypt(hasher, target, rounds)
+            elif isinstance(hasher, TunedArgon2PasswordHasher):
+                recommendations += self._argon2(hasher, target, rounds)
+
+        if recommendations:
+            self.stdout.write("\nSuggested .env:")
+            for line in recommendations:
+                self.stdout.write(f"  {line}")
+
+        self._stored_hashes()
+
+    def _report(self, label: str, ms: float, memory_mb: float | None = None) -> None:
+        memory = f"  mem={memory_mb:.0f}MB" if memory_mb else ""
+        self.stdout.write(
+            f"{label:<44} {ms:8.1f} ms  {1000 / ms:6.1f} hashes/s/core{memory}"
+        )
+
+    def _pbkdf2(self, hasher, target: float, rounds: int) -> list[str]:
+        salt = hasher.salt()
+        current = hasher.iterations
+        ms = _time_ms(lambda: hasher.encode(SAMPLE_PASSWORD, salt), rounds)
+        self._report(f"pbkdf2_sha256 iterations={current}", ms)
+
+        # custo linear nas iterações
+        iterations = max(100_000, round(current * target / ms, -4))
+        return [f"PASSWORD_PBKDF2_ITERATIONS={int(iterations)}"]
+
+    def _scrypt(self, hasher, target: float, rounds: int) -> list[str]:
+        salt = hasher.salt()
+        n, r = hasher.work_factor, hasher.block_size
+        ms = _time_ms(lambda: hasher.encode(SAMPLE_PASSWORD, salt), rounds)
+        self._report(
+            f"scrypt N=2**{int(math.log2(n))} r={r} p={hasher.parallelism}",
+            ms,
+            128 * n * r / 1024 / 1024,
+        )
+
+        # custo (tempo e memória) linear em N, que precisa ser potência de 2
+        exponent = max(14, math.floor(math.log2(n * target / ms)))
+        return [f"PASSWORD_SCRYPT_WORK_FACTOR={2**exponent}"]
+
+    def _argon2(self, hasher, target: float, rounds: int) -> list[str]:
+        try:
+            hasher._load_library()
+        except ValueError:
+            self.stdout.write(f"{'argon2':<44} skipped (argon2-cffi not installed)")
+            return []
+
+        salt = hasher.salt()
+        time_cost, memory_cost = hasher.time_cost, hasher.memory_cost
+        ms = _time_ms(lambda: hasher.encode(SAMPLE_PASSWORD, salt), rounds)
+        self._report(
+            f"argon2id t={time_cost} m={memory_cost}KiB p={hasher.parallelism}",
+            ms,
+            memory_cost / 1024,
+        )
+
+        # mantém a memória e ajusta as passadas (custo linear em time_cost)
+        return [f"PASSWORD_ARGON2_TIME_COST={max(1, round(time_cost * target / ms))}"]
+
+    def _stored_hashes(self) -> None:
+        rows = (
+            User.objects.annotate(prefix=Substr("password", 1, 14))
+            .values("prefix")
+            .annotate(n=Count("id"))
+        )
+        counts: dict[str, int] = {}
+        for row in rows:
+            algorithm = row["prefix"].split("$", 1)[0] or "(empty)"
+            if algorithm.startswith("!"):
+                algorithm = "(unusable)"
+            counts[algorithm] = counts.get(algorithm, 0) + row["n"]
+
+        self.stdout.write("\nStored hashes (rehashed on next successful login):")
+        for algorithm, n in sorted(counts.items(), key=lambda kv: -kv[1]):
+            self.stdout.write(f"  {algorithm:<20} {n}")
@@ -0,0 +1,104 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts.backends import EmailOrUsernameBackend, find_user_by_identifier
+from apps.accounts.models import User
+
+
+def _iexact_lookup(identifier: str):
+    # caminho antigo do api_token, para comparação
+    return User.objects.filter(
+        Q(email__iexact=identifier) | Q(username__iexact=identifier)
+    ).first()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the login lookup: queries per login, latency and query plan. "
+        "Seeds users inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            identifiers = self._seed(options["users"])
+            sample = random.choices(identifiers, k=options["iterations"])
+
+            for label, lookup in (
+                ("lower() + functional index", find_user_by_identifier),
+                ("iexact OR (old)", _iexact_lookup),
+            ):
+                self._report(label, lookup, sample)
+
+            self._report_backend(sample)
+            self.stdout.write("\nQuery plan (lower()):")
+            self.stdout.write(self._explain(sample[0]))
+
+            transaction.set_rollback(True)
+
+    def _seed(self, n: int) -> list[str]:
+        password = make_password(None)  # inutilizável: não mede hash aqui
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f"bench{i}",
+                    email=f"Bench.User{i}@Example.org",
+                    password=password,
+                )
+                for i in range(n)
+            ],
+            batch_size=1000,
+        )
+        # mistura e-mail com caixa diferente e username
+        return [
+            f"bench.user{i}@EXAMPLE.org" if i % 2 else f"BENCH{i}" for i in range(n)
+        ]
+
+    def _report(self, label: str, lookup, sample: list[str]) -> None:
+        timings = []
+        with CaptureQueriesContext(connection) as ctx:
+            for identifier in sample:
+                start = time.perf_counter()
+                user = lookup(identifier)
+                timings.append(time.perf_counter() - start)
+                assert user is not None, identifier
+        self._print(label, timings, len(ctx.captured_queries) / len(sample))
+
+    def _report_backend(self, sample: list[str]) -> None:
+        backend = EmailOrUsernameBackend()
+        with CaptureQueriesContext(connection) as ctx:
+            for identifier in sample[:50]:
+                backend.authenticate(None, username=identifier, password="wrong")
+        self.stdout.write(
+            f"EmailOrUsernameBackend.authenticate: "
+            f"{len(ctx.captured_queries) / min(50, len(sample)):.2f} queries/login"
+        )
+
+    def _print(self, label: str, timings: list[float], queries: float) -> None:
+        micros = sorted(t * 1_000_000 for t in timings)
+        p95 = micros[int(len(micros) * 0.95) - 1]
+        self.stdout.write(
+            f"{label:<30} {queries:.2f} queries/login  "
+            f"p50={statistics.median(micros):.0f}µs  p95={p95:.0f}µs"
+        )
+
+    def _explain(self, identifier: str) -> str:
+        needle = identifier.lower()
+        return (
+            User.objects.alias(
+                email_lower=Lower("email"), username_lower=Lower("username")
+            )
+            .filter(Q(email_lower=needle) | Q(username_lower=needle))
+            .explain()
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts.services import expire_pending_invitations
+
+
+class Command(BaseCommand):
+    help = "Mark pending invitations past expires_at as expired"
+
+    def handle(self, *args, **options):
+        expired = expire_pending_invitations()
+        self.stdout.write(self.style.SUCCESS(f"Invitations expired. Updated={expired}"))
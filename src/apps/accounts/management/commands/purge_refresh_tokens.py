@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts.auth import purge_refresh_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete refresh tokens past expires_at"
+
+    def handle(self, *args, **options):
+        deleted = purge_refresh_tokens()
+        self.stdout.write(
+            self.style.SUCCESS(f"Refresh tokens purged. Deleted={deleted}")
+        )
@@ -0,0 +1,429 @@
+import random
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from itertools import batched
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.accounts.models import Profile, Role, User, UserRole
+from apps.accounts.signals import members_changed
+from apps.community.models import Skill, UserSkill
+from apps.docs.models import (
+    Document,
+    DocumentTag,
+    DocumentVersion,
+    DocumentVisibility,
+)
+from apps.docs.models import Tag as DocTag
+from apps.kanban.models import Board, Column, Tag, Task, TaskComment, TaskTag
+from apps.projects.models import Project, ProjectMember
+
+FIRST_NAMES = (
+    "Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela", "Hugo",
+    "Isabela", "João", "Karina", "Lucas", "Marina", "Nicolas", "Olívia",
+    "Pedro", "Rafaela", "Sérgio", "Tatiana", "Vinícius",
+)  # fmt: skip
+LAST_NAMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Costa",
+    "Rodrigues", "Almeida", "Nascimento", "Carvalho", "Araújo", "Ribeiro",
+)  # fmt: skip
+PROFESSIONS = (
+    "Backend developer", "Frontend developer", "Data engineer", "QA analyst",
+    "DevOps engineer", "Product manager", "Designer", "Student",
+)  # fmt: skip
+LOCATIONS = (
+    "São Paulo", "Rio de Janeiro", "Belo Horizonte", "Recife", "Porto Alegre",
+    "Curitiba", "Salvador", "Remote",
+)  # fmt: skip
+WORDS = (
+    "api", "deploy", "cache", "query", "index", "schema", "review", "login",
+    "board", "sprint", "bug", "feature", "docs", "tests", "refactor",
+    "migration", "endpoint", "layout", "metrics", "release", "token", "queue",
+)  # fmt: skip
+DOC_TAGS = (
+    "python", "django", "sql", "docker", "frontend", "carreira", "onboarding",
+    "arquitetura", "testes", "devops", "git", "segurança",
+)  # fmt: skip
+TASK_TAGS = ("bug", "feature", "chore", "docs", "urgent", "blocked")
+COLUMNS = ("Backlog", "Todo", "Doing", "Review", "Done")
+# tarefas se acumulam no backlog e no done, como em boards reais
+COLUMN_WEIGHTS = (30, 10, 8, 5, 47)
+
+# (key, peso): a maioria é mentorado, poucos mentores/admins
+ROLE_WEIGHTS = {
+    "mentorado": 70,
+    "mentor": 15,
+    "coach": 8,
+    "admin": 5,
+    "cofounder": 2,
+}
+VISIBILITY_WEIGHTS = {
+    DocumentVisibility.COMMUNITY: 70,
+    DocumentVisibility.MENTORS_ONLY: 20,
+    DocumentVisibility.PRIVATE: 10,
+}
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words)).capitalize()
+
+
+@dataclass
+class _ProjectShape:
+    id: int
+    column_ids: list[int]
+    member_ids: list[int]
+    tag_ids: list[int]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large deterministic dataset (users, profiles, skills, "
+        "projects, boards, tasks, tags, comments, documents with versions) "
+        "with streaming bulk_create batches, for benchmarks and query tuning"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--projects", type=int, help="Default: one per 20 users")
+        parser.add_argument("--tasks", type=int, help="Default: 10 per user")
+        parser.add_argument("--docs", type=int, help="Default: one per 2 users")
+        parser.add_argument(
+            "--versions", type=int, default=8, help="Average versions per document"
+        )
+        parser.add_argument(
+            "--comments", type=int, default=2, help="Average comments per task"
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--prefix",
+            default="scale",
+            help="Prefix for usernames, slugs and project names (must be unused)",
+        )
+        parser.add_argument(
+            "--password",
+            default="scale-Password-1",
+            help="Password shared by every generated user",
+        )
+
+    def handle(self, *args, **options):
+        users = options["users"]
+        if users < 1:
+            raise CommandError("--users must be >= 1")
+        projects = options["projects"] or max(1, users // 20)
+        tasks = users * 10 if options["tasks"] is None else options["tasks"]
+        docs = users // 2 if options["docs"] is None else options["docs"]
+
+        self.prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{self.prefix}-").exists():
+            raise CommandError(
+                f"Prefix '{self.prefix}' already used; pass another --prefix"
+            )
+
+        self.seed = options["seed"]
+        self.batch_size = options["batch_size"]
+        self.counts: Counter[str] = Counter()
+        self.verbosity = options["verbosity"]
+
+        # lookups (papéis e skills) vêm dos seeds padrão
+        call_command("seed_roles", stdout=self.stdout)
+        call_command("seed_skills", stdout=self.stdout)
+
+        user_ids = self._users(users, make_password(options["password"]))
+        shapes = self._projects(projects, user_ids)
+        self._tasks(tasks, shapes, options["comments"])
+        self._documents(docs, user_ids, shapes, options["versions"])
+
+        summary = " ".join(f"{label}={n}" for label, n in self.counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Scale dataset seeded. {summary}"))
+
+    # ------------------------------------------------------------- streaming
+
+    def _stream(
+        self, label: str, model, rows: Iterable, children: Callable[[list], None]
+    ) -> Iterator[list]:
+        """
+        Insere `rows` (gerador) em lotes de `batch_size`; cada lote e seus
+        filhos (`children(lote)`) numa transação. Só o lote corrente fica em
+        memória, além do que o chamador guardar.
+        """
+        for batch in batched(rows, self.batch_size):
+            with transaction.atomic():
+                created = model.objects.bulk_create(batch)
+                children(created)
+            self.counts[label] += len(created)
+            if self.verbosity > 1:
+                self.stdout.write(f"  {label}: {self.counts[label]}")
+            yield created
+
+    def _bulk(self, label: str, model, rows: list) -> list:
+        created = model.objects.bulk_create(rows, batch_size=self.batch_size)
+        self.counts[label] += len(created)
+        return created
+
+    def _rng(self, stream: str) -> random.Random:
+        # um gerador por fluxo: o conteúdo não depende do --batch-size
+        return random.Random(f"{self.seed}:{stream}")
+
+    # ----------------------------------------------------------------- dados
+
+    def _users(self, n: int, password: str) -> list[int]:
+        rng, child_rng, p = self._rng("users"), self._rng("users:children"), self.prefix
+        roles = {r.key: r.id for r in Role.objects.filter(key__in=list(ROLE_WEIGHTS))}
+        role_keys = [k for k in ROLE_WEIGHTS if k in roles]
+        role_weights = [ROLE_WEIGHTS[k] for k in role_keys]
+        skill_ids = list(Skill.objects.order_by("id").values_list("id", flat=True))
+
+        def rows():
+            for i in range(n):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                yield User(
+                    username=f"{p}-{i}",
+                    email=f"{p}-{i}@example.org",
+                    first_name=first,
+                    last_name=last,
+                    password=password,
+                )
+
+        def children(users):
+            profiles, user_roles, user_skills = [], [], []
+            # sorteios por usuário, na ordem dos usuários (independe do lote)
+            for u in users:
+                profiles.append(
+                    Profile(
+                        user=u,
+                        display_name=f"{u.first_name} {u.last_name}",
+                        profession=child_rng.choice(PROFESSIONS),
+                        location=child_rng.choice(LOCATIONS),
+                        bio=_sentence(child_rng, 12),
+                        github_url=f"https://github.com/{u.username}",
+                        linkedin_url=f"https://linkedin.com/in/{u.username}",
+                    )
+                )
+                if role_keys:
+                    key = child_rng.choices(role_keys, role_weights)[0]
+                    user_roles.append(UserRole(user=u, role_id=roles[key]))
+                picked = child_rng.sample(
+                    skill_ids, child_rng.randint(0, min(5, len(skill_ids)))
+                )
+                user_skills += [
+                    UserSkill(
+                        user=u,
+                        skill_id=skill_id,
+                        level=child_rng.randint(1, 5),
+                        years_exp=child_rng.randint(0, 15),
+                        can_mentor=child_rng.random() < 0.1,
+                    )
+                    for skill_id in picked
+                ]
+            self._bulk("profiles", Profile, profiles)
+            self._bulk("user_roles", UserRole, user_roles)
+            self._bulk("user_skills", UserSkill, user_skills)
+            # bulk_create não dispara post_save (typeahead/cache de membros)
+            members_changed.send(sender=User, user_ids=[u.id for u in users])
+
+        return [
+            u.id
+            for batch in self._stream("users", User, rows(), children)
+            for u in batch
+        ]
+
+    def _projects(self, n: int, user_ids: list[int]) -> list[_ProjectShape]:
+        rng, child_rng, p = (
+            self._rng("projects"),
+            self._rng("projects:children"),
+            self.prefix,
+        )
+        shapes: list[_ProjectShape] = []
+
+        def rows():
+            for i in range(n):
+                owner_id = rng.choice(user_ids)
+                yield Project(
+                    name=f"{p} project {i}",
+                    description=_sentence(rng, 10),
+                    owner_id=owner_id,
+                    created_by_id=owner_id,
+                )
+
+        def children(projects):
+            boards = self._bulk(
+                "boards", Board, [Board(project=project) for project in projects]
+            )
+            columns = self._bulk(
+                "columns",
+                Column,
+                [
+                    Column(board=board, name=name, position=pos)
+                    for board in boards
+                    for pos, name in enumerate(COLUMNS, start=1)
+                ],
+            )
+            tags = self._bulk(
+                "task_tag_names",
+                Tag,
+                [
+                    Tag(project=project, name=name)
+                    for project in projects
+                    for name in TASK_TAGS
+                ],
+            )
+            memberships = []
+            member_ids: dict[int, list[int]] = {}
+            for project in projects:
+                size = min(len(user_ids), child_rng.randint(3, 15))
+                members = {project.owner_id, *child_rng.sample(user_ids, size)}
+                memberships += [
+                    ProjectMember(
+                        project=project,
+                        user_id=uid,
+                        role=(
+                            ProjectMember.ROLE_OWNER
+                            if uid == project.owner_id
+                            else ProjectMember.ROLE_MEMBER
+                        ),
+                    )
+                    for uid in sorted(members)
+                ]
+                member_ids[project.id] = sorted(members)
+            self._bulk("project_members", ProjectMember, memberships)
+
+            per_board = len(COLUMNS)
+            per_project_tags = len(TASK_TAGS)
+            for i, project in enumerate(projects):
+                shapes.append(
+                    _ProjectShape(
+                        id=project.id,
+                        column_ids=[
+                            c.id for c in columns[i * per_board : (i + 1) * per_board]
+                        ],
+                        member_ids=member_ids[project.id],
+                        tag_ids=[
+                            t.id
+                            for t in tags[
+                                i * per_project_tags : (i + 1) * per_project_tags
+                            ]
+                        ],
+                    )
+                )
+
+        for _ in self._stream("projects", Project, rows(), children):
+            pass
+        return shapes
+
+    def _tasks(self, n: int, shapes: list[_ProjectShape], comments: int) -> None:
+        rng, child_rng = self._rng("tasks"), self._rng("tasks:children")
+        by_id = {shape.id: shape for shape in shapes}
+        # projetos com tamanhos desiguais (poucos grandes, muitos pequenos)
+        weights = [rng.paretovariate(1.5) for _ in shapes]
+        next_position: Counter[int] = Counter()
+        priorities = [value for value, _ in Task.PRIORITY_CHOICES]
+
+        def rows():
+            for i in range(n):
+                shape = rng.choices(shapes, weights)[0]
+                column_id = rng.choices(shape.column_ids, COLUMN_WEIGHTS)[0]
+                next_position[column_id] += 1
+                yield Task(
+                    project_id=shape.id,
+                    column_id=column_id,
+                    position=next_position[column_id],
+                    title=f"{_sentence(rng, 4)} #{i}",
+                    description=_sentence(rng, 20),
+                    assignee_id=(
+                        rng.choice(shape.member_ids) if rng.random() < 0.8 else None
+                    ),
+                    priority=rng.choice(priorities),
+                    created_by_id=rng.choice(shape.member_ids),
+                )
+
+        def children(tasks):
+            task_tags, task_comments = [], []
+            for task in tasks:
+                shape = by_id[task.project_id]
+                task_tags += [
+                    TaskTag(task=task, tag_id=tag_id)
+                    for tag_id in child_rng.sample(
+                        shape.tag_ids, child_rng.randint(0, 2)
+                    )
+                ]
+                task_comments += [
+                    TaskComment(
+                        task=task,
+                        author_id=child_rng.choice(shape.member_ids),
+                        content=_sentence(child_rng, 15),
+                    )
+                    for _ in range(child_rng.randint(0, 2 * comments))
+                ]
+            self._bulk("task_tags", TaskTag, task_tags)
+            self._bulk("task_comments", TaskComment, task_comments)
+
+        # 1M tarefas: nenhum lote é guardado depois de inserido
+        for _ in self._stream("tasks", Task, rows(), children):
+            pass
+
+    def _documents(
+        self,
+        n: int,
+        user_ids: list[int],
+        shapes: list[_ProjectShape],
+        versions: int,
+    ) -> None:
+        rng, child_rng, p = (
+            self._rng("documents"),
+            self._rng("documents:children"),
+            self.prefix,
+        )
+        tag_ids = [DocTag.objects.get_or_create(name=name)[0].id for name in DOC_TAGS]
+        visibilities = list(VISIBILITY_WEIGHTS)
+        visibility_weights = list(VISIBILITY_WEIGHTS.values())
+
+        def rows():
+            for i in range(n):
+                yield Document(
+                    title=f"{_sentence(rng, 5)} {i}",
+                    slug=f"{p}-doc-{i}",
+                    summary=_sentence(rng, 18),
+                    visibility=rng.choices(visibilities, visibility_weights)[0],
+                    created_by_id=rng.choice(user_ids),
+                    project_id=(
+                        rng.choice(shapes).id if shapes and rng.random() < 0.3 else None
+                    ),
+                )
+
+        def children(documents):
+            doc_versions, doc_tags = [], []
+            for doc in documents:
+                for number in range(
+                    1, child_rng.randint(1, max(1, 2 * versions - 1)) + 1
+                ):
+                    body = "\n\n".join(
+                        _sentence(child_rng, child_rng.randint(20, 60))
+                        for _ in range(child_rng.randint(2, 8))
+                    )
+                    doc_versions.append(
+                        DocumentVersion(
+                            document=doc,
+                            version_number=number,
+                            body_md=f"# {doc.title}\n\n{body}\n",
+                            authored_by_id=(
+                                doc.created_by_id
+                                if child_rng.random() < 0.7
+                                else child_rng.choice(user_ids)
+                            ),
+                        )
+                    )
+                doc_tags += [
+                    DocumentTag(document=doc, tag_id=tag_id)
+                    for tag_id in child_rng.sample(tag_ids, child_rng.randint(1, 3))
+                ]
+            self._bulk("document_versions", DocumentVersion, doc_versions)
+            self._bulk("document_tags", DocumentTag, doc_tags)
+
+        for _ in self._stream("documents", Document, rows(), children):
+            pass
@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.accounts.emails import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_ATTEMPTS,
+    deliver_invitation_emails,
+    outbox_metrics,
+)
+
+
+class Command(BaseCommand):
+    help = "Drain the invitation email outbox (one SMTP connection per batch)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=OUTBOX_BATCH_SIZE)
+        parser.add_argument("--max-attempts", type=int, default=OUTBOX_MAX_ATTEMPTS)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting when it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep between polls when --loop is set",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Only print delivery metrics and exit",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            for key, value in outbox_metrics().items():
+                self.stdout.write(f"{key}={value}")
+            return
+
+        total_sent = total_failed = 0
+        while True:
+            try:
+                result = deliver_invitation_emails(
+                    batch_size=options["batch_size"],
+                    max_attempts=options["max_attempts"],
+                )
+            except Exception as exc:  # SMTP fora do ar: tenta no próximo ciclo
+                if not options["loop"]:
+                    raise
+                self.stderr.write(f"Outbox delivery failed: {exc}")
+                time.sleep(options["interval"])
+                continue
+
+            total_sent += result.sent
+            total_failed += result.failed
+
+            if result.processed == 0:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Invitation emails delivered. Sent={total_sent} Failed={total_failed}"
+            )
+        )
@@ -0,0 +1,115 @@
+"""
+Dados do `/me` além do principal autenticado (perfil + papéis).
+
+O `JWTAuth` já carregou o usuário; o restante vem de uma query só (join com
+profile + StringAgg dos papéis) e fica em cache por usuário até um save de
+Profile/UserRole/Role (ver signals). Cache hit: nenhuma query extra.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import StringAgg, Value
+
+from .models import User
+
+ME_CACHE_TIMEOUT = 60 * 10
+ROLES_VERSION_KEY = "accounts:roles:version"
+
+
+def me_cache_key(user_id: int) -> str:
+    return f"accounts:me:{user_id}"
+
+
+@dataclass(frozen=True)
+class MeSnapshot:
+    display_name: str | None
+    roles: tuple[str, ...]
+    profile_updated_at: datetime | None
+    roles_version: int
+
+    def etag(self, user) -> str:
+        """
+        Validador do GET condicional. User não tem `updated_at`: os campos
+        dele que saem na resposta entram direto na chave.
+        """
+        updated = self.profile_updated_at.isoformat() if self.profile_updated_at else ""
+        raw = "|".join(
+            (
+                str(user.pk),
+                user.username,
+                user.email or "",
+                str(bool(user.is_staff)),
+                updated,
+                ",".join(self.roles),
+                str(self.roles_version),
+            )
+        )
+        return f"me-{user.pk}-{hashlib.sha1(raw.encode()).hexdigest()[:16]}"
+
+
+def _me_row(user):
+    return (
+        User.objects.filter(pk=user.pk)
+        .values("pk", "profile__display_name", "profile__updated_at")
+        .annotate(role_keys=StringAgg("user_roles__role__key", delimiter=Value(",")))
+    )
+
+
+def _snapshot(row: dict | None, roles_version: int) -> MeSnapshot:
+    row = row or {}
+    return MeSnapshot(
+        display_name=row.get("profile__display_name"),
+        # ordena aqui: nem todo backend aceita ORDER BY dentro do agregado
+        roles=tuple(sorted(filter(None, (row.get("role_keys") or "").split(",")))),
+        profile_updated_at=row.get("profile__updated_at"),
+        roles_version=roles_version,
+    )
+
+
+def get_me_snapshot(user) -> MeSnapshot:
+    key = me_cache_key(user.pk)
+    cached = cache.get_many([key, ROLES_VERSION_KEY])
+    roles_version = cached.get(ROLES_VERSION_KEY, 0)
+    snapshot = cached.get(key)
+    if snapshot is not None and snapshot.roles_version == roles_version:
+        return snapshot
+
+    snapshot = _snapshot(_me_row(user).first(), roles_version)
+    cache.set(key, snapshot, timeout=ME_CACHE_TIMEOUT)
+    return snapshot
+
+
+async def aget_me_snapshot(user) -> MeSnapshot:
+    key = me_cache_key(user.pk)
+    # o aget_many padrão faz um sync_to_async por chave; aqui é um só
+    cached = await sync_to_async(cache.get_many)([key, ROLES_VERSION_KEY])
+    roles_version = cached.get(ROLES_VERSION_KEY, 0)
+    snapshot = cached.get(key)
+    if snapshot is not None and snapshot.roles_version == roles_version:
+        return snapshot
+
+    snapshot = _snapshot(await _me_row(user).afirst(), roles_version)
+    await cache.aset(key, snapshot, timeout=ME_CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate_me_cache(user_ids) -> None:
+    keys = [me_cache_key(uid) for uid in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def bump_roles_version() -> None:
+    """Role renomeado/removido: invalida o `/me` de todos sem varrer o cache."""
+
+    def bump():
+        cache.add(ROLES_VERSION_KEY, 0, timeout=None)
+        cache.incr(ROLES_VERSION_KEY)
+
+    transaction.on_commit(bump)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from .emails import outbox_metrics
+from .hashing import hash_metrics
+
+
+def accounts_metrics() -> list[str]:
+    """Coletor do /metrics: fila de e-mails de convite e custo de hash de senha."""
+    lines = []
+
+    outbox = outbox_metrics()
+    name = "orgst_invitation_outbox_emails"
+    lines += [
+        f"# HELP {name} Invitation emails by outbox status.",
+        f"# TYPE {name} gauge",
+    ]
+    for status in ("pending", "retrying", "sent", "failed"):
+        lines.append(f'{name}{{status="{status}"}} {outbox[status]}')
+
+    name = "orgst_invitation_outbox_oldest_pending_seconds"
+    lines += [
+        f"# HELP {name} Age of the oldest pending invitation email.",
+        f"# TYPE {name} gauge",
+        f"{name} {outbox['oldest_pending_seconds']}",
+    ]
+
+    hashes = hash_metrics()
+    for name, key, help_text in (
+        ("orgst_password_hash_total", "calls", "Password hash operations."),
+        ("orgst_password_hash_cpu_seconds_total", "cpu_seconds", "CPU spent hashing."),
+        ("orgst_password_rehash_total", "rehashes", "Hashes upgraded on login."),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for endpoint, values in hashes.items():
+            lines.append(f'{name}{{endpoint="{endpoint}"}} {values[key]}')
+    return lines
@@ -7,6 +7,7 @@ from datetime import timedelta
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.crypto import salted_hmac
 
@@ -28,6 +29,14 @@ class User(AbstractUser):
     email = models.EmailField(unique=True)
     must_change_password = models.BooleanField(default=False)
 
+    class Meta(AbstractUser.Meta):
+        swappable = "AUTH_USER_MODEL"
+        indexes = [
+            # login case-insensitive (ver backends.find_user_by_identifier)
+            models.Index(Lower("email"), name="accounts_user_email_lower"),
+            models.Index(Lower("username"), name="accounts_user_uname_lower"),
+        ]
+
     def __str__(self) -> str:
         return self.email or self.username
 
@@ -159,3 +168,67 @@ class InvitationRole(models.Model):
 
     def __str__(self) -> str:
         return f"{self.invitation.email} -> {self.role.key} "
+
+
+class EmailOutboxStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    SENT = "sent", "Sent"
+    FAILED = "failed", "Failed"
+
+
+class InvitationEmail(TimeStampedModel):
+    """
+    Outbox de e-mails de convite: gravado na mesma transação do convite e
+    drenado pelo comando `send_invitation_emails`.
+
+    O token puro só existe aqui até o envio (ou falha definitiva); depois
+    é apagado e fica apenas o hash em Invitation.
+    """
+
+    invitation = models.ForeignKey(
+        Invitation, on_delete=models.CASCADE, related_name="emails"
+    )
+    raw_token = models.CharField(max_length=64, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=EmailOutboxStatus.choices,
+        default=EmailOutboxStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self) -> str:
+        return f"InvitationEmail - {self.invitation_id} ({self.status})"
+
+
+class RefreshToken(models.Model):
+    """
+    Registro de refresh tokens emitidos (o JWT carrega só o `jti`).
+
+    Cada uso rotaciona o token: o atual é revogado e outro da mesma família
+    é emitido. Apresentar um token já revogado indica vazamento, e a família
+    inteira é revogada.
+    """
+
+    jti = models.CharField(max_length=64, unique=True)
+    family = models.UUIDField(default=uuid.uuid4, db_index=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="refresh_tokens",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(null=True, blank=True)
+    replaced_by = models.CharField(max_length=64, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["expires_at"])]
+
+    def __str__(self) -> str:
+        return f"RefreshToken - {self.user_id} ({self.jti[:8]})"
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest
+from ninja.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+# (capacidade, segundos para encher o bucket) por dimensão
+DEFAULT_AUTH_RATE_LIMITS = {
+    "ip": (30, 60),
+    "identifier": (5, 60),
+}
+
+LOCAL_MAX_BUCKETS = 10_000
+
+
+class RateLimited(HttpError):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(429, "RATE_LIMITED")
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+class TokenBucket:
+    """
+    Token bucket guardado no cache do Django (compartilhado entre workers
+    quando CACHE_URL aponta para Redis/Memcached).
+
+    Se o cache falhar, cai para buckets em memória do processo: o limite
+    fica por worker, mas o endpoint continua protegido.
+    """
+
+    def __init__(self, prefix: str = "ratelimit") -> None:
+        self.prefix = prefix
+        self._local: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _refill(
+        state: tuple[float, float] | None, capacity: int, period: float, now: float
+    ) -> float:
+        if state is None:
+            return float(capacity)
+        tokens, updated = state
+        rate = capacity / period
+        return min(float(capacity), tokens + (now - updated) * rate)
+
+    def consume(self, key: str, *, capacity: int, period: float) -> float:
+        """
+        Consome um token. Retorna 0 quando permitido; senão, quantos
+        segundos faltam para o próximo token.
+        """
+        key = f"{self.prefix}:{key}"
+        now = time.time()
+        try:
+            return self._consume_shared(key, capacity, period, now)
+        except Exception:  # cache fora do ar: não derruba o login
+            logger.warning("rate limit cache unavailable, using local buckets")
+            return self._consume_local(key, capacity, period, now)
+
+    def _decide(
+        self, state, capacity: int, period: float, now: float
+    ) -> tuple[tuple[float, float], float]:
+        tokens = self._refill(state, capacity, period, now)
+        if tokens >= 1:
+            return (tokens - 1, now), 0.0
+        return (tokens, now), (1 - tokens) * period / capacity
+
+    def _consume_shared(self, key, capacity, period, now) -> float:
+        # get/set não é atômico: sob corrida o limite pode vazar alguns
+        # pedidos, o que é aceitável para um freio de custo de CPU.
+        state, retry_after = self._decide(cache.get(key), capacity, period, now)
+        cache.set(key, state, timeout=int(period) + 1)
+        return retry_after
+
+    def _consume_local(self, key, capacity, period, now) -> float:
+        with self._lock:
+            if len(self._local) >= LOCAL_MAX_BUCKETS:
+                self._prune(now, period)
+            state, retry_after = self._decide(
+                self._local.get(key), capacity, period, now
+            )
+            self._local[key] = state
+            return retry_after
+
+    def _prune(self, now: float, period: float) -> None:
+        # buckets parados há mais de um período já estão cheios de novo
+        stale = [k for k, (_, ts) in self._local.items() if now - ts > period]
+        for k in stale:
+            del self._local[k]
+        if len(self._local) >= LOCAL_MAX_BUCKETS:
+            self._local.clear()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+
+auth_buckets = TokenBucket("accounts:auth")
+
+
+def client_ip(request: HttpRequest) -> str:
+    if getattr(settings, "RATE_LIMIT_TRUST_X_FORWARDED_FOR", False):
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "") or "unknown"
+
+
+def _digest(value: str) -> str:
+    # não guarda e-mail/token em claro como chave do cache
+    return hashlib.sha256(value.casefold().strip().encode()).hexdigest()[:32]
+
+
+def enforce_auth_rate_limit(
+    request: HttpRequest, scope: str, identifier: str | None = None
+) -> None:
+    """
+    Aplica os buckets por IP e por identificador (e-mail, username ou token
+    de convite) antes de qualquer hash de senha. Levanta `RateLimited` (429).
+    """
+    limits = getattr(settings, "AUTH_RATE_LIMITS", DEFAULT_AUTH_RATE_LIMITS)
+
+    keys = [("ip", f"{scope}:ip:{client_ip(request)}")]
+    if identifier:
+        keys.append(("identifier", f"{scope}:id:{_digest(identifier)}"))
+
+    retry_after = 0.0
+    for dimension, key in keys:
+        capacity, period = limits[dimension]
+        retry_after = max(
+            retry_after,
+            auth_buckets.consume(key, capacity=capacity, period=period),
+        )
+    if retry_after:
+        raise RateLimited(retry_after)
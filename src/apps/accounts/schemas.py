@@ -28,6 +28,27 @@ class InvitationCreateOut(Schema):
     invite_token: str | None = None  # token puro só em debug
 
 
+class InvitationBulkItemIn(Schema):
+    email: str
+    name: str
+    role_keys: list[str] = Field(default_factory=list)
+
+
+class InvitationBulkRowOut(Schema):
+    row: int
+    email: str
+    status: str  # created | skipped | error
+    id: str | None = None
+    detail: str | None = None
+
+
+class InvitationBulkOut(Schema):
+    created: int
+    skipped: int
+    errors: int
+    results: list[InvitationBulkRowOut]
+
+
 class InvitationValidateOut(Schema):
     valid: bool
     email: str | None = None
@@ -43,6 +64,11 @@ class TokenIn(Schema):
 
 class TokenOut(Schema):
     access: str
+    refresh: str
+
+
+class RefreshIn(Schema):
+    refresh: str
 
 
 class InvitationAcceptIn(Schema):
@@ -58,5 +84,13 @@ class InvitationAcceptOut(Schema):
     user_id: str
     email: str
     access: str
+    refresh: str
     pid: int
     roles: list[str] = Field(default_factory=list)
+
+
+class HashMetricOut(Schema):
+    calls: int
+    cpu_seconds: float
+    avg_cpu_ms: float
+    rehashes: int
@@ -1,19 +1,38 @@
 from __future__ import annotations
 
+import os
+import re
 import secrets
 import string
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from functools import partial
 
-from django.db import transaction
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q, prefetch_related_objects
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.text import slugify
 
-from .emails import send_invitation_email
-from .models import Invitation, InvitationStatus, Profile, Role, User
+from .emails import enqueue_invitation_email, enqueue_invitation_emails
+from .models import (
+    Invitation,
+    InvitationRole,
+    InvitationStatus,
+    Profile,
+    Role,
+    User,
+    UserRole,
+)
+from .signals import members_changed
 
 ALLOWED_ADMIN_ONLY_ROLES = {"mentor", "mentorado"}
+MAX_BULK_INVITATIONS = 1000
+BULK_BATCH_SIZE = 500
+PASSWORD_HASH_WORKERS = 8
 
 
 @dataclass(frozen=True)
@@ -22,14 +41,72 @@ class CreatedInvitation:
     token: str  # token puro (retornar apenas na criação)
 
 
+USERNAME_MAX_ATTEMPTS = 3
+
+
+def _username_base(email: str) -> str:
+    return slugify(email.split("@")[0])[:25] or "user"
+
+
+def allocate_usernames(emails: Iterable[str]) -> list[str]:
+    """
+    Aloca usernames livres para vários e-mails com uma única query.
+
+    Para cada base (parte local do e-mail) busca os usernames `base`/`baseN`
+    existentes e continua a partir do maior sufixo numérico. Bases repetidas
+    no mesmo lote recebem sufixos sequenciais.
+    """
+    emails = list(emails)
+    bases = [_username_base(email) for email in emails]
+    unique_bases = set(bases)
+    if not unique_bases:
+        return []
+
+    prefix_filter = Q()
+    for base in unique_bases:
+        prefix_filter |= Q(username__startswith=base)
+
+    patterns = {base: re.compile(rf"{re.escape(base)}(\d*)") for base in unique_bases}
+    next_suffix: dict[str, int] = {}
+    for username in User.objects.filter(prefix_filter).values_list(
+        "username", flat=True
+    ):
+        for base, pattern in patterns.items():
+            match = pattern.fullmatch(username)
+            if match:
+                suffix = int(match.group(1) or 0) + 1
+                next_suffix[base] = max(next_suffix.get(base, 0), suffix)
+
+    usernames = []
+    for base in bases:
+        n = next_suffix.get(base, 0)
+        usernames.append(base if n == 0 else f"{base}{n}"[:30])
+        next_suffix[base] = n + 1
+    return usernames
+
+
 def _make_username(email: str) -> str:
-    base = slugify(email.split("@")[0])[:25] or "user"
-    candidate = base
-    i = 0
-    while User.objects.filter(username=candidate).exists():
-        i += 1
-        candidate = f"{base}{i}"[:30]
-    return candidate
+    return allocate_usernames([email])[0]
+
+
+def _create_user(*, email: str, **fields) -> User:
+    """
+    Cria o usuário com username alocado; se outro registro concorrente pegar
+    o mesmo username (IntegrityError), realoca e tenta de novo.
+    """
+    attempts = 0
+    while True:
+        username = _make_username(email)
+        try:
+            with transaction.atomic():
+                return User.objects.create(username=username, email=email, **fields)
+        except IntegrityError:
+            attempts += 1
+            # e-mail duplicado (ou outra constraint) não se resolve realocando
+            if attempts >= USERNAME_MAX_ATTEMPTS or not (
+                User.objects.filter(username=username).exists()
+            ):
+                raise
 
 
 def _generate_temp_password(length: int = 12) -> str:
@@ -59,28 +136,154 @@ def create_invitation(
 
     roles = list(Role._default_manager.filter(key__in=list(role_keys)))
     inv.roles.add(*roles)
-    transaction.on_commit(
-        partial(send_invitation_email, invitation=inv, raw_token=token)
-    )
+    enqueue_invitation_email(invitation=inv, raw_token=token)
 
     return CreatedInvitation(invitation=inv, token=token)
 
 
+@dataclass(frozen=True)
+class BulkInvitationRow:
+    email: str
+    invitee_name: str
+    role_keys: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class BulkInvitationResult:
+    row: int  # posição 1-based na entrada
+    email: str
+    status: str  # created | skipped | error
+    detail: str | None = None
+    invitation: Invitation | None = None
+
+
+def create_invitations_bulk(
+    *, invited_by: User, rows: Iterable[BulkInvitationRow]
+) -> list[BulkInvitationResult]:
+    """
+    Cria convites em lote com custo constante de queries:
+    1 lookup de roles, 1 lookup de pendentes (índice email+status) e
+    bulk_create de Invitation, InvitationRole e outbox de e-mail.
+    """
+    rows = list(rows)
+    if len(rows) > MAX_BULK_INVITATIONS:
+        raise ValueError("TOO_MANY_INVITATIONS")
+
+    normalized = [
+        (
+            row.email.lower().strip(),
+            row.invitee_name.strip(),
+            {k.strip() for k in row.role_keys if k.strip()},
+        )
+        for row in rows
+    ]
+
+    all_keys = set().union(*(keys for _, _, keys in normalized))
+    roles_by_key = {r.key: r for r in Role._default_manager.filter(key__in=all_keys)}
+
+    emails = {email for email, _, _ in normalized}
+    pending = set(
+        Invitation._default_manager.filter(
+            email__in=emails,
+            status=InvitationStatus.PENDING,
+            expires_at__gt=timezone.now(),
+        ).values_list("email", flat=True)
+    )
+
+    results: list[BulkInvitationResult | None] = [None] * len(rows)
+    to_create: list[tuple[int, Invitation, str, set[str]]] = []
+    seen: set[str] = set()
+    expires_at = Invitation.default_expires_at()
+
+    for i, (email, name, keys) in enumerate(normalized):
+        try:
+            validate_email(email)
+        except ValidationError:
+            results[i] = BulkInvitationResult(i + 1, email, "error", "INVALID_EMAIL")
+            continue
+        if not name:
+            results[i] = BulkInvitationResult(i + 1, email, "error", "NAME_REQUIRED")
+            continue
+        if keys - roles_by_key.keys():
+            results[i] = BulkInvitationResult(i + 1, email, "error", "UNKNOWN_ROLE")
+            continue
+        if email in pending:
+            results[i] = BulkInvitationResult(
+                i + 1, email, "skipped", "ALREADY_INVITED"
+            )
+            continue
+        if email in seen:
+            results[i] = BulkInvitationResult(
+                i + 1, email, "skipped", "DUPLICATE_IN_BATCH"
+            )
+            continue
+        seen.add(email)
+
+        token = Invitation.build_token()
+        inv = Invitation(
+            email=email,
+            invitee_name=name,
+            token_hash=Invitation.hash_token(token),
+            invited_by=invited_by,
+            status=InvitationStatus.PENDING,
+            expires_at=expires_at,
+        )
+        to_create.append((i, inv, token, keys))
+
+    with transaction.atomic():
+        Invitation._default_manager.bulk_create(
+            [inv for _, inv, _, _ in to_create], batch_size=BULK_BATCH_SIZE
+        )
+        InvitationRole.objects.bulk_create(
+            [
+                InvitationRole(invitation=inv, role=roles_by_key[key])
+                for _, inv, _, keys in to_create
+                for key in keys
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        enqueue_invitation_emails([(inv, token) for _, inv, token, _ in to_create])
+
+    for i, inv, _, _ in to_create:
+        results[i] = BulkInvitationResult(i + 1, inv.email, "created", invitation=inv)
+
+    return results
+
+
+def _is_usable(inv: Invitation) -> bool:
+    return (
+        inv.status == InvitationStatus.PENDING
+        and inv.used_at is None
+        and not inv.is_expired()
+    )
+
+
 def validate_invitation_token(*, token: str) -> Invitation | None:
+    """
+    Leitura pura: convites vencidos só são marcados EXPIRED pelo
+    `expire_pending_invitations` (comando `expire_invitations`).
+    """
     token_hash = Invitation.hash_token(token)
     inv = Invitation._default_manager.filter(token_hash=token_hash).first()
-    if not inv:
-        return None
-    if inv.status != InvitationStatus.PENDING or inv.used_at is not None:
-        return None
-    if inv.is_expired():
-        inv.status = InvitationStatus.EXPIRED
-        inv.save(update_fields=["status", "updated_at"])
+    if not inv or not _is_usable(inv):
         return None
     return inv
 
 
-@transaction.atomic
+def expire_pending_invitations(*, now=None) -> int:
+    """Marca como EXPIRED todos os convites pendentes vencidos (um único UPDATE)."""
+    now = now or timezone.now()
+    return Invitation._default_manager.filter(
+        expires_at__lte=now, status=InvitationStatus.PENDING
+    ).update(status=InvitationStatus.EXPIRED, updated_at=now)
+
+
+@dataclass(frozen=True)
+class Registration:
+    user: User
+    role_keys: list[str]  # já carregados; evita reconsultar para a resposta
+
+
 def register_from_invitation(
     *,
     token: str,
@@ -89,52 +292,60 @@ def register_from_invitation(
     bio: str | None = None,
     github_url: str,
     linkedin_url: str,
-) -> User:
-    inv = validate_invitation_token(token=token)
-    if not inv:
-        raise ValueError("INVALID_OR_EXPIRED_INVITATION")
-
-    invite_role_keys = set(inv.roles.values_list("key", flat=True))
-    is_profile_staff = bool(invite_role_keys & ALLOWED_ADMIN_ONLY_ROLES)
-
-    user = User.objects.create(
-        username=_make_username(inv.email),
-        email=inv.email,
-        is_staff=is_profile_staff,
-        is_superuser=False,
-        is_active=True,
-        must_change_password=False,  # requer campo no model User
-    )
-    user.set_password(password)
-    user.save(update_fields=["password"])
+) -> Registration:
+    # hash fora da transação: o lock do convite não fica preso ao custo de CPU
+    password_hash = make_password(password)
 
-    Profile.objects.create(
-        user=user,
-        display_name=display_name,
-        bio=bio,
-        github_url=github_url,
-        linkedin_url=linkedin_url,
-    )
+    with transaction.atomic():
+        # o lock serializa aceites concorrentes do mesmo convite
+        inv = (
+            Invitation._default_manager.select_for_update()
+            .filter(token_hash=Invitation.hash_token(token))
+            .first()
+        )
+        if not inv or not _is_usable(inv):
+            raise ValueError("INVALID_OR_EXPIRED_INVITATION")
+
+        roles = list(inv.roles.all())
+        role_keys = [role.key for role in roles]
+
+        user = _create_user(
+            email=inv.email,
+            password=password_hash,
+            is_staff=bool(set(role_keys) & ALLOWED_ADMIN_ONLY_ROLES),
+            is_superuser=False,
+            is_active=True,
+            must_change_password=False,  # requer campo no model User
+        )
 
-    for role in inv.roles.all():
-        user.user_roles.create(role=role)
+        Profile.objects.create(
+            user=user,
+            display_name=display_name,
+            bio=bio,
+            github_url=github_url,
+            linkedin_url=linkedin_url,
+        )
 
-    accepted_at = timezone.now()
-    inv.status = InvitationStatus.ACCEPTED
-    inv.accepted_by = user
-    inv.accepted_at = accepted_at
-    inv.used_at = accepted_at
-    inv.save(
-        update_fields=[
-            "status",
-            "accepted_by",
-            "accepted_at",
-            "used_at",
-            "updated_at",
-        ]
-    )
+        # usuário novo: não há cache de membro para invalidar (bulk_create
+        # não dispara os signals de UserRole)
+        UserRole.objects.bulk_create([UserRole(user=user, role=r) for r in roles])
+
+        accepted_at = timezone.now()
+        inv.status = InvitationStatus.ACCEPTED
+        inv.accepted_by = user
+        inv.accepted_at = accepted_at
+        inv.used_at = accepted_at
+        inv.save(
+            update_fields=[
+                "status",
+                "accepted_by",
+                "accepted_at",
+                "used_at",
+                "updated_at",
+            ]
+        )
 
-    return user
+    return Registration(user=user, role_keys=role_keys)
 
 
 def accept_invitation(
@@ -145,7 +356,7 @@ def accept_invitation(
     bio: str | None = None,
     github_url: str,
     linkedin_url: str,
-) -> User:
+) -> Registration:
     return register_from_invitation(
         token=token,
         password=password,
@@ -156,77 +367,192 @@ def accept_invitation(
     )
 
 
-def provision_admin_only_invitation(
-    *, invitation: Invitation, provisioned_by: User
-) -> tuple[User, str]:
-    if invitation.status != InvitationStatus.PENDING:
-        raise ValueError("INVITATION_NOT_PENDING")
+@dataclass
+class ProvisionResult:
+    invitation: Invitation
+    user: User | None = None
+    temp_password: str | None = None
+    error: str | None = None
+
+
+def _hash_passwords(passwords: list[str]) -> list[str]:
+    """
+    PBKDF2 (hashlib) e argon2 liberam o GIL durante o hash, então uma
+    thread pool paraleliza de verdade o custo de CPU do lote.
+    """
+    if len(passwords) <= 1:
+        return [make_password(p) for p in passwords]
+    workers = min(len(passwords), os.cpu_count() or 1, PASSWORD_HASH_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(make_password, passwords))
+
+
+def provision_admin_only_invitations(
+    *, invitations: Iterable[Invitation], provisioned_by: User
+) -> list[ProvisionResult]:
+    """
+    Provisiona acesso temporário para vários convites de uma vez.
+
+    - roles, usuários e perfis são carregados uma vez para o lote inteiro;
+    - as senhas temporárias são hasheadas em paralelo, fora da transação;
+    - a escrita é feita com operações em lote numa única transação.
+    """
+    invitations = list(invitations)
+    prefetch_related_objects(invitations, "roles")
+    results = [ProvisionResult(invitation=inv) for inv in invitations]
+
+    now = timezone.now()
+    expired: list[Invitation] = []
+    ready: list[tuple[ProvisionResult, str, set[str]]] = []
+    seen_emails: set[str] = set()
+    for result in results:
+        inv = result.invitation
+        email = inv.email.lower().strip()
+        selected_keys = {r.key for r in inv.roles.all()} & ALLOWED_ADMIN_ONLY_ROLES
+        if inv.status != InvitationStatus.PENDING:
+            result.error = "INVITATION_NOT_PENDING"
+        elif inv.expires_at <= now:
+            result.error = "INVITATION_EXPIRED"
+            expired.append(inv)
+        elif not selected_keys:
+            result.error = "INVITATION_ROLE_REQUIRED"
+        elif email in seen_emails:
+            result.error = "DUPLICATE_IN_BATCH"
+        else:
+            seen_emails.add(email)
+            ready.append((result, email, selected_keys))
 
-    if invitation.is_expired():
-        invitation.status = InvitationStatus.EXPIRED
-        invitation.save(update_fields=["status", "updated_at"])
-        raise ValueError("INVITATION_EXPIRED")
+    if expired:
+        Invitation._default_manager.filter(pk__in=[i.pk for i in expired]).update(
+            status=InvitationStatus.EXPIRED, updated_at=now
+        )
+        for inv in expired:
+            inv.status = InvitationStatus.EXPIRED
 
-    with transaction.atomic():
-        role_keys = set(invitation.roles.values_list("key", flat=True))
-        selected_keys = role_keys & ALLOWED_ADMIN_ONLY_ROLES
-        if not selected_keys:
-            raise ValueError("INVITATION_ROLE_REQUIRED")
-
-        email = invitation.email.lower().strip()
-        user = User.objects.filter(email__iexact=email).first()
-
-        if not user:
-            user = User.objects.create(
-                username=_make_username(email),
-                email=email,
-                is_active=True,
-                is_staff=True,
-                is_superuser=False,
-                must_change_password=True,  # requer campo no model User
-            )
+    if not ready:
+        return results
+
+    temp_passwords = [_generate_temp_password() for _ in ready]
+    hashes = _hash_passwords(temp_passwords)
+
+    attempts = 0
+    while True:
+        try:
+            _write_provisioning(ready, hashes, provisioned_by=provisioned_by)
+            break
+        except IntegrityError:
+            # username tomado por um cadastro concorrente: realoca e tenta de novo
+            attempts += 1
+            if attempts >= USERNAME_MAX_ATTEMPTS:
+                raise
+
+    for (result, _, _), temp_password in zip(ready, temp_passwords, strict=True):
+        result.temp_password = temp_password
+    return results
+
+
+@transaction.atomic
+def _write_provisioning(
+    ready: list[tuple[ProvisionResult, str, set[str]]],
+    hashes: list[str],
+    *,
+    provisioned_by: User,
+) -> None:
+    emails = [email for _, email, _ in ready]
+    users_by_email = {
+        u.email_lower: u
+        for u in User.objects.annotate(email_lower=Lower("email")).filter(
+            email_lower__in=emails
+        )
+    }
+
+    new_emails = [e for e in emails if e not in users_by_email]
+    new_users = [
+        User(
+            username=username,
+            email=email,
+            is_active=True,
+            is_staff=True,
+            is_superuser=False,
+            must_change_password=True,  # requer campo no model User
+        )
+        for email, username in zip(
+            new_emails, allocate_usernames(new_emails), strict=True
+        )
+    ]
 
-        temp_password = _generate_temp_password()
+    existing_users = list(users_by_email.values())
+    users_by_email.update((u.email, u) for u in new_users)
+    for (_, email, _), password_hash in zip(ready, hashes, strict=True):
+        user = users_by_email[email]
+        user.password = password_hash
         user.is_staff = True
         user.is_superuser = False
         user.is_active = True
         user.must_change_password = True
-        user.set_password(temp_password)
-        user.save(
-            update_fields=[
-                "password",
-                "is_staff",
-                "is_superuser",
-                "is_active",
-                "must_change_password",
-            ]
-        )
 
-        Profile.objects.get_or_create(
-            user=user,
-            defaults={"display_name": email.split("@")[0]},
-        )
+    User.objects.bulk_update(
+        existing_users,
+        ["password", "is_staff", "is_superuser", "is_active", "must_change_password"],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    User.objects.bulk_create(new_users, batch_size=BULK_BATCH_SIZE)
 
-        for role in Role.objects.filter(key__in=selected_keys):
-            user.user_roles.get_or_create(role=role)
-
-        invitation.status = InvitationStatus.ACCEPTED
-        invitation.accepted_by = user
-        invitation.accepted_at = timezone.now()
-        if not invitation.invited_by_id:
-            invitation.invited_by = provisioned_by
-            invitation.save(
-                update_fields=[
-                    "status",
-                    "accepted_by",
-                    "accepted_at",
-                    "invited_by",
-                    "updated_at",
-                ]
-            )
-        else:
-            invitation.save(
-                update_fields=["status", "accepted_by", "accepted_at", "updated_at"]
-            )
+    user_ids = [u.id for u in users_by_email.values()]
+    with_profile = set(
+        Profile.objects.filter(user_id__in=user_ids).values_list("user_id", flat=True)
+    )
+    Profile.objects.bulk_create(
+        [
+            Profile(user=users_by_email[email], display_name=email.split("@")[0])
+            for email in emails
+            if users_by_email[email].id not in with_profile
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    roles_by_key = {
+        r.key: r for r in Role.objects.filter(key__in=ALLOWED_ADMIN_ONLY_ROLES)
+    }
+    UserRole.objects.bulk_create(
+        [
+            UserRole(user=users_by_email[email], role=roles_by_key[key])
+            for _, email, keys in ready
+            for key in keys
+            if key in roles_by_key
+        ],
+        batch_size=BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+    accepted_at = timezone.now()
+    invitations = []
+    for result, email, _ in ready:
+        inv = result.invitation
+        inv.status = InvitationStatus.ACCEPTED
+        inv.accepted_by = users_by_email[email]
+        inv.accepted_at = accepted_at
+        inv.updated_at = accepted_at
+        if not inv.invited_by_id:
+            inv.invited_by = provisioned_by
+        result.user = users_by_email[email]
+        invitations.append(inv)
+    Invitation._default_manager.bulk_update(
+        invitations,
+        ["status", "accepted_by", "accepted_at", "invited_by", "updated_at"],
+        batch_size=BULK_BATCH_SIZE,
+    )
 
-        return user, temp_password
+    # bulk_* não dispara post_save: avisa quem mantém caches/índices de membros
+    members_changed.send(sender=User, user_ids=user_ids)
+
+
+def provision_admin_only_invitation(
+    *, invitation: Invitation, provisioned_by: User
+) -> tuple[User, str]:
+    (result,) = provision_admin_only_invitations(
+        invitations=[invitation], provisioned_by=provisioned_by
+    )
+    if result.error:
+        raise ValueError(result.error)
+    return result.user, result.temp_password
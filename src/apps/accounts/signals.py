@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .me import bump_roles_version, invalidate_me_cache
+from .models import Profile, Role, UserRole
+
+# Enviado após escritas em lote (bulk_create/bulk_update) que não disparam
+# post_save. kwargs: user_ids (lista de ids afetados).
+members_changed = Signal()
+
+
+@receiver([post_save, post_delete], sender=Profile)
+@receiver([post_save, post_delete], sender=UserRole)
+def me_changed(sender, instance, **kwargs):
+    invalidate_me_cache([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=Role)
+def role_changed(sender, **kwargs):
+    bump_roles_version()
+
+
+@receiver(members_changed)
+def members_bulk_changed(sender, user_ids, **kwargs):
+    invalidate_me_cache(user_ids)
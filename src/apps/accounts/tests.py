@@ -1,11 +1,21 @@
+import io
 import json
 import re
 
 from django.core import mail
+from django.core.management import call_command
 from django.test import Client, TransactionTestCase, override_settings
 
 from apps.accounts.auth import create_access_token
-from apps.accounts.models import Invitation, InvitationStatus, Profile, Role, User
+from apps.accounts.models import (
+    EmailOutboxStatus,
+    Invitation,
+    InvitationEmail,
+    InvitationStatus,
+    Profile,
+    Role,
+    User,
+)
 
 
 @override_settings(
@@ -28,6 +38,7 @@ class InvitationFlowTests(TransactionTestCase):
         }
 
     def _extract_token_from_email(self) -> str:
+        call_command("send_invitation_emails", stdout=io.StringIO())
         body = mail.outbox[-1].body
         match = re.search(r"https://weorgst\.com/invite\?token=([a-f0-9]+)", body)
         self.assertIsNotNone(match)
@@ -52,7 +63,17 @@ class InvitationFlowTests(TransactionTestCase):
         self.assertEqual(payload["email"], "novo@orgst.com")
         self.assertEqual(payload["name"], "Novo Membro")
 
+        # e-mail sai pelo outbox, não na request
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            InvitationEmail.objects.get().status, EmailOutboxStatus.PENDING
+        )
+        call_command("send_invitation_emails", stdout=io.StringIO())
+
         self.assertEqual(len(mail.outbox), 1)
+        outbox_item = InvitationEmail.objects.get()
+        self.assertEqual(outbox_item.status, EmailOutboxStatus.SENT)
+        self.assertEqual(outbox_item.raw_token, "")
         self.assertIn("ORGST DEV_PLATFORM v1.0.0", mail.outbox[0].subject)
         self.assertIn("Novo Membro", mail.outbox[0].body)
         self.assertIn("https://weorgst.com/invite?token=", mail.outbox[0].body)
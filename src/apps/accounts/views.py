@@ -1,25 +1,51 @@
+import csv
+import io
+
 from django.conf import settings
-from django.contrib.auth import get_user_model
-from django.db.models import Q
-from django.http import HttpRequest
-from ninja import Router
+from django.http import HttpRequest, HttpResponse
+from ninja import File, Router
 from ninja.errors import HttpError
+from ninja.files import UploadedFile
+
+from orgst.common.async_views import async_variant
+from orgst.common.http import conditional_response
 
-from .auth import create_access_token
+from .auth import (
+    create_token_pair,
+    read_auth,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
+from .backends import find_user_by_identifier
+from .hashing import check_password_constant_cost, hash_cpu, hash_metrics
+from .keys import get_key_ring
+from .me import aget_me_snapshot, get_me_snapshot
+from .ratelimit import enforce_auth_rate_limit
 from .schemas import (
+    HashMetricOut,
     InvitationAcceptIn,
     InvitationAcceptOut,
+    InvitationBulkItemIn,
+    InvitationBulkOut,
     InvitationCreateIn,
     InvitationCreateOut,
     InvitationValidateOut,
     MeOut,
+    RefreshIn,
     TokenIn,
     TokenOut,
 )
-from .services import accept_invitation, create_invitation, validate_invitation_token
+from .services import (
+    BulkInvitationRow,
+    accept_invitation,
+    create_invitation,
+    create_invitations_bulk,
+    validate_invitation_token,
+)
 
 router = Router(tags=["accounts"])
-User = get_user_model()
+
+MAX_BULK_CSV_BYTES = 1024 * 1024
 
 
 def _can_create_invitation(user) -> bool:
@@ -30,8 +56,33 @@ def _can_create_invitation(user) -> bool:
     return user.user_roles.filter(role__key__in=["admin", "cofounder"]).exists()
 
 
-@router.get("/me", response=MeOut)
-def api_me(request: HttpRequest):
+def _me_out(user, me) -> dict:
+    return {
+        "id": str(user.id),
+        "username": user.username,
+        "email": user.email,
+        "display_name": me.display_name,
+        "roles": list(me.roles),
+        "is_staff": bool(user.is_staff),
+    }
+
+
+async def aapi_me(request: HttpRequest, response: HttpResponse):
+    """Variante async de `api_me` (API_ASYNC_VIEWS)."""
+    user = request.user
+    if not getattr(user, "is_authenticated", False):
+        raise HttpError(401, "UNAUTHORIZED")
+
+    me = await aget_me_snapshot(user)
+    not_modified = conditional_response(request, response, etag=me.etag(user))
+    if not_modified is not None:
+        return not_modified
+    return _me_out(user, me)
+
+
+@router.get("/me", response=MeOut, auth=read_auth())
+@async_variant(aapi_me)
+def api_me(request: HttpRequest, response: HttpResponse):
     user = request.user
 
     # Com auth global, isso quase nunca roda sem user válido,
@@ -39,42 +90,59 @@ def api_me(request: HttpRequest):
     if not getattr(user, "is_authenticated", False):
         raise HttpError(401, "UNAUTHORIZED")
 
-    # Profile pode não existir dependendo do fluxo (ex.: usuário criado via admin)
-    display_name = None
-    profile = getattr(user, "profile", None)
-    if profile:
-        display_name = getattr(profile, "display_name", None)
+    # o principal já veio do JWTAuth; perfil + papéis: 1 query ou cache
+    me = get_me_snapshot(user)
 
-    roles = list(
-        user.user_roles.select_related("role").values_list("role__key", flat=True)
-    )
+    # a SPA chama a cada navegação: 304 sem corpo quando nada mudou
+    not_modified = conditional_response(request, response, etag=me.etag(user))
+    if not_modified is not None:
+        return not_modified
 
-    return {
-        "id": str(user.id),
-        "username": user.username,
-        "email": user.email,
-        "display_name": display_name,
-        "roles": roles,
-        "is_staff": bool(user.is_staff),
-    }
+    return _me_out(user, me)
 
 
 @router.post("/auth/token", auth=None, response=TokenOut)
 def api_token(request: HttpRequest, payload: TokenIn):
     identifier = payload.identifier.strip()
+    enforce_auth_rate_limit(request, "auth_token", identifier)
 
-    user = (
-        User.objects.filter(
-            Q(email__iexact=identifier) | Q(username__iexact=identifier)
-        )
-        .only("id", "is_active", "password", "email", "username")
-        .first()
+    user = find_user_by_identifier(
+        identifier, fields=("id", "is_active", "password", "username")
     )
 
-    if not user or not user.is_active or not user.check_password(payload.password):
+    with hash_cpu("auth_token"):
+        valid = check_password_constant_cost(user, payload.password)
+    if not valid:
         raise HttpError(401, "INVALID_CREDENTIALS")
 
-    return {"access": create_access_token(user)}
+    pair = create_token_pair(user)
+    return {"access": pair.access, "refresh": pair.refresh}
+
+
+@router.post("/auth/refresh", auth=None, response=TokenOut)
+def api_refresh_token(request: HttpRequest, payload: RefreshIn):
+    # só verificação HMAC + 1 linha no banco, sem hash de senha
+    try:
+        pair = rotate_refresh_token(payload.refresh)
+    except ValueError as exc:
+        raise HttpError(401, str(exc)) from None
+    return {"access": pair.access, "refresh": pair.refresh}
+
+
+@router.get("/auth/jwks", auth=None)
+def api_jwks(request: HttpRequest, response: HttpResponse):
+    """Chaves públicas (JWKS) para outros serviços validarem nossos tokens."""
+    response["Cache-Control"] = "public, max-age=300"
+    return get_key_ring().jwks()
+
+
+@router.post("/auth/logout", auth=None, response={204: None})
+def api_logout(request: HttpRequest, payload: RefreshIn):
+    try:
+        revoke_refresh_token(payload.refresh)
+    except ValueError as exc:
+        raise HttpError(401, str(exc)) from None
+    return 204, None
 
 
 @router.post("/invitations", response=InvitationCreateOut)
@@ -100,6 +168,70 @@ def api_create_invitation(request: HttpRequest, payload: InvitationCreateIn):
     }
 
 
+def _bulk_invite(request: HttpRequest, rows: list[BulkInvitationRow]) -> dict:
+    if not _can_create_invitation(request.user):
+        raise HttpError(403, "FORBIDDEN")
+
+    try:
+        results = create_invitations_bulk(invited_by=request.user, rows=rows)
+    except ValueError as exc:
+        raise HttpError(400, str(exc)) from None
+
+    statuses = [r.status for r in results]
+    return {
+        "created": statuses.count("created"),
+        "skipped": statuses.count("skipped"),
+        "errors": statuses.count("error"),
+        "results": [
+            {
+                "row": r.row,
+                "email": r.email,
+                "status": r.status,
+                "id": str(r.invitation.id) if r.invitation else None,
+                "detail": r.detail,
+            }
+            for r in results
+        ],
+    }
+
+
+@router.post("/invitations/bulk", response=InvitationBulkOut)
+def api_bulk_invitations(request: HttpRequest, payload: list[InvitationBulkItemIn]):
+    rows = [
+        BulkInvitationRow(
+            email=item.email, invitee_name=item.name, role_keys=tuple(item.role_keys)
+        )
+        for item in payload
+    ]
+    return _bulk_invite(request, rows)
+
+
+@router.post("/invitations/bulk/csv", response=InvitationBulkOut)
+def api_bulk_invitations_csv(request: HttpRequest, file: UploadedFile = File(...)):  # noqa: B008
+    """CSV com cabeçalho `email,name,roles` (roles separados por `;`)."""
+    if file.size and file.size > MAX_BULK_CSV_BYTES:
+        raise HttpError(400, "CSV_TOO_LARGE")
+
+    try:
+        text = file.read().decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HttpError(400, "INVALID_CSV") from None
+
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or not {"email", "name"} <= set(reader.fieldnames):
+        raise HttpError(400, "INVALID_CSV")
+
+    rows = [
+        BulkInvitationRow(
+            email=line.get("email") or "",
+            invitee_name=line.get("name") or "",
+            role_keys=tuple((line.get("roles") or "").split(";")),
+        )
+        for line in reader
+    ]
+    return _bulk_invite(request, rows)
+
+
 @router.get("/invitations/validate", auth=None, response=InvitationValidateOut)
 def api_validate_invitation(request: HttpRequest, token: str):
     inv = validate_invitation_token(token=token)
@@ -114,55 +246,46 @@ def api_validate_invitation(request: HttpRequest, token: str):
     }
 
 
-@router.post("/register", auth=None, response=InvitationAcceptOut)
-def api_register_from_invitation(request: HttpRequest, payload: InvitationAcceptIn):
+def _register(request: HttpRequest, payload: InvitationAcceptIn, scope: str) -> dict:
+    enforce_auth_rate_limit(request, scope, payload.invite_token)
     try:
-        user = accept_invitation(
-            token=payload.invite_token,
-            password=payload.password,
-            display_name=payload.display_name,
-            bio=payload.bio,
-            github_url=payload.github_url,
-            linkedin_url=payload.linkedin_url,
-        )
+        with hash_cpu(scope):
+            registration = accept_invitation(
+                token=payload.invite_token,
+                password=payload.password,
+                display_name=payload.display_name,
+                bio=payload.bio,
+                github_url=payload.github_url,
+                linkedin_url=payload.linkedin_url,
+            )
     except ValueError:
         raise HttpError(400, "INVALID_OR_EXPIRED_INVITATION") from None
 
-    roles = list(
-        user.user_roles.select_related("role").values_list("role__key", flat=True)
-    )
-
+    user = registration.user
+    pair = create_token_pair(user)
     return {
         "user_id": str(user.id),
         "email": user.email,
-        "access": create_access_token(user),
+        "access": pair.access,
+        "refresh": pair.refresh,
         "pid": user.id,
-        "roles": roles,
+        "roles": registration.role_keys,
     }
 
 
+@router.post("/register", auth=None, response=InvitationAcceptOut)
+def api_register_from_invitation(request: HttpRequest, payload: InvitationAcceptIn):
+    return _register(request, payload, "register")
+
+
 @router.post("/invitations/accept", auth=None, response=InvitationAcceptOut)
 def api_accept_invitation(request: HttpRequest, payload: InvitationAcceptIn):
-    try:
-        user = accept_invitation(
-            token=payload.invite_token,
-            password=payload.password,
-            display_name=payload.display_name,
-            bio=payload.bio,
-            github_url=payload.github_url,
-            linkedin_url=payload.linkedin_url,
-        )
-    except ValueError:
-        raise HttpError(400, "INVALID_OR_EXPIRED_INVITATION") from None
+    return _register(request, payload, "invitations_accept")
 
-    roles = list(
-        user.user_roles.select_related("role").values_list("role__key", flat=True)
-    )
 
-    return {
-        "user_id": str(user.id),
-        "email": user.email,
-        "access": create_access_token(user),
-        "pid": user.id,
-        "roles": roles,
-    }
+@router.get("/auth/hash-metrics", response=dict[str, HashMetricOut])
+def api_hash_metrics(request: HttpRequest):
+    """CPU gasto em hash de senha por endpoint (acumulado no cache)."""
+    if not getattr(request.user, "is_staff", False):
+        raise HttpError(403, "FORBIDDEN")
+    return hash_metrics()
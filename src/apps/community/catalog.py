@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+
+from .models import Skill
+
+CATALOG_VERSION_KEY = "community:skills:version"
+CATALOG_DATA_TIMEOUT = 60 * 60 * 24  # versões antigas expiram sozinhas
+# Com cache por processo (locmem) a invalidação só chega ao processo que
+# gravou; a versão expira para cada processo reconferir o banco de tempos em
+# tempos.
+CATALOG_VERSION_TIMEOUT = 60
+
+_SKILL_FIELDS = ("id", "name", "category", "created_at")
+
+_local_catalog: SkillCatalog | None = None
+
+
+def _data_key(version: str) -> str:
+    return f"community:skills:catalog:{version}"
+
+
+def _version_for(rows: list[dict]) -> str:
+    # derivada do conteúdo: mesma versão (e ETag) em todos os processos, e a
+    # reconferência periódica não muda o ETag se nada mudou
+    return hashlib.md5(repr(rows).encode(), usedforsecurity=False).hexdigest()
+
+
+@dataclass(frozen=True)
+class SkillCatalog:
+    """
+    Snapshot imutável do catálogo de skills.
+
+    `skills` fica ordenado por nome; `_prefix_index` guarda (nome normalizado,
+    posição) ordenado para buscas por prefixo com bisect.
+    """
+
+    version: str
+    skills: tuple[dict, ...]
+    _folded: tuple[str, ...] = field(repr=False)
+    _prefix_index: tuple[tuple[str, int], ...] = field(repr=False)
+    _by_category: dict[str, tuple[int, ...]] = field(repr=False)
+
+    @classmethod
+    def build(cls, version: str, rows: list[dict]) -> SkillCatalog:
+        skills = tuple(rows)
+        folded = tuple(s["name"].casefold() for s in skills)
+        by_category: dict[str, list[int]] = {}
+        for pos, s in enumerate(skills):
+            by_category.setdefault(s["category"], []).append(pos)
+        return cls(
+            version=version,
+            skills=skills,
+            _folded=folded,
+            _prefix_index=tuple(sorted((name, pos) for pos, name in enumerate(folded))),
+            _by_category={k: tuple(v) for k, v in by_category.items()},
+        )
+
+    def _prefix_positions(self, prefix: str) -> list[int]:
+        prefix = prefix.casefold()
+        start = bisect_left(self._prefix_index, (prefix, -1))
+        positions = []
+        for name, pos in self._prefix_index[start:]:
+            if not name.startswith(prefix):
+                break
+            positions.append(pos)
+        return sorted(positions)
+
+    def filter(
+        self,
+        *,
+        category: str | None = None,
+        q: str | None = None,
+        prefix: str | None = None,
+    ) -> list[dict]:
+        if prefix:
+            positions = self._prefix_positions(prefix)
+        else:
+            positions = range(len(self.skills))
+
+        if category:
+            allowed = set(self._by_category.get(category, ()))
+            positions = [p for p in positions if p in allowed]
+
+        if q:
+            needle = q.casefold()
+            positions = [p for p in positions if needle in self._folded[p]]
+
+        return [self.skills[p] for p in positions]
+
+
+def _load_rows() -> list[dict]:
+    return list(Skill.objects.order_by("name").values(*_SKILL_FIELDS))
+
+
+def get_skill_catalog() -> SkillCatalog:
+    """
+    Retorna o catálogo atual.
+
+    Custo no caminho quente: 1 leitura do cache compartilhado (versão).
+    Os dados só são relidos (do cache compartilhado ou do banco) quando a
+    versão muda ou expira (`CATALOG_VERSION_TIMEOUT`).
+    """
+    global _local_catalog
+
+    version = cache.get(CATALOG_VERSION_KEY)
+    local = _local_catalog
+    if version is not None and local is not None and local.version == version:
+        return local
+
+    rows = cache.get(_data_key(version)) if version is not None else None
+    if rows is None:
+        rows = _load_rows()
+        version = _version_for(rows)
+        cache.set(_data_key(version), rows, timeout=CATALOG_DATA_TIMEOUT)
+        cache.set(CATALOG_VERSION_KEY, version, timeout=CATALOG_VERSION_TIMEOUT)
+
+    catalog = SkillCatalog.build(version, rows)
+    _local_catalog = catalog
+    return catalog
+
+
+async def _aload_rows() -> list[dict]:
+    return [row async for row in Skill.objects.order_by("name").values(*_SKILL_FIELDS)]
+
+
+async def aget_skill_catalog() -> SkillCatalog:
+    """Versão async de `get_skill_catalog` (mesmo cache e mesmo snapshot local)."""
+    global _local_catalog
+
+    version = await cache.aget(CATALOG_VERSION_KEY)
+    local = _local_catalog
+    if version is not None and local is not None and local.version == version:
+        return local
+
+    rows = await cache.aget(_data_key(version)) if version is not None else None
+    if rows is None:
+        rows = await _aload_rows()
+        version = _version_for(rows)
+        await cache.aset(_data_key(version), rows, timeout=CATALOG_DATA_TIMEOUT)
+        await cache.aset(CATALOG_VERSION_KEY, version, timeout=CATALOG_VERSION_TIMEOUT)
+
+    catalog = SkillCatalog.build(version, rows)
+    _local_catalog = catalog
+    return catalog
+
+
+def invalidate_skill_catalog() -> None:
+    """
+    Descarta a versão publicada: a próxima leitura recarrega do banco e
+    publica a versão nova (com cache compartilhado, para todos os processos).
+    """
+    global _local_catalog
+
+    cache.delete(CATALOG_VERSION_KEY)
+    _local_catalog = None
@@ -58,3 +58,20 @@ class ProfilePatchIn(Schema):
     location: str | None = None
     github_url: str | None = None
     linkedin_url: str | None = None
+
+
+class MemberSuggestionOut(Schema):
+    id: int
+    username: str
+    display_name: str
+
+
+class SkillSuggestionOut(Schema):
+    id: int
+    name: str
+    category: str
+
+
+class TypeaheadOut(Schema):
+    members: list[MemberSuggestionOut]
+    skills: list[SkillSuggestionOut]
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import hashlib
 from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Prefetch, Q
+from django.utils import timezone
 
-from apps.accounts.models import UserRole
+from apps.accounts.models import Profile, UserRole
 
 from .models import Skill, UserSkill
 
 User = get_user_model()
 
+MEMBER_CACHE_TIMEOUT = 60 * 10
+
+
+@dataclass(frozen=True)
+class MemberDetail:
+    updated_at: datetime  # Profile.updated_at (Last-Modified)
+    data: dict  # avatar_url relativo; a view monta a URL absoluta
+    etag: str  # hash de `data`: muda com email, roles e skills, não só o perfil
+
 
 def list_members(*, q: str | None, role: str | None, skills: list[str] | None):
     qs = User.objects.select_related("profile").prefetch_related(
@@ -44,6 +58,86 @@ def get_member(*, user_id: int):
     )
 
 
+def member_cache_key(user_id: int) -> str:
+    return f"community:member:v2:{user_id}"
+
+
+def _serialize_member(u) -> dict:
+    p = u.profile
+    return {
+        "id": u.id,
+        "email": u.email,
+        "display_name": p.display_name,
+        "avatar_url": p.avatar.url if p.avatar else None,
+        "birth_date": p.birth_date,
+        "profession": p.profession,
+        "bio": p.bio,
+        "location": p.location,
+        "github_url": p.github_url,
+        "linkedin_url": p.linkedin_url,
+        "roles": [ur.role.key for ur in u.user_roles.all()],
+        "skills": [
+            {
+                "skill": {
+                    "id": us.skill.id,
+                    "name": us.skill.name,
+                    "category": us.skill.category,
+                    "created_at": us.skill.created_at,
+                },
+                "level": us.level,
+                "years_exp": us.years_exp,
+                "can_mentor": us.can_mentor,
+            }
+            for us in u.skills.all()
+        ],
+    }
+
+
+def get_member_detail(*, user_id: int) -> MemberDetail:
+    """
+    Detalhe do membro (perfil + roles + skills) com cache por usuário.
+    Cache miss: 3 queries (user+profile, roles, skills). Cache hit: nenhuma.
+    """
+    key = member_cache_key(user_id)
+    detail = cache.get(key)
+    if detail is not None:
+        return detail
+
+    u = get_member(user_id=user_id)
+    if not u:
+        raise ValueError("MEMBER_NOT_FOUND")
+    if not hasattr(u, "profile"):
+        raise ValueError("PROFILE_NOT_FOUND")
+
+    updated_at = u.profile.updated_at
+    data = _serialize_member(u)
+    digest = hashlib.md5(repr((updated_at, data)).encode(), usedforsecurity=False)
+    detail = MemberDetail(updated_at=updated_at, data=data, etag=digest.hexdigest())
+    cache.set(key, detail, timeout=MEMBER_CACHE_TIMEOUT)
+    return detail
+
+
+def invalidate_member_cache(user_id: int) -> None:
+    transaction.on_commit(lambda: cache.delete(member_cache_key(user_id)))
+
+
+def touch_member(user_id: int) -> None:
+    """
+    Marca o perfil como alterado quando muda algo fora do Profile (email,
+    roles, skills), para o cache e o Last-Modified do detalhe acompanharem.
+    """
+    Profile.objects.filter(user_id=user_id).update(updated_at=timezone.now())
+    invalidate_member_cache(user_id)
+
+
+def touch_members(user_ids: list[int]) -> None:
+    """Versão em lote de `touch_member` (um UPDATE + um delete_many no cache)."""
+    user_ids = list(user_ids)
+    Profile.objects.filter(user_id__in=user_ids).update(updated_at=timezone.now())
+    keys = [member_cache_key(uid) for uid in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
 @transaction.atomic
 def replace_user_skills(*, user: User, items: Iterable[dict]):
     """
@@ -70,3 +164,4 @@ def replace_user_skills(*, user: User, items: Iterable[dict]):
             )
         )
     UserSkill.objects.bulk_create(created)
+    touch_member(user.id)
@@ -0,0 +1,79 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.accounts.models import Profile, Role, User, UserRole
+from apps.accounts.signals import members_changed
+
+from .catalog import invalidate_skill_catalog
+from .models import Skill, UserSkill
+from .services import touch_member, touch_members
+from .typeahead import refresh_member, refresh_members
+
+# campos de User que aparecem no autocomplete e no detalhe do membro
+_TYPEAHEAD_USER_FIELDS = {"username", "is_active"}
+_MEMBER_USER_FIELDS = {"email"}
+
+
+@receiver([post_save, post_delete], sender=Skill)
+def skill_changed(sender, **kwargs):
+    # Só publica nova versão após o commit, senão outro request pode
+    # recarregar o catálogo antigo sob a versão nova.
+    transaction.on_commit(invalidate_skill_catalog)
+
+
+@receiver(post_save, sender=Skill)
+@receiver(pre_delete, sender=Skill)
+def skill_members_changed(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    # nome e categoria da skill aparecem no detalhe de quem a tem (no delete,
+    # antes da cascata, enquanto ainda dá para achar esses membros)
+    user_ids = UserSkill.objects.filter(skill=instance).values_list(
+        "user_id", flat=True
+    )
+    touch_members(user_ids)
+
+
+@receiver(post_save, sender=Role)
+def role_members_changed(sender, instance, created, **kwargs):
+    # a key do papel aparece no detalhe; o delete cascateia para UserRole
+    if created:
+        return
+    user_ids = UserRole.objects.filter(role=instance).values_list("user_id", flat=True)
+    touch_members(user_ids)
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+def user_role_changed(sender, instance, **kwargs):
+    touch_member(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def profile_changed(sender, instance, **kwargs):
+    transaction.on_commit(partial(refresh_member, instance.user_id))
+
+
+@receiver(post_save, sender=User)
+def member_user_changed(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is not None and not (_MEMBER_USER_FIELDS & set(update_fields)):
+        return
+    touch_member(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not (_TYPEAHEAD_USER_FIELDS & set(update_fields)):
+        return
+    transaction.on_commit(partial(refresh_member, instance.pk))
+
+
+@receiver(members_changed)
+def members_bulk_changed(sender, user_ids, **kwargs):
+    # escritas em lote não disparam post_save por linha
+    touch_members(user_ids)
+    transaction.on_commit(partial(refresh_members, list(user_ids)))
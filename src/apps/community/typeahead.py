@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+User = get_user_model()
+
+TYPEAHEAD_VERSION_KEY = "community:typeahead:version"
+# Log de mudanças: versão -> ids alterados. Processos até TYPEAHEAD_LOG_WINDOW
+# versões atrás aplicam só os deltas; mais que isso, reconstroem.
+TYPEAHEAD_LOG_WINDOW = 1000
+TYPEAHEAD_LOG_TIMEOUT = 60 * 60 * 24
+# A versão expira (como CATALOG_VERSION_TIMEOUT no catálogo): sem cache
+# compartilhado (locmem por processo) o log de um processo não chega aos
+# outros, e a expiração força a reconstrução. É o atraso máximo entre eles.
+TYPEAHEAD_VERSION_TIMEOUT = 60
+
+
+def _terms(*values: str | None) -> set[str]:
+    """Termos indexados: o valor completo e cada palavra (ex.: "ana silva", "silva")."""
+    terms: set[str] = set()
+    for value in values:
+        if not value:
+            continue
+        folded = value.casefold().strip()
+        terms.add(folded)
+        terms.update(folded.split())
+    return terms
+
+
+class MemberPrefixIndex:
+    """
+    Índice de prefixo ordenado (termo, user_id) para o autocomplete de membros.
+
+    Atualizado incrementalmente (insort/remove) pelo log de mudanças; a busca faz
+    bisect no primeiro termo >= prefixo e caminha até juntar `limit` membros.
+    """
+
+    def __init__(self, version: int | None = None):
+        self.version = version
+        self._lock = threading.Lock()
+        self._entries: list[tuple[str, int]] = []
+        self._terms: dict[int, set[str]] = {}
+        self._items: dict[int, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def load(self, rows) -> None:
+        """Carga inicial em lote: ordena uma vez em vez de insort por termo."""
+        with self._lock:
+            for user_id, username, display_name in rows:
+                terms = _terms(display_name, username)
+                self._terms[user_id] = terms
+                self._items[user_id] = self._item(user_id, username, display_name)
+                self._entries.extend((term, user_id) for term in terms)
+            self._entries.sort()
+
+    @staticmethod
+    def _item(user_id: int, username: str, display_name: str | None) -> dict:
+        return {
+            "id": user_id,
+            "username": username,
+            "display_name": display_name or username,
+        }
+
+    def upsert(self, *, user_id: int, username: str, display_name: str | None):
+        terms = _terms(display_name, username)
+        with self._lock:
+            self._discard(user_id)
+            for term in terms:
+                insort(self._entries, (term, user_id))
+            self._terms[user_id] = terms
+            self._items[user_id] = self._item(user_id, username, display_name)
+
+    def discard(self, user_id: int) -> None:
+        with self._lock:
+            self._discard(user_id)
+
+    def _discard(self, user_id: int) -> None:
+        for term in self._terms.pop(user_id, ()):
+            pos = bisect_left(self._entries, (term, user_id))
+            if pos < len(self._entries) and self._entries[pos] == (term, user_id):
+                del self._entries[pos]
+        self._items.pop(user_id, None)
+
+    def search(self, prefix: str, *, limit: int) -> list[dict]:
+        prefix = prefix.casefold().strip()
+        if not prefix:
+            return []
+
+        found: list[dict] = []
+        seen: set[int] = set()
+        with self._lock:
+            entries = self._entries
+            pos = bisect_left(entries, (prefix, -1))
+            while pos < len(entries) and len(found) < limit:
+                term, user_id = entries[pos]
+                if not term.startswith(prefix):
+                    break
+                pos += 1
+                if user_id not in seen:
+                    seen.add(user_id)
+                    found.append(self._items[user_id])
+        return found
+
+
+_index: MemberPrefixIndex | None = None
+_build_lock = threading.Lock()
+
+
+def _change_key(version: int) -> str:
+    return f"community:typeahead:change:{version}"
+
+
+def _head() -> int:
+    version = cache.get(TYPEAHEAD_VERSION_KEY)
+    if version is None:
+        # recomeça acima de qualquer versão anterior (µs desde a epoch): índices
+        # da numeração antiga ficam fora da janela e reconstroem
+        cache.add(
+            TYPEAHEAD_VERSION_KEY,
+            time.time_ns() // 1000,
+            timeout=TYPEAHEAD_VERSION_TIMEOUT,
+        )
+        version = cache.get(TYPEAHEAD_VERSION_KEY)
+    return version
+
+
+def _build_index(version: int) -> MemberPrefixIndex:
+    index = MemberPrefixIndex(version)
+    rows = User.objects.filter(is_active=True).values_list(
+        "id", "username", "profile__display_name"
+    )
+    index.load(rows.iterator(chunk_size=2000))
+    return index
+
+
+def _apply(index: MemberPrefixIndex, user_ids) -> None:
+    """Relê do banco o estado atual dos membros alterados (idempotente)."""
+    user_ids = list(user_ids)
+    rows = {
+        user_id: (username, display_name)
+        for user_id, username, display_name in User.objects.filter(
+            id__in=user_ids, is_active=True
+        ).values_list("id", "username", "profile__display_name")
+    }
+    for user_id in user_ids:
+        if user_id in rows:
+            username, display_name = rows[user_id]
+            index.upsert(user_id=user_id, username=username, display_name=display_name)
+        else:
+            index.discard(user_id)
+
+
+def _catch_up(index: MemberPrefixIndex, head: int) -> bool:
+    """
+    Aplica as mudanças publicadas entre a versão do índice e `head`. False
+    quando o log não cobre o intervalo (fora da janela, entrada expirada ou
+    ainda sendo gravada): aí o índice é reconstruído.
+    """
+    if not 0 < head - index.version <= TYPEAHEAD_LOG_WINDOW:
+        return False
+    keys = [_change_key(v) for v in range(index.version + 1, head + 1)]
+    changes = cache.get_many(keys)
+    if len(changes) != len(keys):
+        return False
+    _apply(index, set().union(*changes.values()))
+    index.version = head
+    return True
+
+
+def get_member_index() -> MemberPrefixIndex:
+    """
+    Índice do processo atual. Quando outro processo publicou mudanças, aplica
+    só os membros alterados (log de mudanças no cache compartilhado); reconstrói
+    do banco apenas se ficou fora da janela do log.
+    """
+    global _index
+
+    head = _head()
+    index = _index
+    if index is not None and index.version == head:
+        return index
+
+    with _build_lock:
+        index = _index
+        if index is not None and index.version == head:
+            return index
+        if index is None or not _catch_up(index, head):
+            # a versão é lida antes da carga: mudanças posteriores a ela são
+            # reaplicadas pelo log, e reaplicar é idempotente
+            _index = _build_index(head)
+        return _index
+
+
+def refresh_member(user_id: int) -> None:
+    """Publica a mudança de um membro (chamado via on_commit pelos signals)."""
+    refresh_members([user_id])
+
+
+def refresh_members(user_ids: list[int]) -> None:
+    """
+    Publica uma versão nova (incremento atômico no cache) com os ids
+    alterados. Cada processo, inclusive o que escreveu, aplica as mudanças
+    na próxima busca.
+    """
+    # incr mantém o prazo da chave: escrever não adia a expiração
+    try:
+        version = cache.incr(TYPEAHEAD_VERSION_KEY)
+    except ValueError:  # contador ausente (expirado, cache limpo/expulso)
+        _head()
+        version = cache.incr(TYPEAHEAD_VERSION_KEY)
+    cache.set(_change_key(version), list(user_ids), timeout=TYPEAHEAD_LOG_TIMEOUT)
+
+
+def reset_member_index() -> None:
+    global _index
+
+    _index = None
+    cache.delete(TYPEAHEAD_VERSION_KEY)
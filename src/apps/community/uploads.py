@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from functools import wraps
+from pathlib import Path
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from ninja.errors import HttpError
+
+MAX_AVATAR_BYTES = 5 * 1024 * 1024
+
+# Folga para boundary + headers do multipart antes de recusar pelo Content-Length.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Bytes suficientes para reconhecer todas as assinaturas abaixo.
+SNIFF_BYTES = 12
+
+AVATAR_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    """Identifica o formato da imagem pelos magic bytes (ignora o content_type)."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class AvatarUploadError(HttpError):
+    def __init__(self, message: str) -> None:
+        super().__init__(400, message)
+
+
+class AvatarUploadHandler(FileUploadHandler):
+    """
+    Handler de upload em streaming para avatar.
+
+    - Recusa pelo Content-Length antes de ler o corpo.
+    - Grava chunk a chunk em arquivo temporário (memória limitada ao chunk).
+    - Aborta assim que o arquivo passa de `max_bytes`.
+    - Valida o formato pelos primeiros bytes em vez de confiar no content_type.
+    """
+
+    def __init__(self, request=None, *, max_bytes: int = MAX_AVATAR_BYTES):
+        super().__init__(request)
+        self.max_bytes = max_bytes
+        self.file = None
+        self._head = b""
+        self._received = 0
+        self._sniffed = False
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        if content_length and content_length > (
+            self.max_bytes + MULTIPART_OVERHEAD_BYTES
+        ):
+            raise AvatarUploadError("IMAGE_TOO_LARGE")
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._head = b""
+        self._received = 0
+        self._sniffed = False
+        self.file = TemporaryUploadedFile(
+            self.file_name, self.content_type, 0, self.charset, self.content_type_extra
+        )
+
+    def receive_data_chunk(self, raw_data, start):
+        self._received += len(raw_data)
+        if self._received > self.max_bytes:
+            self._abort("IMAGE_TOO_LARGE")
+
+        if len(self._head) < SNIFF_BYTES:
+            self._head += raw_data[: SNIFF_BYTES - len(self._head)]
+            if len(self._head) == SNIFF_BYTES:
+                self._detect()
+
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self._sniffed:
+            # arquivo menor que SNIFF_BYTES
+            self._detect()
+        self.file.seek(0)
+        self.file.size = file_size
+        return self.file
+
+    def upload_interrupted(self):
+        if self.file is not None:
+            self.file.close()
+
+    def _detect(self) -> None:
+        content_type = sniff_image_type(self._head)
+        if content_type is None:
+            self._abort("INVALID_IMAGE")
+        self._sniffed = True
+        self.file.content_type = content_type
+        stem = Path(self.file.name or "avatar").stem or "avatar"
+        self.file.name = f"{stem}{AVATAR_EXTENSIONS[content_type]}"
+
+    def _abort(self, message: str) -> None:
+        self.file.close()
+        raise AvatarUploadError(message)
+
+
+def with_avatar_upload_handler(run):
+    """
+    Decorator para `ninja.decorators.decorate_view`: troca os upload handlers
+    antes de o Ninja ler `request.FILES`.
+    """
+
+    @wraps(run)
+    def wrapper(request, *args, **kwargs):
+        request.upload_handlers = [AvatarUploadHandler(request)]
+        return run(request, *args, **kwargs)
+
+    return wrapper
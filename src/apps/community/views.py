@@ -1,23 +1,40 @@
 from django.contrib.auth import get_user_model
+from django.http import HttpResponse
 from ninja import File, Router
+from ninja.decorators import decorate_view
 from ninja.errors import HttpError
 from ninja.files import UploadedFile
 
+from apps.accounts.auth import read_auth
 from apps.accounts.models import Profile
+from orgst.common.async_views import async_variant
+from orgst.common.db_router import replica_reads
+from orgst.common.http import conditional_response
+from orgst.common.serialization import trusted_output
 
-from .models import Skill
+from .catalog import aget_skill_catalog, get_skill_catalog
 from .schemas import (
     MemberCardOut,
     MemberDetailOut,
     ProfilePatchIn,
     SkillOut,
+    TypeaheadOut,
     UserSkillIn,
 )
-from .services import get_member, list_members, replace_user_skills
+from .services import (
+    get_member_detail,
+    invalidate_member_cache,
+    list_members,
+    replace_user_skills,
+)
+from .typeahead import get_member_index
+from .uploads import AVATAR_EXTENSIONS, MAX_AVATAR_BYTES, with_avatar_upload_handler
 
 User = get_user_model()
 router = Router(tags=["community"])
 
+TYPEAHEAD_MAX_LIMIT = 25
+
 
 def _avatar_url(request, profile):
     if profile and getattr(profile, "avatar", None) and hasattr(profile.avatar, "url"):
@@ -25,83 +42,123 @@ def _avatar_url(request, profile):
     return None
 
 
-@router.get("/skills", response=list[SkillOut])
-def list_skills(request, category: str | None = None, q: str | None = None):
-    qs = Skill.objects.all().order_by("name")
-    if category:
-        qs = qs.filter(category=category)
-    if q:
-        qs = qs.filter(name__icontains=q)
-    return qs
+def _skills_out(request, response, catalog, *, category, q, prefix):
+    # ETag muda só quando o catálogo muda (signals de Skill)
+    not_modified = conditional_response(
+        request, response, etag=f"skills-{catalog.version}"
+    )
+    if not_modified is not None:
+        return not_modified
 
+    return catalog.filter(category=category, q=q, prefix=prefix)
 
-@router.get("/members", response=list[MemberCardOut])
-def members(
+
+async def alist_skills(
     request,
+    response: HttpResponse,
+    category: str | None = None,
     q: str | None = None,
-    role: str | None = None,
-    skills: str | None = None,
+    prefix: str | None = None,
 ):
-    skill_list = [s.strip() for s in skills.split(",") if s.strip()] if skills else None
-    users = list_members(q=q, role=role, skills=skill_list)
-
-    out = []
-    for u in users:
-        profile = getattr(u, "profile", None)
-        out.append(
-            {
-                "id": u.id,
-                "email": u.email,
-                "display_name": profile.display_name if profile else u.username,
-                "avatar_url": _avatar_url(request, profile),
-                "roles": [ur.role.key for ur in u.user_roles.all()],
-                "skills": [us.skill.name for us in u.skills.all()],
-            }
-        )
-    return out
-
-
-router.get("/members/{user_id}", response=MemberDetailOut)
-
-
-def member_detail(request, user_id: int):
-    u = get_member(user_id=user_id)
-    if not u:
-        raise HttpError(404, "MEMBER_NOT_FOUND")
+    """Variante async de `list_skills` (API_ASYNC_VIEWS)."""
+    catalog = await aget_skill_catalog()
+    return _skills_out(
+        request, response, catalog, category=category, q=q, prefix=prefix
+    )
+
+
+@router.get("/skills", response=list[SkillOut], auth=read_auth())
+@async_variant(alist_skills)
+def list_skills(
+    request,
+    response: HttpResponse,
+    category: str | None = None,
+    q: str | None = None,
+    prefix: str | None = None,
+):
+    catalog = get_skill_catalog()
+    return _skills_out(
+        request, response, catalog, category=category, q=q, prefix=prefix
+    )
+
+
+@router.get("/typeahead", response=TypeaheadOut)
+def typeahead(request, q: str, limit: int = 8):
+    """Autocomplete por prefixo (membros e skills) servido de índices em memória."""
+    limit = max(1, min(limit, TYPEAHEAD_MAX_LIMIT))
+    prefix = q.strip()
+    if not prefix:
+        return {"members": [], "skills": []}
+
+    return {
+        "members": get_member_index().search(prefix, limit=limit),
+        "skills": get_skill_catalog().filter(prefix=prefix)[:limit],
+    }
 
-    p = getattr(u, "profile", None)
-    if not p:
-        raise HttpError(404, "PROFILE_NOT_FOUND")
 
+def _member_card(request, u) -> dict:
+    profile = getattr(u, "profile", None)
     return {
         "id": u.id,
         "email": u.email,
-        "display_name": p.display_name,
-        "avatar_url": _avatar_url(request, p),
-        "birth_date": p.birth_date,
-        "profession": p.profession,
-        "bio": p.bio,
-        "location": p.location,
-        "github_url": p.github_url,
-        "linkedin_url": p.linkedin_url,
+        "display_name": profile.display_name if profile else u.username,
+        "avatar_url": _avatar_url(request, profile),
         "roles": [ur.role.key for ur in u.user_roles.all()],
-        "skills": [
-            {
-                "skill": {
-                    "id": us.skill.id,
-                    "name": us.skill.name,
-                    "category": us.skill.category,
-                    "created_at": us.skill.created_at,
-                },
-                "level": us.level,
-                "years_exp": us.years_exp,
-                "can_mentor": us.can_mentor,
-            }
-            for us in u.skills.all()
-        ],
+        "skills": [us.skill.name for us in u.skills.all()],
     }
 
 
+def _skill_list(skills: str | None) -> list[str] | None:
+    return [s.strip() for s in skills.split(",") if s.strip()] if skills else None
+
+
+async def amembers(
+    request,
+    q: str | None = None,
+    role: str | None = None,
+    skills: str | None = None,
+):
+    """Variante async de `members` (API_ASYNC_VIEWS)."""
+    users = list_members(q=q, role=role, skills=_skill_list(skills))
+    return [_member_card(request, u) async for u in users]
+
+
+@router.get("/members", response=list[MemberCardOut], auth=read_auth())
+@trusted_output(list[MemberCardOut])
+@replica_reads
+@async_variant(amembers)
+def members(
+    request,
+    q: str | None = None,
+    role: str | None = None,
+    skills: str | None = None,
+):
+    users = list_members(q=q, role=role, skills=_skill_list(skills))
+    return [_member_card(request, u) for u in users]
+
+
+@router.get("/members/{user_id}", response=MemberDetailOut)
+def member_detail(request, response: HttpResponse, user_id: int):
+    try:
+        detail = get_member_detail(user_id=user_id)
+    except ValueError as exc:
+        raise HttpError(404, str(exc)) from None
+
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=f"member-{user_id}-{detail.etag}",
+        last_modified=detail.updated_at,
+    )
+    if not_modified is not None:
+        return not_modified
+
+    data = dict(detail.data)
+    if data["avatar_url"]:
+        data["avatar_url"] = request.build_absolute_uri(data["avatar_url"])
+    return data
+
+
 @router.patch("/members/{user_id}/profile")
 def patch_profile(request, user_id: int, payload: ProfilePatchIn):
     if not request.user.is_authenticated:
@@ -132,6 +189,7 @@ def patch_profile(request, user_id: int, payload: ProfilePatchIn):
     if changed:
         changed.append("updated_at")
         profile.save(update_fields=changed)
+        invalidate_member_cache(user_id)
 
     return {"ok": True}
 
@@ -152,6 +210,7 @@ def put_member_skills(request, user_id: int, payload: list[UserSkillIn]):
 
 
 @router.post("/members/{user_id}/avatar")
+@decorate_view(with_avatar_upload_handler)
 def upload_avatar(request, user_id: int, file: UploadedFile = File(...)):  # noqa: B008
     if not request.user.is_authenticated:
         raise HttpError(401, "AUTH_REQUIRED")
@@ -162,13 +221,14 @@ def upload_avatar(request, user_id: int, file: UploadedFile = File(...)):  # noq
     if not profile:
         raise HttpError(404, "PROFILE_NOT_FOUND")
 
-    # validação básica
-    if not file.content_type or not file.content_type.startswith("image/"):
+    # tamanho e magic bytes já foram validados em streaming pelo AvatarUploadHandler
+    if file.content_type not in AVATAR_EXTENSIONS:
         raise HttpError(400, "INVALID_IMAGE")
 
-    if file.size and file.size > 5 * 1024 * 1024:
+    if file.size and file.size > MAX_AVATAR_BYTES:
         raise HttpError(400, "IMAGE_TOO_LARGE")
 
     profile.avatar.save(file.name, file, save=True)
+    invalidate_member_cache(user_id)
 
     return {"ok": True, "avatar_url": _avatar_url(request, profile)}
@@ -24,8 +24,14 @@ def user_has_any_role(user: User, keys: set[str]) -> bool:
     return UserRole.objects.filter(user=user, role__key__in=list(keys)).exists()
 
 
-def can_view_document(user: User, doc: Document) -> bool:
-    """Regra de visibilidade do documento."""
+async def auser_has_any_role(user: User, keys: set[str]) -> bool:
+    if not user.is_authenticated:
+        return False
+    return await UserRole.objects.filter(user=user, role__key__in=list(keys)).aexists()
+
+
+def _visibility_without_roles(user: User, doc: Document) -> bool | None:
+    """Decide sem consultar papéis; None quando depende de ser mentor."""
     if not user.is_authenticated:
         return False
     if user.is_staff:
@@ -33,11 +39,26 @@ def can_view_document(user: User, doc: Document) -> bool:
     if doc.visibility == DocumentVisibility.COMMUNITY:
         return True
     if doc.visibility == DocumentVisibility.MENTORS_ONLY:
-        return user_has_any_role(user, MENTOR_KEYS)
+        return None
     # private
     return doc.created_by_id == user.id
 
 
+def can_view_document(user: User, doc: Document) -> bool:
+    """Regra de visibilidade do documento."""
+    allowed = _visibility_without_roles(user, doc)
+    if allowed is None:
+        return user_has_any_role(user, MENTOR_KEYS)
+    return allowed
+
+
+async def acan_view_document(user: User, doc: Document) -> bool:
+    allowed = _visibility_without_roles(user, doc)
+    if allowed is None:
+        return await auser_has_any_role(user, MENTOR_KEYS)
+    return allowed
+
+
 def _unique_slug(base: str) -> str:
     """Garante slug único (base, base-2, base-3...)."""
     slug = base
@@ -117,13 +138,7 @@ def add_version(
     )
 
 
-def list_documents(
-    *, user: User, q: str | None, tag: str | None, project_id: int | None
-):
-    """
-    Lista documentos aplicando filtros e respeitando visibilidade.
-    (MVP: filtro por visibilidade no Python/Query simples; depois refinamos).
-    """
+def _documents_queryset(*, q: str | None, tag: str | None, project_id: int | None):
     qs = (
         Document.objects.select_related("created_by", "project")
         .prefetch_related("tags")
@@ -136,7 +151,43 @@ def list_documents(
         qs = qs.filter(project_id=project_id)
     if tag:
         qs = qs.filter(tags__name__iexact=tag)
+    return qs
+
+
+def _visible_to(user: User, *, is_mentor: bool) -> Q:
+    visible = Q(visibility=DocumentVisibility.COMMUNITY) | Q(
+        visibility=DocumentVisibility.PRIVATE, created_by_id=user.id
+    )
+    if is_mentor:
+        visible |= Q(visibility=DocumentVisibility.MENTORS_ONLY)
+    return visible
+
+
+def list_documents(
+    *, user: User, q: str | None, tag: str | None, project_id: int | None
+):
+    """
+    Lista documentos aplicando filtros e respeitando visibilidade.
+    A visibilidade vira filtro SQL (mesma regra de `can_view_document`): o
+    papel do usuário é consultado uma vez, e não uma vez por documento.
+    """
+    if not user.is_authenticated:
+        return []
+    qs = _documents_queryset(q=q, tag=tag, project_id=project_id)
+    if not user.is_staff:
+        is_mentor = user_has_any_role(user, MENTOR_KEYS)
+        qs = qs.filter(_visible_to(user, is_mentor=is_mentor))
+    return list(qs)
 
-    # aplica visibilidade
-    docs = [d for d in qs if can_view_document(user, d)]
-    return docs
+
+async def alist_documents(
+    *, user: User, q: str | None, tag: str | None, project_id: int | None
+):
+    """Versão async de `list_documents` (mesmas queries)."""
+    if not user.is_authenticated:
+        return []
+    qs = _documents_queryset(q=q, tag=tag, project_id=project_id)
+    if not user.is_staff:
+        is_mentor = await auser_has_any_role(user, MENTOR_KEYS)
+        qs = qs.filter(_visible_to(user, is_mentor=is_mentor))
+    return [doc async for doc in qs]
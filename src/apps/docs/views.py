@@ -1,6 +1,11 @@
 from ninja import Router
 from ninja.errors import HttpError
 
+from apps.accounts.auth import read_auth
+from orgst.common.async_views import async_variant
+from orgst.common.db_router import replica_reads
+from orgst.common.serialization import trusted_output
+
 from .models import Document, DocumentVersion
 from .schemas import (
     DocumentCreateIn,
@@ -8,7 +13,14 @@ from .schemas import (
     DocumentVersionCreateIn,
     DocumentVersionOut,
 )
-from .services import add_version, can_view_document, create_document, list_documents
+from .services import (
+    acan_view_document,
+    add_version,
+    alist_documents,
+    can_view_document,
+    create_document,
+    list_documents,
+)
 
 router = Router(tags=["docs"])
 
@@ -28,7 +40,23 @@ def _doc_out(doc: Document) -> dict:
     }
 
 
-@router.get("/docs", response=list[DocumentOut])
+async def aapi_list_docs(
+    request,
+    q: str | None = None,
+    tag: str | None = None,
+    project_id: int | None = None,
+):
+    """Variante async de `api_list_docs` (API_ASYNC_VIEWS)."""
+    if not request.user.is_authenticated:
+        raise HttpError(401, "AUTH_REQUIRED")
+    docs = await alist_documents(user=request.user, q=q, tag=tag, project_id=project_id)
+    return [_doc_out(d) for d in docs]
+
+
+@router.get("/docs", response=list[DocumentOut], auth=read_auth())
+@trusted_output(list[DocumentOut])
+@replica_reads
+@async_variant(aapi_list_docs)
 def api_list_docs(
     request,
     q: str | None = None,
@@ -59,7 +87,22 @@ def api_create_doc(request, payload: DocumentCreateIn):
     return _doc_out(doc)
 
 
-@router.get("/docs/{doc_id}", response=DocumentOut)
+async def aapi_get_doc(request, doc_id: int):
+    """Variante async de `api_get_doc` (API_ASYNC_VIEWS)."""
+    if not request.user.is_authenticated:
+        raise HttpError(401, "AUTH_REQUIRED")
+
+    doc = await Document.objects.prefetch_related("tags").filter(id=doc_id).afirst()
+    if not doc:
+        raise HttpError(404, "DOC_NOT_FOUND")
+    if not await acan_view_document(request.user, doc):
+        raise HttpError(403, "FORBIDDEN")
+
+    return _doc_out(doc)
+
+
+@router.get("/docs/{doc_id}", response=DocumentOut, auth=read_auth())
+@async_variant(aapi_get_doc)
 def api_get_doc(request, doc_id: int):
     if not request.user.is_authenticated:
         raise HttpError(401, "AUTH_REQUIRED")
@@ -11,6 +11,12 @@ DEFAULT_COLUMNS: list[tuple[str, int]] = [
     ("Done", 3),
 ]
 
+# Unique (column, position) / (board, position) constraints are checked per row
+# by SQLite and Postgres, so "position = position + 1" collides mid-statement.
+# Shifts first park the rows above this offset (positions are compact 1..N, far
+# below it) and then bring them down to their final slots.
+PARKING_OFFSET = 1_000_000
+
 
 @transaction.atomic
 def create_default_board(project) -> Board:
@@ -71,12 +77,16 @@ def reorder_columns(board: Board, ordered_ids: list[int]) -> None:
     id_to_pos = {col_id: i + 1 for i, col_id in enumerate(ordered_ids)}
 
     cols = list(qs)
-    for col in cols:
-        new_pos = id_to_pos[col.id]
-        if col.position != new_pos:
-            col.position = new_pos
+    changed = [col for col in cols if col.position != id_to_pos[col.id]]
+    if not changed:
+        return
 
-    Column.objects.bulk_update(cols, ["position"])
+    Column.objects.filter(id__in=[col.id for col in changed]).update(
+        position=F("position") + PARKING_OFFSET
+    )
+    for col in changed:
+        col.position = id_to_pos[col.id]
+    Column.objects.bulk_update(changed, ["position"])
 
 
 @transaction.atomic
@@ -130,17 +140,26 @@ def move_task(task_id: int, to_column_id: int, to_position: int) -> None:
     if from_column_id == to_column_id and to_position == from_position:
         return
 
+    # Park the task so its slot is free while the source column shifts
+    Task.objects.filter(id=task.id).update(position=0)
+
     # Close gap in the source column
-    Task.objects.filter(column_id=from_column_id, position__gt=from_position).update(
-        position=F("position") - 1
-    )
+    _shift(from_column_id, from_position + 1, -1)
 
     # Open slot in the destination column
-    Task.objects.filter(column_id=to_column_id, position__gte=to_position).update(
-        position=F("position") + 1
-    )
+    _shift(to_column_id, to_position, 1)
 
     # Move task
     task.column_id = to_column_id
     task.position = to_position
     task.save(update_fields=["column", "position", "updated_at"])
+
+
+def _shift(column_id: int, from_position: int, delta: int) -> None:
+    """Shift tasks at `from_position` and after by `delta` (see PARKING_OFFSET)."""
+    Task.objects.filter(column_id=column_id, position__gte=from_position).update(
+        position=F("position") + PARKING_OFFSET
+    )
+    Task.objects.filter(column_id=column_id, position__gte=PARKING_OFFSET).update(
+        position=F("position") - PARKING_OFFSET + delta
+    )
@@ -1,16 +1,55 @@
+import secrets
+
+from django.conf import settings
+from django.http import HttpResponse
 from ninja import NinjaAPI
 
 from apps.accounts.auth import JWTAuth
+from apps.accounts.ratelimit import RateLimited
 from apps.accounts.views import router as accounts_router
 from apps.community.views import router as community_router
 from apps.docs.views import router as docs_router
+from orgst.common.health import database_health, is_saturated
+from orgst.common.metrics import TimedJSONRenderer, mark_view_done, registry
+
+api = NinjaAPI(
+    title="Orgst API",
+    version="1.0",
+    auth=JWTAuth(),
+    renderer=TimedJSONRenderer(),
+)
+api.add_decorator(mark_view_done)
+
 
-api = NinjaAPI(title="Orgst API", version="1.0", auth=JWTAuth())
+@api.exception_handler(RateLimited)
+def rate_limited(request, exc: RateLimited):
+    response = api.create_response(request, {"detail": exc.message}, status=429)
+    response["Retry-After"] = str(exc.retry_after)
+    return response
 
 
 @api.get("/health", auth=None)
 def health(request):
-    return {"status": "ok"}
+    database = database_health()
+    # pool cheio ainda atende (com espera): "degraded", sem 503
+    status = "degraded" if is_saturated(database) else "ok"
+    return {"status": status, "database": database}
+
+
+@api.get("/metrics", auth=None, include_in_schema=False)
+def metrics(request):
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        # fora de DEBUG só com METRICS_TOKEN: expõe tráfego por rota, outbox e
+        # contadores de hash de senha (e cada scrape consulta o banco)
+        return HttpResponse(status=404)
+    if token:
+        sent = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not secrets.compare_digest(sent, token):
+            return HttpResponse(status=401)
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 api.add_router("/accounts", accounts_router)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from functools import wraps
+
+from django.conf import settings
+
+
+def async_views_enabled() -> bool:
+    return getattr(settings, "API_ASYNC_VIEWS", False)
+
+
+def async_variant(async_view):
+    """
+    Decorator de view do Ninja (logo acima da função): com API_ASYNC_VIEWS
+    registra `async_view` (mesma assinatura, ORM async) no lugar da view
+    síncrona. A escolha acontece no import das views; o nome e a docstring
+    continuam os da view síncrona (operationId e OpenAPI iguais).
+    """
+
+    def decorator(view_func):
+        if not async_views_enabled():
+            return view_func
+
+        @wraps(view_func)
+        async def wrapper(*args, **kwargs):
+            return await async_view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
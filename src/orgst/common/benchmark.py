@@ -0,0 +1,246 @@
+"""
+Executor de carga simples para os benchmarks (`manage.py benchmark_api`).
+
+Cada cenário é uma função chamada N vezes por `concurrency` threads, cada uma
+com sua conexão de banco. Mede latência por chamada (p50/p95/p99) e vazão no
+tempo de parede; os resultados vão para JSON para comparar entre commits.
+
+Com `HttpClient` as chamadas vão por HTTP para um servidor já rodando (ex.:
+uvicorn com `orgst.asgi`), em vez do `django.test.Client` em processo.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import math
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import django
+from django.db import connection, connections
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    concurrency: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+    throughput_rps: float
+    error_kinds: dict[str, int] = field(default_factory=dict)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Percentil por posto mais próximo (lista já ordenada)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(
+    name: str,
+    timings: list[float],
+    *,
+    errors: Counter,
+    concurrency: int,
+    wall_seconds: float,
+) -> ScenarioResult:
+    ms = sorted(t * 1000 for t in timings)
+    return ScenarioResult(
+        name=name,
+        requests=len(ms),
+        concurrency=concurrency,
+        errors=errors.total(),
+        p50_ms=round(percentile(ms, 50), 3),
+        p95_ms=round(percentile(ms, 95), 3),
+        p99_ms=round(percentile(ms, 99), 3),
+        mean_ms=round(statistics.fmean(ms), 3) if ms else 0.0,
+        max_ms=round(ms[-1], 3) if ms else 0.0,
+        throughput_rps=round(len(ms) / wall_seconds, 2) if wall_seconds else 0.0,
+        error_kinds=dict(errors.most_common()),
+    )
+
+
+def run_scenario(
+    name: str,
+    call: Callable[[int], bool],
+    *,
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+) -> ScenarioResult:
+    """
+    `call(i)` executa a i-ésima chamada e retorna False (ou levanta) em erro.
+    Com `concurrency=1` roda na thread atual (mesma conexão/transação).
+    """
+    for i in range(warmup):
+        try:
+            call(-1 - i)
+        except Exception:
+            pass  # erros contam só na medição
+
+    timings: list[float] = []
+    errors: Counter[str] = Counter()
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker() -> None:
+        try:
+            while True:
+                with lock:
+                    i = next(counter, None)
+                if i is None:
+                    return
+                start = time.perf_counter()
+                error = None
+                try:
+                    if not call(i):
+                        error = "unsuccessful response"
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {exc}"[:120]
+                elapsed = time.perf_counter() - start
+                with lock:
+                    timings.append(elapsed)
+                    if error:
+                        errors[error] += 1
+        finally:
+            if concurrency > 1:
+                connections.close_all()
+
+    start = time.perf_counter()
+    if concurrency <= 1:
+        worker()
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(worker)
+    wall = time.perf_counter() - start
+
+    return summarize(
+        name, timings, errors=errors, concurrency=concurrency, wall_seconds=wall
+    )
+
+
+@dataclass
+class HttpResult:
+    status_code: int
+    content: bytes
+
+
+class HttpClient:
+    """
+    Subconjunto de `django.test.Client` (get/post) sobre HTTP/1.1 keep-alive,
+    com uma conexão por thread.
+    """
+
+    def __init__(self, base_url: str):
+        url = urlsplit(base_url)
+        self.https = url.scheme == "https"
+        self.netloc = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = (
+                http.client.HTTPSConnection
+                if self.https
+                else http.client.HTTPConnection
+            )
+            conn = self._local.conn = cls(self.netloc, timeout=60)
+        return conn
+
+    def _request(self, method: str, path: str, body=None, headers=None) -> HttpResult:
+        conn = self._connection()
+        try:
+            conn.request(method, self.prefix + path, body, headers or {})
+            response = conn.getresponse()
+            return HttpResult(response.status, response.read())
+        except (http.client.HTTPException, OSError):
+            conn.close()  # reconecta na próxima chamada
+            self._local.conn = None
+            raise
+
+    def get(self, path: str, *, headers=None) -> HttpResult:
+        return self._request("GET", path, headers=headers)
+
+    def post(
+        self, path: str, data=None, content_type=MULTIPART_CONTENT, *, headers=None
+    ) -> HttpResult:
+        if content_type == MULTIPART_CONTENT:
+            body = encode_multipart(BOUNDARY, data or {})
+        else:
+            body = json.dumps(data or {}).encode()
+        return self._request(
+            "POST", path, body, {**(headers or {}), "Content-Type": content_type}
+        )
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def build_report(results: list[ScenarioResult], **meta) -> dict:
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "database": connection.vendor,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        **meta,
+        "results": [asdict(r) for r in results],
+    }
+
+
+def write_report(report: dict, path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    return path
+
+
+def compare_reports(baseline: dict, current: dict) -> list[dict]:
+    """Variação percentual de p50/p95/p99 e vazão por cenário em comum."""
+    before = {r["name"]: r for r in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        old = before.get(result["name"])
+        if old is None:
+            continue
+        row = {"name": result["name"]}
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            row[key] = (
+                round((result[key] - old[key]) / old[key] * 100, 1)
+                if old[key]
+                else None
+            )
+        rows.append(row)
+    return rows
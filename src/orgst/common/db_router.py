@@ -0,0 +1,215 @@
+"""
+Roteamento primário/réplica com read-your-writes.
+
+Escritas vão sempre para o primário. Leituras só vão para a réplica dentro de
+views marcadas com `replica_reads` e quando o cliente não escreveu há pouco:
+um request de escrita bem-sucedido deixa um cookie e uma chave por usuário no
+cache valendo `DATABASE_REPLICA_STICKY_SECONDS`; enquanto valem, as leituras
+desse cliente ficam no primário (o atraso da réplica não aparece para quem
+acabou de gravar).
+"""
+
+from __future__ import annotations
+
+import inspect
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = "replica"
+STICKY_COOKIE = "orgst_primary"
+
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "TRACE"})
+
+
+@dataclass
+class _RoutingState:
+    sticky: bool = False
+    wrote: bool = False
+    replica_reads: bool = False
+
+
+_state: ContextVar[_RoutingState | None] = ContextVar("db_routing", default=None)
+
+
+def replica_configured() -> bool:
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def _sticky_seconds() -> int:
+    return getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 5)
+
+
+def sticky_cache_key(user_id: int) -> str:
+    return f"db:primary:{user_id}"
+
+
+def _cookie_is_fresh(request) -> bool:
+    try:
+        return float(request.COOKIES.get(STICKY_COOKIE, "")) > time.time()
+    except ValueError:
+        return False
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_reads or state.sticky or state.wrote:
+            return None
+        # dentro de transação a leitura precisa ver o que ela mesma gravou
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # a réplica é cópia do primário: objetos dos dois se relacionam
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # a réplica recebe o schema pela replicação
+        return db != REPLICA_DB_ALIAS
+
+
+def _authenticated_user(request):
+    # o usuário do JWT (request.auth); request.user pode ser o lazy da sessão,
+    # que consultaria o banco (e não pode ser lido em contexto async)
+    user = getattr(request, "auth", None)
+    return user if getattr(user, "is_authenticated", False) else None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Abre o estado de roteamento do request e, depois de uma escrita, marca o
+    cliente para ler do primário por alguns segundos. Sem réplica configurada
+    não faz nada.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_configured():
+            return self.get_response(request)
+
+        state = _RoutingState(sticky=_cookie_is_fresh(request))
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        user = self._mark_sticky(request, response, state)
+        if user is not None:
+            cache.set(sticky_cache_key(user.pk), 1, timeout=_sticky_seconds())
+        return response
+
+    async def __acall__(self, request):
+        if not replica_configured():
+            return await self.get_response(request)
+
+        state = _RoutingState(sticky=_cookie_is_fresh(request))
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        user = self._mark_sticky(request, response, state)
+        if user is not None:
+            await cache.aset(sticky_cache_key(user.pk), 1, timeout=_sticky_seconds())
+        return response
+
+    def _mark_sticky(self, request, response, state: _RoutingState):
+        """
+        Depois de uma escrita bem-sucedida grava o cookie e devolve o usuário
+        a marcar no cache (clientes de API nem sempre guardam cookies).
+        """
+        wrote = state.wrote or request.method not in _SAFE_METHODS
+        if not wrote or response.status_code >= 400:
+            return None
+        seconds = _sticky_seconds()
+        response.set_cookie(
+            STICKY_COOKIE,
+            str(time.time() + seconds),
+            max_age=seconds,
+            httponly=True,
+            samesite="Lax",
+        )
+        return _authenticated_user(request)
+
+
+def _enter_replica_reads(request) -> None:
+    state = _state.get()
+    if state is None:
+        return
+    user = _authenticated_user(request)
+    if not state.sticky and user is not None:
+        state.sticky = cache.get(sticky_cache_key(user.pk)) is not None
+    state.replica_reads = True
+
+
+async def _aenter_replica_reads(request) -> None:
+    state = _state.get()
+    if state is None:
+        return
+    user = _authenticated_user(request)
+    if not state.sticky and user is not None:
+        state.sticky = await cache.aget(sticky_cache_key(user.pk)) is not None
+    state.replica_reads = True
+
+
+def _leave_replica_reads() -> None:
+    state = _state.get()
+    if state is not None:
+        state.replica_reads = False
+
+
+def replica_reads(view_func):
+    """
+    Decorator de view do Ninja (abaixo de `@router.get`, roda depois da
+    autenticação): as leituras da view podem ir para a réplica. O corpo da
+    resposta precisa ser montado dentro da view (querysets avaliados).
+    """
+    if inspect.iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            await _aenter_replica_reads(request)
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                _leave_replica_reads()
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        _enter_replica_reads(request)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _leave_replica_reads()
+
+    return wrapper
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import connections
+
+
+def database_health(alias: str = "default") -> dict:
+    """
+    Estado do banco para o `/health`: vendor e, com pool do psycopg
+    (`DB_POOL`), o uso do pool deste processo. Não abre conexão nova.
+    """
+    connection = connections[alias]
+    info: dict = {"vendor": connection.vendor, "pool": None}
+
+    # só existe no backend postgresql com OPTIONS["pool"]
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return info
+
+    stats = pool.get_stats()
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    in_use = size - available
+    info["pool"] = {
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "size": size,
+        "available": available,
+        "in_use": in_use,
+        "waiting": stats.get("requests_waiting", 0),
+        "timeouts": stats.get("requests_errors", 0),
+        "saturation": round(in_use / pool.max_size, 3) if pool.max_size else 0.0,
+    }
+    return info
+
+
+def is_saturated(info: dict) -> bool:
+    pool = info.get("pool")
+    if not pool:
+        return False
+    return (
+        pool["waiting"] > 0 or pool["saturation"] >= settings.DB_POOL_SATURATION_WARNING
+    )
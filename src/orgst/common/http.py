@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # opcional: sem ele só gzip
+    brotli = None
+
+# qualidade 5: bom ganho sobre o gzip sem o custo dos níveis altos (feitos
+# para conteúdo estático)
+BROTLI_QUALITY = 5
+
+
+def conditional_response(
+    request: HttpRequest,
+    response: HttpResponse,
+    *,
+    etag: str | None = None,
+    last_modified: datetime | None = None,
+) -> HttpResponse | None:
+    """
+    Aplica validadores (ETag/Last-Modified) na resposta temporária do Ninja.
+
+    Retorna a resposta 304/412 quando o cliente já tem a versão atual;
+    caso contrário retorna None e o endpoint segue montando o corpo.
+
+    Um ETag barato vindo daqui (versão, timestamp) também poupa o
+    `ApiResponseMiddleware` de gerar um a partir do hash do corpo.
+    """
+    if etag is not None:
+        response["ETag"] = quote_etag(etag)
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+
+    conditional = get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=last_modified and int(last_modified.timestamp()),
+    )
+    if conditional is None:
+        return None
+
+    for header in ("ETag", "Last-Modified"):
+        if header in response:
+            conditional[header] = response[header]
+    return conditional
+
+
+def weak_etag(content: bytes) -> str:
+    # fraco: o mesmo validador vale para o corpo com e sem compressão
+    return f'W/"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+
+
+def _quality(params: list[str]) -> float:
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepted_codings(header: str) -> set[str]:
+    """Codificações de um Accept-Encoding, sem as recusadas com q=0."""
+    codings = set()
+    for item in header.lower().split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip()
+        if coding and _quality(params) > 0:
+            codings.add(coding)
+    return codings
+
+
+def preferred_coding(accept_encoding: str) -> str | None:
+    """
+    Melhor codificação aceita pelo cliente: br (se o módulo `brotli` estiver
+    instalado), senão gzip; None quando nenhuma serve.
+    """
+    codings = accepted_codings(accept_encoding)
+    if brotli is not None and ("br" in codings or "*" in codings):
+        return "br"
+    if "gzip" in codings or "*" in codings:
+        return "gzip"
+    return None
+
+
+def compress(content: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return compress_string(content)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+
+from ninja.renderers import JSONRenderer
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    """Custos de um request, preenchidos pelo wrapper de SQL e pelo renderer."""
+
+    queries: int = 0
+    sql_seconds: float = 0.0
+    sql_counts: Counter = field(default_factory=Counter)
+    view_done: float | None = None
+    serialization_seconds: float = 0.0
+
+    def duplicates(self) -> dict[str, int]:
+        """SQL repetido (mesmo template, parâmetros diferentes): suspeita de N+1."""
+        return {sql: n for sql, n in self.sql_counts.items() if n > 1}
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    return _current.get()
+
+
+def start_request() -> tuple[RequestStats, object]:
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def query_wrapper(execute, sql, params, many, context):
+    """`connection.execute_wrapper`: conta e cronometra cada SQL do request."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.sql_seconds += time.perf_counter() - start
+        stats.queries += 1
+        stats.sql_counts[sql] += 1
+
+
+def mark_view_done(view_func):
+    """
+    Decorator de operação do Ninja (`api.add_decorator`): marca quando a view
+    retornou; daí até o fim do render é tempo de validação + serialização.
+    """
+    if inspect.iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def async_wrapper(*args, **kwargs):
+            result = await view_func(*args, **kwargs)
+            _mark()
+            return result
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        result = view_func(*args, **kwargs)
+        _mark()
+        return result
+
+    return wrapper
+
+
+def _mark() -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.view_done = time.perf_counter()
+
+
+class TimedJSONRenderer(JSONRenderer):
+    def render(self, request, data, *, response_status):
+        content = super().render(request, data, response_status=response_status)
+        stats = _current.get()
+        if stats is not None and stats.view_done is not None:
+            stats.serialization_seconds = time.perf_counter() - stats.view_done
+        return content
+
+
+@dataclass
+class _RouteMetrics:
+    requests: Counter = field(default_factory=Counter)  # por status
+    duration_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(DURATION_BUCKETS) + 1)
+    )
+    duration_sum: float = 0.0
+    queries: int = 0
+    sql_seconds: float = 0.0
+    duplicate_queries: int = 0
+    n_plus_one: int = 0
+    serialization_seconds: float = 0.0
+    response_bytes: int = 0
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    Agregados em memória do processo (cada worker expõe os seus, como no
+    modo padrão do prometheus_client). Custo por request: um lock e somas.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], _RouteMetrics] = {}
+        self._collectors: list[Callable[[], Iterable[str]]] = []
+
+    def observe(
+        self,
+        *,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        stats: RequestStats,
+        duplicate_queries: int,
+        n_plus_one: bool,
+        response_bytes: int,
+    ) -> None:
+        with self._lock:
+            m = self._routes.get((method, route))
+            if m is None:
+                m = self._routes[(method, route)] = _RouteMetrics()
+            m.requests[status] += 1
+            m.duration_buckets[bisect_left(DURATION_BUCKETS, duration)] += 1
+            m.duration_sum += duration
+            m.queries += stats.queries
+            m.sql_seconds += stats.sql_seconds
+            m.duplicate_queries += duplicate_queries
+            m.n_plus_one += int(n_plus_one)
+            m.serialization_seconds += stats.serialization_seconds
+            m.response_bytes += response_bytes
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        """Coletores extras (linhas já no formato texto do Prometheus)."""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            routes = {
+                key: _RouteMetrics(
+                    requests=Counter(m.requests),
+                    duration_buckets=list(m.duration_buckets),
+                    duration_sum=m.duration_sum,
+                    queries=m.queries,
+                    sql_seconds=m.sql_seconds,
+                    duplicate_queries=m.duplicate_queries,
+                    n_plus_one=m.n_plus_one,
+                    serialization_seconds=m.serialization_seconds,
+                    response_bytes=m.response_bytes,
+                )
+                for key, m in self._routes.items()
+            }
+
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels(method: str, route: str, **extra) -> str:
+            pairs = {"method": method, "route": route, **extra}
+            return ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs.items())
+
+        family("orgst_http_requests_total", "counter", "API requests.")
+        for (method, route), m in sorted(routes.items()):
+            for status, n in sorted(m.requests.items()):
+                status_labels = labels(method, route, status=status)
+                lines.append(f"orgst_http_requests_total{{{status_labels}}} {n}")
+
+        family(
+            "orgst_http_request_duration_seconds", "histogram", "API request latency."
+        )
+        for (method, route), m in sorted(routes.items()):
+            cumulative = 0
+            for bound, n in zip(
+                (*DURATION_BUCKETS, "+Inf"), m.duration_buckets, strict=True
+            ):
+                cumulative += n
+                le = labels(method, route, le=bound)
+                lines.append(
+                    f"orgst_http_request_duration_seconds_bucket{{{le}}} {cumulative}"
+                )
+            base = labels(method, route)
+            name = "orgst_http_request_duration_seconds"
+            lines.append(f"{name}_sum{{{base}}} {m.duration_sum:.6f}")
+            lines.append(f"{name}_count{{{base}}} {cumulative}")
+
+        for name, attr, help_text in (
+            ("orgst_db_queries_total", "queries", "SQL queries executed."),
+            ("orgst_db_query_seconds_total", "sql_seconds", "Time spent in SQL."),
+            (
+                "orgst_db_duplicate_queries_total",
+                "duplicate_queries",
+                "Repeated SQL templates within a request.",
+            ),
+            (
+                "orgst_n_plus_one_requests_total",
+                "n_plus_one",
+                "Requests flagged as N+1.",
+            ),
+            (
+                "orgst_serialization_seconds_total",
+                "serialization_seconds",
+                "Response validation and rendering time.",
+            ),
+            ("orgst_response_bytes_total", "response_bytes", "Response body bytes."),
+        ):
+            family(name, "counter", help_text)
+            for (method, route), m in sorted(routes.items()):
+                value = getattr(m, attr)
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f"{name}{{{labels(method, route)}}} {value}")
+
+        for collector in self._collectors:
+            lines.extend(collector())
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
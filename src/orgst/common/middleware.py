@@ -1,25 +1,56 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
+from django.db import connections
 from django.http import HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+from .http import compress, preferred_coding, weak_etag
+from .metrics import end_request, query_wrapper, registry, start_request
+
+metrics_logger = logging.getLogger("orgst.metrics")
 
 
 class ForcePasswordChangeMiddleware:
+    async_capable = True
+    sync_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        user = getattr(request, "user", None)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
 
-        if not user or not user.is_authenticated:
+        # Só força dentro do admin (e só lá consulta o usuário da sessão).
+        if not request.path.startswith("/admin/"):
             return self.get_response(request)
 
-        if not getattr(user, "must_change_password", False):
-            return self.get_response(request)
+        redirect_to = self._redirect_for(request, getattr(request, "user", None))
+        return redirect_to or self.get_response(request)
 
-        # Só força dentro do admin.
+    async def __acall__(self, request):
         if not request.path.startswith("/admin/"):
-            return self.get_response(request)
+            return await self.get_response(request)
+
+        user = await request.auser() if hasattr(request, "auser") else None
+        redirect_to = self._redirect_for(request, user)
+        return redirect_to or await self.get_response(request)
+
+    def _redirect_for(self, request, user):
+        if not user or not user.is_authenticated:
+            return None
+
+        if not getattr(user, "must_change_password", False):
+            return None
 
         force_url = reverse("admin_force_password_change")
         allowed = {
@@ -31,22 +62,39 @@ class ForcePasswordChangeMiddleware:
         if request.path not in allowed:
             return redirect(force_url)
 
-        return self.get_response(request)
+        return None
 
 
 class DevCORSMiddleware:
     """Simple CORS middleware for local development."""
 
+    async_capable = True
+    sync_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
         self.allowed_origins = set(getattr(settings, "CORS_ALLOWED_ORIGINS", []))
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
         if request.method == "OPTIONS":
             response = HttpResponse(status=204)
         else:
             response = self.get_response(request)
+        return self._add_headers(request, response)
 
+    async def __acall__(self, request):
+        if request.method == "OPTIONS":
+            response = HttpResponse(status=204)
+        else:
+            response = await self.get_response(request)
+        return self._add_headers(request, response)
+
+    def _add_headers(self, request, response):
         origin = request.headers.get("Origin")
         if origin and origin in self.allowed_origins:
             response["Access-Control-Allow-Origin"] = origin
@@ -55,6 +103,170 @@ class DevCORSMiddleware:
             response["Access-Control-Allow-Methods"] = (
                 "GET, POST, PUT, PATCH, DELETE, OPTIONS"
             )
-            response["Vary"] = "Origin"
+            # sem sobrescrever o Vary de outras camadas (Accept-Encoding etc.)
+            patch_vary_headers(response, ("Origin",))
 
         return response
+
+
+class ApiResponseMiddleware:
+    """
+    Camada de resposta da API: ETag fraco + If-None-Match nos GETs e
+    compressão (br/gzip) de corpos a partir de `API_COMPRESS_MIN_BYTES`.
+
+    Endpoints com validador barato (`conditional_response`) já saem com ETag
+    e o corpo não é hasheado; os demais ganham um ETag do hash do corpo, que
+    poupa a transferência (não a montagem) quando o cliente já o tem.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = getattr(settings, "API_PATH_PREFIX", "/api/")
+        self.min_bytes = getattr(settings, "API_COMPRESS_MIN_BYTES", 1024)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.get_response(request)
+        return self._process(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self._process(request, response)
+
+    def _process(self, request, response):
+        if not request.path.startswith(self.prefix) or response.streaming:
+            return response
+
+        cacheable = request.method in ("GET", "HEAD") and response.status_code == 200
+        if cacheable and not response.has_header("ETag"):
+            response["ETag"] = weak_etag(response.content)
+
+        coding = None
+        if len(response.content) >= self.min_bytes and not response.has_header(
+            "Content-Encoding"
+        ):
+            patch_vary_headers(response, ("Accept-Encoding",))
+            coding = preferred_coding(request.headers.get("Accept-Encoding", ""))
+
+        etag = response.get("ETag")
+        if coding and etag and etag.startswith('"'):
+            # o corpo muda com a compressão: um ETag forte teria de mudar junto
+            response["ETag"] = etag = f"W/{etag}"
+
+        if cacheable:
+            conditional = get_conditional_response(
+                request, etag=etag, response=response
+            )
+            if conditional is not response:
+                return conditional
+
+        if coding:
+            compressed = compress(response.content, coding)
+            if len(compressed) < len(response.content):
+                response.content = compressed
+                response["Content-Length"] = str(len(compressed))
+                response["Content-Encoding"] = coding
+        return response
+
+
+class RequestMetricsMiddleware:
+    """
+    Métricas por request da API: rota (template), nº e tempo de SQL, SQL
+    repetido (N+1), tempo de serialização e tamanho da resposta.
+
+    Usa `connection.execute_wrapper` (não depende de DEBUG) e agrega em
+    memória; o custo fica em um perf_counter e um contador por query.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = getattr(settings, "METRICS_PATH_PREFIX", "/api/")
+        self.n_plus_one_threshold = getattr(settings, "METRICS_N_PLUS_ONE_THRESHOLD", 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not request.path.startswith(self.prefix):
+            return self.get_response(request)
+
+        stats, token = start_request()
+        start = time.perf_counter()
+        try:
+            with self._wrap_connections():
+                response = self.get_response(request)
+        finally:
+            end_request(token)
+        self._observe(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        if not request.path.startswith(self.prefix):
+            return await self.get_response(request)
+
+        stats, token = start_request()
+        start = time.perf_counter()
+        # conexões são por thread e o ORM async roda na thread "sensível" do
+        # request (sync_to_async): o wrapper é instalado nas conexões de lá
+        stack = await sync_to_async(self._wrap_connections)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stack.close()
+            end_request(token)
+        self._observe(request, response, stats, time.perf_counter() - start)
+        return response
+
+    def _wrap_connections(self) -> ExitStack:
+        stack = ExitStack()
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(query_wrapper))
+        return stack
+
+    def _observe(self, request, response, stats, duration: float) -> None:
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match else "unmatched"
+        duplicates = stats.duplicates()
+        worst = max(duplicates.items(), key=lambda kv: kv[1], default=(None, 0))
+        n_plus_one = worst[1] >= self.n_plus_one_threshold
+        size = 0 if response.streaming else len(response.content)
+
+        registry.observe(
+            method=request.method,
+            route=route,
+            status=response.status_code,
+            duration=duration,
+            stats=stats,
+            duplicate_queries=sum(n - 1 for n in duplicates.values()),
+            n_plus_one=n_plus_one,
+            response_bytes=size,
+        )
+
+        record = {
+            "method": request.method,
+            "route": route,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "queries": stats.queries,
+            "sql_ms": round(stats.sql_seconds * 1000, 2),
+            "duplicate_queries": sum(n - 1 for n in duplicates.values()),
+            "serialization_ms": round(stats.serialization_seconds * 1000, 2),
+            "response_bytes": size,
+        }
+        if n_plus_one:
+            record["n_plus_one"] = {"sql": worst[0][:500], "count": worst[1]}
+            metrics_logger.warning(json.dumps(record))
+        else:
+            metrics_logger.info(json.dumps(record))
@@ -0,0 +1,118 @@
+"""
+Caminho rápido de serialização para respostas montadas pelo próprio código.
+
+O Ninja valida cada linha devolvida pela view contra o schema de resposta e
+depois faz `model_dump`; em listagens grandes isso domina a CPU. Views que já
+montam dicts no formato exato do schema podem usar `trusted_output`: o corpo
+vai direto para o encoder JSON (orjson quando instalado, ou `API_JSON_DUMPS`).
+A conferência contra o schema continua em DEBUG e nos testes
+(`API_VALIDATE_TRUSTED_OUTPUT`).
+"""
+
+from __future__ import annotations
+
+import inspect
+import json
+import time
+from collections.abc import Callable
+from functools import lru_cache, wraps
+from typing import Any
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.module_loading import import_string
+from ninja.renderers import JSONRenderer
+from ninja.responses import NinjaJSONEncoder
+from pydantic import TypeAdapter
+
+from .metrics import current_stats
+
+try:
+    import orjson
+except ImportError:  # opcional: sem ele fica o json da stdlib
+    orjson = None
+
+_encoder = NinjaJSONEncoder()
+
+
+class TrustedOutputMismatch(AssertionError):
+    """A view marcada com `trusted_output` devolveu algo fora do schema."""
+
+
+def stdlib_dumps(data: Any) -> bytes:
+    """Mesmos bytes do JSONRenderer do Ninja."""
+    return json.dumps(data, cls=NinjaJSONEncoder).encode()
+
+
+def orjson_dumps(data: Any) -> bytes:
+    # datetimes passam pelo encoder do Ninja: mesmo formato da resposta validada
+    return orjson.dumps(
+        data, default=_encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+
+@lru_cache
+def _dumps_for(path: str | None) -> Callable[[Any], bytes]:
+    if path:
+        return import_string(path)
+    return orjson_dumps if orjson is not None else stdlib_dumps
+
+
+def json_dumps(data: Any) -> bytes:
+    return _dumps_for(getattr(settings, "API_JSON_DUMPS", None))(data)
+
+
+def _check(adapter: TypeAdapter, result: Any) -> None:
+    try:
+        expected = adapter.dump_python(adapter.validate_python(result))
+    except ValueError as exc:
+        raise TrustedOutputMismatch(str(exc)) from exc
+    # campos extras ou valores que o pydantic converteria também divergem
+    if expected != result:
+        raise TrustedOutputMismatch(
+            "trusted output differs from its schema after validation"
+        )
+
+
+def _render(adapter: TypeAdapter, result: Any) -> HttpResponseBase:
+    if isinstance(result, HttpResponseBase):  # 304, erros etc.
+        return result
+    if getattr(settings, "API_VALIDATE_TRUSTED_OUTPUT", settings.DEBUG):
+        _check(adapter, result)
+
+    start = time.perf_counter()
+    content = json_dumps(result)
+    stats = current_stats()
+    if stats is not None:
+        stats.serialization_seconds += time.perf_counter() - start
+    return HttpResponse(
+        content,
+        content_type=f"{JSONRenderer.media_type}; charset={JSONRenderer.charset}",
+    )
+
+
+def trusted_output(schema):
+    """
+    Decorator de view do Ninja, abaixo de `@router.get(..., response=schema)`
+    (o schema continua valendo para o OpenAPI). A view devolve dicts já no
+    formato de `schema` e a resposta sai serializada, sem passar pelo pydantic.
+    """
+    adapter = TypeAdapter(schema)
+
+    def decorator(view_func):
+        if inspect.iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def async_wrapper(*args, **kwargs):
+                return _render(adapter, await view_func(*args, **kwargs))
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            return _render(adapter, view_func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -40,19 +40,23 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "orgst.common.middleware.RequestMetricsMiddleware",
+    "orgst.common.middleware.ApiResponseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "orgst.common.middleware.DevCORSMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "orgst.common.db_router.ReplicaRoutingMiddleware",
     "orgst.common.middleware.ForcePasswordChangeMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# EmailOrUsernameBackend herda de ModelBackend (permissões inclusas); listar
+# os dois faria um login inválido consultar e hashear duas vezes.
 AUTHENTICATION_BACKENDS = [
     "apps.accounts.backends.EmailOrUsernameBackend",
-    "django.contrib.auth.backends.ModelBackend",
 ]
 
 
@@ -79,21 +83,119 @@ ASGI_APPLICATION = "orgst.asgi.application"
 default_sqlite_url = f"sqlite:///{BASE_DIR.parent / 'db.sqlite3'}"
 DATABASE_URL = env("DATABASE_URL", default=default_sqlite_url)
 
-db_config = dj_database_url.parse(
-    DATABASE_URL,
-    conn_max_age=600,
-    ssl_require=False,
-)
 
-if db_config.get("ENGINE") == "django.db.backends.postgresql":
-    db_config.setdefault("OPTIONS", {})
+def _database(url: str) -> dict:
+    db_config = dj_database_url.parse(
+        url,
+        conn_max_age=env.int("DB_CONN_MAX_AGE", default=600),
+        conn_health_checks=True,
+        ssl_require=False,
+    )
+
+    if db_config.get("ENGINE") == "django.db.backends.postgresql":
+        db_config.setdefault("OPTIONS", {})
+
+        # Só força SSL se explicitamente configurado
+        if env.bool("DB_SSL_REQUIRE", default=False):
+            db_config["OPTIONS"]["sslmode"] = "require"
+
+        # Derruba queries presas no servidor (ms; 0 = sem limite)
+        statement_timeout = env.int("DB_STATEMENT_TIMEOUT_MS", default=0)
+        if statement_timeout:
+            db_config["OPTIONS"]["options"] = (
+                f"-c statement_timeout={statement_timeout}"
+            )
+
+        # Pool do psycopg 3 compartilhado pelas threads do processo (ASGI ou
+        # workers com threads). Teto de conexões no Postgres: processos x
+        # DB_POOL_MAX_SIZE. O pool substitui as conexões persistentes.
+        if env.bool("DB_POOL", default=False):
+            db_config["CONN_MAX_AGE"] = 0
+            db_config["OPTIONS"]["pool"] = {
+                "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+                "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+                # segundos esperando conexão livre antes de erro
+                "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),
+            }
+
+    elif db_config.get("ENGINE") == "django.db.backends.sqlite3":
+        # WAL: leituras não bloqueiam a escrita; IMMEDIATE pega o lock de escrita
+        # no BEGIN, então escritas concorrentes esperam (timeout) em vez de
+        # falhar com "database is locked" no meio da transação.
+        if env.bool("SQLITE_WAL", default=True):
+            db_config.setdefault("OPTIONS", {}).update(
+                {
+                    "init_command": (
+                        "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;"
+                    ),
+                    "transaction_mode": "IMMEDIATE",
+                    "timeout": 20,
+                }
+            )
+    return db_config
+
+
+# Pool de conexões saturado acima desta fração (status do /health)
+DB_POOL_SATURATION_WARNING = env.float("DB_POOL_SATURATION_WARNING", default=0.9)
+
+DATABASES = {"default": _database(DATABASE_URL)}
+
+# Réplica de leitura (opcional). Só as views marcadas com `replica_reads` leem
+# dela; escritas e o resto das leituras ficam no primário. Depois de uma
+# escrita o cliente lê do primário por DATABASE_REPLICA_STICKY_SECONDS
+# (cookie + chave por usuário no cache), para enxergar o que acabou de gravar.
+DATABASE_REPLICA_URL = env("DATABASE_REPLICA_URL", default=None)
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = _database(DATABASE_REPLICA_URL)
+DATABASE_REPLICA_STICKY_SECONDS = env.int("DATABASE_REPLICA_STICKY_SECONDS", default=5)
+DATABASE_ROUTERS = ["orgst.common.db_router.PrimaryReplicaRouter"]
+
+# Cache compartilhado entre workers (ex.: CACHE_URL=redis://localhost:6379/1).
+# Sem CACHE_URL, cada processo usa seu próprio locmem.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
 
-    # Só força SSL se explicitamente configurado
-    if env.bool("DB_SSL_REQUIRE", default=False):
-        db_config["OPTIONS"]["sslmode"] = "require"
+# JWT assimétrico (opcional): JWT_KEYS=kid=/caminho/chave.pem,... (Ed25519 ou
+# RSA). Assina com JWT_ACTIVE_KID; as demais só validam (rotação). Sem
+# JWT_KEYS, usa HS256 com JWT_SECRET/SECRET_KEY.
+JWT_KEYS = env.dict("JWT_KEYS", default={})
+JWT_ACTIVE_KID = env("JWT_ACTIVE_KID", default=None)
+# Transição HS256 -> JWT_KEYS: continua validando (sem assinar) os tokens HS256
+# já emitidos. Desligar quando passar JWT_REFRESH_DAYS desde a troca.
+JWT_ACCEPT_HMAC = env.bool("JWT_ACCEPT_HMAC", default=True)
+
+# Token bucket (capacidade, segundos para encher) dos endpoints que fazem
+# hash de senha: /auth/token, /register e /invitations/accept.
+AUTH_RATE_LIMITS = {
+    "ip": (env.int("AUTH_RATE_LIMIT_IP", default=30), 60),
+    "identifier": (env.int("AUTH_RATE_LIMIT_IDENTIFIER", default=5), 60),
+}
+# Só ligue atrás de um proxy que sobrescreve X-Forwarded-For.
+RATE_LIMIT_TRUST_X_FORWARDED_FOR = env.bool(
+    "RATE_LIMIT_TRUST_X_FORWARDED_FOR", default=False
+)
 
-DATABASES = {"default": db_config}
 
+# Hasher preferido (scrypt, pbkdf2 ou argon2) e parâmetros; calibre com
+# `manage.py benchmark_hashers`. Hashes antigos continuam válidos e são
+# refeitos com o preferido no próximo login.
+_PASSWORD_HASHERS = {
+    "scrypt": "apps.accounts.hashers.TunedScryptPasswordHasher",
+    "pbkdf2": "apps.accounts.hashers.TunedPBKDF2PasswordHasher",
+    "argon2": "apps.accounts.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHER = env("PASSWORD_HASHER", default="scrypt")
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS[PASSWORD_HASHER],
+    *(path for key, path in _PASSWORD_HASHERS.items() if key != PASSWORD_HASHER),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+PASSWORD_PBKDF2_ITERATIONS = env.int("PASSWORD_PBKDF2_ITERATIONS", default=1_500_000)
+PASSWORD_SCRYPT_WORK_FACTOR = env.int("PASSWORD_SCRYPT_WORK_FACTOR", default=2**15)
+PASSWORD_SCRYPT_BLOCK_SIZE = env.int("PASSWORD_SCRYPT_BLOCK_SIZE", default=8)
+PASSWORD_SCRYPT_PARALLELISM = env.int("PASSWORD_SCRYPT_PARALLELISM", default=1)
+PASSWORD_ARGON2_TIME_COST = env.int("PASSWORD_ARGON2_TIME_COST", default=2)
+PASSWORD_ARGON2_MEMORY_COST = env.int("PASSWORD_ARGON2_MEMORY_COST", default=65536)
+PASSWORD_ARGON2_PARALLELISM = env.int("PASSWORD_ARGON2_PARALLELISM", default=1)
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -146,3 +248,41 @@ EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=True)
 AUTH_USER_MODEL = "accounts.User"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR.parent / "media"
+
+# Métricas da API (/api/v1/metrics). Com METRICS_TOKEN, o scrape precisa de
+# "Authorization: Bearer <token>"; sem ele, o endpoint só abre em DEBUG.
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+METRICS_N_PLUS_ONE_THRESHOLD = env.int("METRICS_N_PLUS_ONE_THRESHOLD", default=5)
+
+# Views com `trusted_output` serializam direto (sem validar pelo pydantic);
+# a conferência contra o schema fica ligada em DEBUG e nos testes.
+# API_JSON_DUMPS: caminho de uma função dados -> bytes (padrão: orjson se
+# instalado, senão json da stdlib).
+API_VALIDATE_TRUSTED_OUTPUT = env.bool("API_VALIDATE_TRUSTED_OUTPUT", default=DEBUG)
+API_JSON_DUMPS = env("API_JSON_DUMPS", default=None)
+
+# Respostas da API a partir deste tamanho saem comprimidas (br/gzip) para
+# clientes que aceitam; abaixo disso a compressão custa mais do que poupa.
+API_COMPRESS_MIN_BYTES = env.int("API_COMPRESS_MIN_BYTES", default=1024)
+
+# Sob ASGI (uvicorn), registra as variantes async (ORM async + AsyncJWTAuth)
+# das leituras quentes: /me, /docs, /docs/{id}, /members e /skills. Lido no
+# import das views; desligado, todas as views são síncronas.
+API_ASYNC_VIEWS = env.bool("API_ASYNC_VIEWS", default=False)
+
+# Uma linha JSON por request da API no logger "orgst.metrics".
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"plain": {"format": "%(message)s"}},
+    "handlers": {
+        "metrics": {"class": "logging.StreamHandler", "formatter": "plain"},
+    },
+    "loggers": {
+        "orgst.metrics": {
+            "handlers": ["metrics"],
+            "level": env("METRICS_LOG_LEVEL", default="INFO"),
+            "propagate": False,
+        },
+    },
+}
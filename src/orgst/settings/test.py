@@ -12,3 +12,6 @@ DATABASES = {
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
+
+# saída das views `trusted_output` sempre conferida contra o schema
+API_VALIDATE_TRUSTED_OUTPUT = True
@@ -58,9 +58,9 @@ class AccountsUnitTests(TestCase):
             invitation_cls._default_manager.create.assert_called_once()
             fake_inv.roles.add.assert_called_once_with("mentor_role", "mentorado_role")
 
-    def test_validate_invitation_expired_returns_none_and_marks_expired(self):
+    def test_validate_invitation_expired_returns_none_without_writing(self):
         with patch("apps.accounts.services.Invitation") as invitation_cls:
-            fake_inv = Mock(status=InvitationStatus.PENDING)
+            fake_inv = Mock(status=InvitationStatus.PENDING, used_at=None)
             fake_inv.is_expired.return_value = True
 
             invitation_cls.hash_token.return_value = "hashed"
@@ -71,8 +71,8 @@ class AccountsUnitTests(TestCase):
             result = validate_invitation_token(token="plain")
 
             self.assertIsNone(result)
-            self.assertEqual(fake_inv.status, InvitationStatus.EXPIRED)
-            fake_inv.save.assert_called_once()
+            self.assertEqual(fake_inv.status, InvitationStatus.PENDING)
+            fake_inv.save.assert_not_called()
 
     def test_can_create_invitation_permissions(self):
         user_super = SimpleNamespace(
@@ -6,7 +6,11 @@ from django.urls import reverse
 from django.utils import timezone
 
 from apps.accounts.models import Invitation, InvitationStatus, Profile, Role, User
-from apps.accounts.services import provision_admin_only_invitation
+from apps.accounts.services import (
+    expire_pending_invitations,
+    provision_admin_only_invitation,
+    validate_invitation_token,
+)
 from orgst.common.middleware import ForcePasswordChangeMiddleware
 
 
@@ -117,3 +121,46 @@ class ForcePasswordChangeMiddlewareTests(TestCase):
         response = self.middleware(request)
 
         self.assertEqual(response.status_code, 200)
+
+
+class ExpirePendingInvitationsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(
+            username="owner", email="owner@orgst.dev", password="secret123"
+        )
+
+    def _invitation(self, email, *, expires_in, status=InvitationStatus.PENDING):
+        return Invitation.objects.create(
+            email=email,
+            invited_by=self.owner,
+            status=status,
+            token_hash=Invitation.hash_token(email),
+            expires_at=timezone.now() + expires_in,
+        )
+
+    def test_expires_only_overdue_pending_invitations_in_one_query(self):
+        overdue = self._invitation("a@orgst.dev", expires_in=timedelta(minutes=-1))
+        valid = self._invitation("b@orgst.dev", expires_in=timedelta(days=1))
+        revoked = self._invitation(
+            "c@orgst.dev",
+            expires_in=timedelta(minutes=-1),
+            status=InvitationStatus.REVOKED,
+        )
+
+        with self.assertNumQueries(1):
+            updated = expire_pending_invitations()
+
+        self.assertEqual(updated, 1)
+        statuses = dict(Invitation.objects.values_list("id", "status"))
+        self.assertEqual(statuses[overdue.id], InvitationStatus.EXPIRED)
+        self.assertEqual(statuses[valid.id], InvitationStatus.PENDING)
+        self.assertEqual(statuses[revoked.id], InvitationStatus.REVOKED)
+
+    def test_validation_is_read_only(self):
+        self._invitation("a@orgst.dev", expires_in=timedelta(minutes=-1))
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(validate_invitation_token(token="a@orgst.dev"))
+
+        self.assertEqual(Invitation.objects.get().status, InvitationStatus.PENDING)
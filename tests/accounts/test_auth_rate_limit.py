@@ -0,0 +1,103 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.hashing import hash_metrics
+from apps.accounts.models import User
+from apps.accounts.ratelimit import TokenBucket, auth_buckets
+
+TOKEN_URL = "/api/v1/accounts/auth/token"
+
+
+@override_settings(AUTH_RATE_LIMITS={"ip": (5, 60), "identifier": (2, 60)})
+class AuthRateLimitTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="secret123"
+        )
+
+    def setUp(self):
+        cache.clear()
+        auth_buckets.reset()
+
+    def _login(self, identifier, password="wrong", ip="10.0.0.1"):
+        return Client(REMOTE_ADDR=ip).post(
+            TOKEN_URL,
+            {"identifier": identifier, "password": password},
+            content_type="application/json",
+        )
+
+    def test_identifier_bucket_returns_429_with_retry_after(self):
+        self.assertEqual(self._login("ana@orgst.dev").status_code, 401)
+        self.assertEqual(self._login("ANA@orgst.dev", ip="10.0.0.2").status_code, 401)
+
+        res = self._login("ana@orgst.dev", ip="10.0.0.3")
+
+        self.assertEqual(res.status_code, 429)
+        self.assertEqual(res.json()["detail"], "RATE_LIMITED")
+        self.assertGreaterEqual(int(res["Retry-After"]), 1)
+
+    def test_ip_bucket_limits_across_identifiers(self):
+        for i in range(5):
+            self.assertEqual(self._login(f"user{i}@orgst.dev").status_code, 401)
+
+        self.assertEqual(self._login("other@orgst.dev").status_code, 429)
+        self.assertEqual(self._login("other@orgst.dev", ip="10.0.0.9").status_code, 401)
+
+    def test_valid_login_still_works_under_limit(self):
+        res = self._login("ana", password="secret123")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("access", res.json())
+
+    def test_unknown_user_pays_a_hash(self):
+        with mock.patch(
+            "apps.accounts.hashing.check_password", return_value=False
+        ) as dummy:
+            res = self._login("ghost@orgst.dev")
+
+        self.assertEqual(res.status_code, 401)
+        dummy.assert_called_once_with("wrong", mock.ANY)
+
+    def test_inactive_user_is_rejected_after_hashing(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertEqual(self._login("ana", password="secret123").status_code, 401)
+
+    def test_hash_metrics_are_recorded_per_endpoint(self):
+        self._login("ana", password="secret123")
+        self._login("ghost@orgst.dev")
+
+        self.assertEqual(hash_metrics()["auth_token"]["calls"], 2)
+
+        staff = User.objects.create_user(
+            username="staff", email="staff@orgst.dev", password="x", is_staff=True
+        )
+        res = Client(HTTP_AUTHORIZATION=f"Bearer {create_access_token(staff)}").get(
+            "/api/v1/accounts/auth/hash-metrics"
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["auth_token"]["calls"], 2)
+
+
+class TokenBucketTests(TestCase):
+    def test_refills_over_time(self):
+        bucket = TokenBucket("test")
+        bucket.reset()
+        cache.clear()
+        with mock.patch("apps.accounts.ratelimit.time.time", return_value=1000.0):
+            self.assertEqual(bucket.consume("k", capacity=1, period=10), 0)
+            self.assertAlmostEqual(bucket.consume("k", capacity=1, period=10), 10)
+        with mock.patch("apps.accounts.ratelimit.time.time", return_value=1010.0):
+            self.assertEqual(bucket.consume("k", capacity=1, period=10), 0)
+
+    def test_falls_back_to_local_buckets_when_cache_fails(self):
+        bucket = TokenBucket("test")
+        with mock.patch(
+            "apps.accounts.ratelimit.cache.get", side_effect=ConnectionError
+        ):
+            self.assertEqual(bucket.consume("k", capacity=1, period=60), 0)
+            self.assertGreater(bucket.consume("k", capacity=1, period=60), 0)
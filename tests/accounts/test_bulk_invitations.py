@@ -0,0 +1,155 @@
+import json
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import (
+    Invitation,
+    InvitationEmail,
+    InvitationRole,
+    InvitationStatus,
+    Role,
+    User,
+)
+from apps.accounts.services import BulkInvitationRow, create_invitations_bulk
+
+
+class BulkInvitationServiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(
+            username="owner", email="owner@orgst.dev", password="x"
+        )
+        cls.mentor = Role.objects.create(key="mentor", label="Mentor")
+        cls.mentorado = Role.objects.create(key="mentorado", label="Mentorado")
+
+    def _rows(self, n):
+        return [
+            BulkInvitationRow(
+                email=f"user{i}@orgst.dev",
+                invitee_name=f"User {i}",
+                role_keys=("mentorado",),
+            )
+            for i in range(n)
+        ]
+
+    def test_creates_invitations_roles_and_outbox_rows(self):
+        results = create_invitations_bulk(invited_by=self.manager, rows=self._rows(3))
+
+        self.assertEqual([r.status for r in results], ["created"] * 3)
+        self.assertEqual(Invitation.objects.count(), 3)
+        self.assertEqual(InvitationRole.objects.filter(role=self.mentorado).count(), 3)
+        self.assertEqual(InvitationEmail.objects.count(), 3)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as small:
+            create_invitations_bulk(invited_by=self.manager, rows=self._rows(5))
+        Invitation.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as large:
+            create_invitations_bulk(invited_by=self.manager, rows=self._rows(50))
+
+        self.assertEqual(len(small), len(large))
+
+    def test_reports_each_row(self):
+        Invitation.objects.create(
+            email="pending@orgst.dev",
+            invitee_name="Pending",
+            token_hash="x" * 64,
+            invited_by=self.manager,
+            status=InvitationStatus.PENDING,
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        rows = [
+            BulkInvitationRow("ok@orgst.dev", "Ok", ("mentor",)),
+            BulkInvitationRow("Pending@orgst.dev", "Pending again"),
+            BulkInvitationRow("OK@orgst.dev ", "Ok twice"),
+            BulkInvitationRow("not-an-email", "Broken"),
+            BulkInvitationRow("noname@orgst.dev", "  "),
+            BulkInvitationRow("role@orgst.dev", "Role", ("astronaut",)),
+        ]
+
+        results = create_invitations_bulk(invited_by=self.manager, rows=rows)
+
+        self.assertEqual(
+            [(r.row, r.status, r.detail) for r in results],
+            [
+                (1, "created", None),
+                (2, "skipped", "ALREADY_INVITED"),
+                (3, "skipped", "DUPLICATE_IN_BATCH"),
+                (4, "error", "INVALID_EMAIL"),
+                (5, "error", "NAME_REQUIRED"),
+                (6, "error", "UNKNOWN_ROLE"),
+            ],
+        )
+        self.assertEqual(Invitation.objects.filter(email="ok@orgst.dev").count(), 1)
+
+
+class BulkInvitationEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(
+            username="owner",
+            email="owner@orgst.dev",
+            password="x",
+            is_superuser=True,
+        )
+        cls.member = User.objects.create_user(
+            username="member", email="member@orgst.dev", password="x"
+        )
+        Role.objects.create(key="mentorado", label="Mentorado")
+
+    def _client(self, user):
+        return Client(HTTP_AUTHORIZATION=f"Bearer {create_access_token(user)}")
+
+    def test_json_list(self):
+        response = self._client(self.manager).post(
+            "/api/v1/accounts/invitations/bulk",
+            data=json.dumps(
+                [
+                    {"email": "a@orgst.dev", "name": "A", "role_keys": ["mentorado"]},
+                    {"email": "b@orgst.dev", "name": "B"},
+                ]
+            ),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual((payload["created"], payload["errors"]), (2, 0))
+        self.assertTrue(all(r["id"] for r in payload["results"]))
+
+    def test_csv_upload(self):
+        csv_file = SimpleUploadedFile(
+            "cohort.csv",
+            "email,name,roles\nc@orgst.dev,Cê,mentorado\nbroken,X,\n".encode(),
+            content_type="text/csv",
+        )
+        response = self._client(self.manager).post(
+            "/api/v1/accounts/invitations/bulk/csv", {"file": csv_file}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual((payload["created"], payload["errors"]), (1, 1))
+        self.assertEqual(Invitation.objects.get(email="c@orgst.dev").invitee_name, "Cê")
+
+    def test_csv_without_required_columns(self):
+        csv_file = SimpleUploadedFile("x.csv", b"mail\na@b.c\n")
+        response = self._client(self.manager).post(
+            "/api/v1/accounts/invitations/bulk/csv", {"file": csv_file}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_invite_manager(self):
+        response = self._client(self.member).post(
+            "/api/v1/accounts/invitations/bulk",
+            data=json.dumps([{"email": "a@orgst.dev", "name": "A"}]),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 403)
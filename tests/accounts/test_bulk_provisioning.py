@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import (
+    Invitation,
+    InvitationStatus,
+    Profile,
+    Role,
+    User,
+    UserRole,
+)
+from apps.accounts.services import provision_admin_only_invitations
+from apps.community.typeahead import get_member_index, reset_member_index
+
+
+class BulkProvisioningTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role_mentor = Role.objects.create(key="mentor", label="Mentor")
+        cls.role_mentorado = Role.objects.create(key="mentorado", label="Mentorado")
+        cls.role_admin = Role.objects.create(key="admin", label="Admin")
+        cls.owner = User.objects.create_user(
+            username="owner",
+            email="owner@orgst.dev",
+            password="secret123",
+            is_staff=True,
+            is_superuser=True,
+        )
+
+    def setUp(self):
+        reset_member_index()
+        self.addCleanup(reset_member_index)
+
+    def _invite(self, email, *roles, expires_in=timedelta(days=1)):
+        inv = Invitation.objects.create(
+            email=email,
+            token_hash=Invitation.hash_token(Invitation.build_token()),
+            invited_by=self.owner,
+            status=InvitationStatus.PENDING,
+            expires_at=timezone.now() + expires_in,
+        )
+        inv.roles.add(*(roles or (self.role_mentor,)))
+        return inv
+
+    def _provision(self, invitations):
+        with self.captureOnCommitCallbacks(execute=True):
+            return provision_admin_only_invitations(
+                invitations=Invitation.objects.filter(
+                    pk__in=[i.pk for i in invitations]
+                ).order_by("id"),
+                provisioned_by=self.owner,
+            )
+
+    def test_provisions_new_and_existing_users(self):
+        existing = User.objects.create_user(
+            username="ana", email="Ana@orgst.dev", password="old-password"
+        )
+        invitations = [
+            self._invite("ana@orgst.dev", self.role_mentorado),
+            self._invite("bruno@orgst.dev", self.role_mentor, self.role_mentorado),
+        ]
+
+        results = self._provision(invitations)
+
+        self.assertEqual([r.error for r in results], [None, None])
+        self.assertEqual(results[0].user.id, existing.id)
+        for result in results:
+            user = User.objects.get(pk=result.user.pk)
+            self.assertTrue(user.is_staff)
+            self.assertTrue(user.must_change_password)
+            self.assertTrue(user.check_password(result.temp_password))
+            self.assertTrue(Profile.objects.filter(user=user).exists())
+            result.invitation.refresh_from_db()
+            self.assertEqual(result.invitation.status, InvitationStatus.ACCEPTED)
+            self.assertEqual(result.invitation.accepted_by_id, user.id)
+
+        self.assertEqual(
+            set(
+                UserRole.objects.filter(user=results[1].user).values_list(
+                    "role__key", flat=True
+                )
+            ),
+            {"mentor", "mentorado"},
+        )
+        self.assertEqual(User.objects.get(pk=results[1].user.pk).username, "bruno")
+
+    def test_reports_errors_per_invitation(self):
+        ok = self._invite("ok@orgst.dev")
+        expired = self._invite("old@orgst.dev", expires_in=timedelta(days=-1))
+        no_role = self._invite("admin@orgst.dev", self.role_admin)
+        duplicate = self._invite("OK@orgst.dev")
+        accepted = self._invite("done@orgst.dev")
+        Invitation.objects.filter(pk=accepted.pk).update(
+            status=InvitationStatus.ACCEPTED
+        )
+
+        results = self._provision([ok, expired, no_role, duplicate, accepted])
+
+        self.assertEqual(
+            [r.error for r in results],
+            [
+                None,
+                "INVITATION_EXPIRED",
+                "INVITATION_ROLE_REQUIRED",
+                "DUPLICATE_IN_BATCH",
+                "INVITATION_NOT_PENDING",
+            ],
+        )
+        expired.refresh_from_db()
+        self.assertEqual(expired.status, InvitationStatus.EXPIRED)
+        self.assertFalse(User.objects.filter(email="admin@orgst.dev").exists())
+
+    def test_query_count_does_not_grow_with_batch(self):
+        def run(prefix, n):
+            invitations = [self._invite(f"{prefix}{i}@orgst.dev") for i in range(n)]
+            with CaptureQueriesContext(connection) as ctx:
+                self._provision(invitations)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run("small", 2), run("large", 20))
+
+    def test_updates_member_index(self):
+        get_member_index()
+        results = self._provision([self._invite("carla@orgst.dev")])
+
+        found = get_member_index().search("carla", limit=5)
+
+        self.assertEqual([m["id"] for m in found], [results[0].user.id])
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.mail import get_connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.accounts.emails import deliver_invitation_emails, outbox_metrics
+from apps.accounts.models import (
+    EmailOutboxStatus,
+    Invitation,
+    InvitationEmail,
+    InvitationStatus,
+    User,
+)
+from apps.accounts.services import create_invitation
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class InvitationOutboxTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(
+            username="owner", email="owner@orgst.dev", password="x"
+        )
+
+    def _invite(self, n: int = 1):
+        for i in range(n):
+            create_invitation(
+                invited_by=self.manager,
+                email=f"user{i}@orgst.dev",
+                invitee_name=f"User {i}",
+                role_keys=[],
+            )
+
+    def test_create_invitation_only_writes_the_outbox(self):
+        self._invite()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(InvitationEmail.objects.count(), 1)
+
+    def test_batch_reuses_a_single_connection(self):
+        self._invite(5)
+        with patch(
+            "apps.accounts.emails.get_connection", wraps=get_connection
+        ) as conn_factory:
+            result = deliver_invitation_emails()
+
+        conn_factory.assert_called_once()
+        self.assertEqual(result.sent, 5)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(
+            InvitationEmail.objects.exclude(status=EmailOutboxStatus.SENT).exists()
+        )
+
+    def test_failure_is_retried_with_backoff_then_marked_failed(self):
+        self._invite()
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("smtp down"),
+        ):
+            result = deliver_invitation_emails(max_attempts=2)
+            self.assertEqual(result.retried, 1)
+
+            item = InvitationEmail.objects.get()
+            self.assertEqual(item.attempts, 1)
+            self.assertGreater(item.next_attempt_at, timezone.now())
+            self.assertTrue(item.raw_token)
+
+            # ainda em backoff: nada a enviar
+            self.assertEqual(deliver_invitation_emails().processed, 0)
+
+            InvitationEmail.objects.update(
+                next_attempt_at=timezone.now() - timedelta(seconds=1)
+            )
+            result = deliver_invitation_emails(max_attempts=2)
+
+        self.assertEqual(result.failed, 1)
+        item.refresh_from_db()
+        self.assertEqual(item.status, EmailOutboxStatus.FAILED)
+        self.assertEqual(item.raw_token, "")
+        self.assertIn("smtp down", item.last_error)
+
+    def test_revoked_invitation_is_not_sent(self):
+        self._invite()
+        Invitation.objects.update(status=InvitationStatus.REVOKED)
+
+        result = deliver_invitation_emails()
+
+        self.assertEqual(result.failed, 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_metrics(self):
+        self._invite(3)
+        deliver_invitation_emails(batch_size=2)
+
+        metrics = outbox_metrics()
+        self.assertEqual(metrics["sent"], 2)
+        self.assertEqual(metrics["pending"], 1)
+        self.assertEqual(metrics["failed"], 0)
@@ -0,0 +1,152 @@
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+
+from apps.accounts.auth import create_access_token, create_refresh_token, decode_jwt
+from apps.accounts.keys import get_key_ring
+from apps.accounts.models import User
+
+
+def _private_pem(key) -> str:
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def _public_pem(key) -> str:
+    return (
+        key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+
+
+ED_KEY = ed25519.Ed25519PrivateKey.generate()
+RSA_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+class JWTKeyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="secret123"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def _me(self, token):
+        return Client(HTTP_AUTHORIZATION=f"Bearer {token}").get("/api/v1/accounts/me")
+
+    def test_default_is_hmac_without_kid(self):
+        token = create_access_token(self.user)
+
+        header = jwt.get_unverified_header(token)
+        self.assertEqual(header["alg"], "HS256")
+        self.assertNotIn("kid", header)
+        self.assertEqual(self._me(token).status_code, 200)
+        self.assertEqual(get_key_ring().jwks(), {"keys": []})
+
+    @override_settings(JWT_KEYS={"ed-1": _private_pem(ED_KEY)}, JWT_ACTIVE_KID="ed-1")
+    def test_eddsa_tokens_carry_kid_and_verify_with_jwks(self):
+        token = create_access_token(self.user)
+
+        self.assertEqual(
+            jwt.get_unverified_header(token),
+            {"alg": "EdDSA", "kid": "ed-1", "typ": "JWT"},
+        )
+        self.assertEqual(self._me(token).status_code, 200)
+
+        jwks = Client().get("/api/v1/accounts/auth/jwks").json()
+        (jwk,) = jwks["keys"]
+        self.assertEqual((jwk["kid"], jwk["alg"], jwk["kty"]), ("ed-1", "EdDSA", "OKP"))
+        self.assertNotIn("d", jwk)
+
+        public = jwt.PyJWK(jwk)
+        claims = jwt.decode(token, public.key, algorithms=["EdDSA"])
+        self.assertEqual(claims["sub"], str(self.user.id))
+
+    def test_rotation_keeps_old_tokens_valid(self):
+        with override_settings(
+            JWT_KEYS={"rsa-1": _private_pem(RSA_KEY)}, JWT_ACTIVE_KID="rsa-1"
+        ):
+            old_token = create_access_token(self.user)
+
+        with override_settings(
+            JWT_KEYS={
+                "ed-2": _private_pem(ED_KEY),
+                "rsa-1": _public_pem(RSA_KEY),
+            },
+            JWT_ACTIVE_KID="ed-2",
+        ):
+            new_token = create_access_token(self.user)
+            self.assertEqual(jwt.get_unverified_header(new_token)["kid"], "ed-2")
+            self.assertEqual(self._me(old_token).status_code, 200)
+            self.assertEqual(self._me(new_token).status_code, 200)
+            kids = {k["kid"] for k in get_key_ring().jwks()["keys"]}
+            self.assertEqual(kids, {"ed-2", "rsa-1"})
+
+        with override_settings(
+            JWT_KEYS={"ed-2": _private_pem(ED_KEY)}, JWT_ACTIVE_KID="ed-2"
+        ):
+            self.assertEqual(self._me(old_token).status_code, 401)
+
+    @override_settings(JWT_KEYS={"ed-1": _private_pem(ED_KEY)}, JWT_ACTIVE_KID="ed-1")
+    def test_rejects_hmac_token_and_unknown_kid(self):
+        forged = jwt.encode(
+            {"sub": str(self.user.id), "typ": "access", "iat": 0, "exp": 2**31},
+            "dev-secret-key-change-me",
+            algorithm="HS256",
+            headers={"kid": "ed-1"},
+        )
+        self.assertEqual(self._me(forged).status_code, 401)
+
+        with self.assertRaises(jwt.PyJWTError):
+            decode_jwt(
+                jwt.encode({"sub": "1"}, "x", headers={"kid": "nope"}), require=[]
+            )
+
+    def test_hmac_refresh_token_still_rotates_after_switch(self):
+        old_refresh = create_refresh_token(self.user)
+        old_access = create_access_token(self.user)
+
+        with override_settings(
+            JWT_KEYS={"ed-1": _private_pem(ED_KEY)}, JWT_ACTIVE_KID="ed-1"
+        ):
+            response = Client().post(
+                "/api/v1/accounts/auth/refresh",
+                {"refresh": old_refresh},
+                content_type="application/json",
+            )
+            self.assertEqual(response.status_code, 200)
+            pair = response.json()
+            for token in (pair["access"], pair["refresh"]):
+                self.assertEqual(jwt.get_unverified_header(token)["kid"], "ed-1")
+            self.assertEqual(self._me(old_access).status_code, 200)
+
+            # só verifica: não assina nem vai para o JWKS
+            self.assertEqual(get_key_ring().active.kid, "ed-1")
+            self.assertFalse(get_key_ring().verification_key(None).can_sign)
+            kids = {k["kid"] for k in get_key_ring().jwks()["keys"]}
+            self.assertEqual(kids, {"ed-1"})
+
+    @override_settings(
+        JWT_KEYS={"ed-1": _private_pem(ED_KEY)},
+        JWT_ACTIVE_KID="ed-1",
+        JWT_ACCEPT_HMAC=False,
+    )
+    def test_hmac_tokens_rejected_after_transition(self):
+        with override_settings(JWT_KEYS={}):
+            old_access = create_access_token(self.user)
+        self.assertIsNone(get_key_ring().verification_key(None))
+        self.assertEqual(self._me(old_access).status_code, 401)
+
+    def test_key_ring_is_parsed_once(self):
+        self.assertIs(get_key_ring(), get_key_ring())
@@ -0,0 +1,43 @@
+from django.contrib.auth import authenticate
+from django.test import TestCase
+
+from apps.accounts.backends import find_user_by_identifier
+from apps.accounts.models import User
+
+
+class LoginLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ana = User.objects.create_user(
+            username="Ana", email="Ana.Silva@orgst.dev", password="secret123"
+        )
+        # username igual ao e-mail de outro usuário: e-mail tem prioridade
+        cls.impostor = User.objects.create_user(
+            username="ana.silva@orgst.dev", email="other@orgst.dev", password="x"
+        )
+
+    def test_finds_by_email_or_username_case_insensitive_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                find_user_by_identifier("  ANA.SILVA@orgst.dev "), self.ana
+            )
+        with self.assertNumQueries(1):
+            self.assertEqual(find_user_by_identifier("ana"), self.ana)
+
+    def test_unknown_or_blank_identifier(self):
+        self.assertIsNone(find_user_by_identifier("ghost"))
+        with self.assertNumQueries(0):
+            self.assertIsNone(find_user_by_identifier("   "))
+
+    def test_authenticate_runs_a_single_backend_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                authenticate(None, username="ana", password="secret123"), self.ana
+            )
+        with self.assertNumQueries(1):
+            self.assertIsNone(authenticate(None, username="ghost", password="x"))
+
+    def test_authenticate_rejects_inactive_user(self):
+        User.objects.filter(pk=self.ana.pk).update(is_active=False)
+
+        self.assertIsNone(authenticate(None, username="ana", password="secret123"))
@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import Profile, Role, User, UserRole
+
+
+class MeEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="x"
+        )
+        cls.profile = Profile.objects.create(
+            user=cls.user,
+            display_name="Ana",
+            github_url="https://github.com/ana",
+            linkedin_url="https://linkedin.com/in/ana",
+        )
+        cls.mentor = Role.objects.create(key="mentor", label="Mentor")
+        cls.coach = Role.objects.create(key="coach", label="Coach")
+        UserRole.objects.create(user=cls.user, role=cls.mentor)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(
+            HTTP_AUTHORIZATION=f"Bearer {create_access_token(self.user)}"
+        )
+
+    def _me(self, **headers):
+        return self.client.get("/api/v1/accounts/me", headers=headers)
+
+    def test_one_query_beyond_auth_then_served_from_cache(self):
+        with self.assertNumQueries(2):  # usuário do JWT + perfil/papéis
+            res = self._me()
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["display_name"], "Ana")
+        self.assertEqual(res.json()["roles"], ["mentor"])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self._me().json(), res.json())
+
+    def test_if_none_match_returns_304(self):
+        etag = self._me()["ETag"]
+
+        res = self._me(if_none_match=etag)
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+
+    def test_role_and_profile_changes_produce_new_etag(self):
+        etag = self._me()["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserRole.objects.create(user=self.user, role=self.coach)
+        res = self._me(if_none_match=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["roles"], ["coach", "mentor"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.display_name = "Ana Silva"
+            self.profile.save()
+        res2 = self._me(if_none_match=res["ETag"])
+        self.assertEqual(res2.status_code, 200)
+        self.assertEqual(res2.json()["display_name"], "Ana Silva")
+
+    def test_role_rename_invalidates_every_cached_me(self):
+        self._me()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mentor.key = "mentora"
+            self.mentor.save()
+
+        self.assertEqual(self._me().json()["roles"], ["mentora"])
+
+    def test_user_without_profile_or_roles(self):
+        bare = User.objects.create_user(username="bob", email="bob@orgst.dev")
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {create_access_token(bare)}")
+
+        body = client.get("/api/v1/accounts/me").json()
+
+        self.assertIsNone(body["display_name"])
+        self.assertEqual(body["roles"], [])
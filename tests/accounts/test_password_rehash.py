@@ -0,0 +1,126 @@
+import io
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+
+from apps.accounts.hashing import (
+    check_password_constant_cost,
+    dummy_password_hash,
+    hash_metrics,
+)
+from apps.accounts.models import User
+
+SCRYPT = "apps.accounts.hashers.TunedScryptPasswordHasher"
+PBKDF2 = "apps.accounts.hashers.TunedPBKDF2PasswordHasher"
+MD5 = "django.contrib.auth.hashers.MD5PasswordHasher"
+
+
+@override_settings(
+    PASSWORD_SCRYPT_WORK_FACTOR=2**10,
+    PASSWORD_PBKDF2_ITERATIONS=1000,
+)
+class PasswordRehashTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # criado com o hasher do settings de teste (MD5)
+        self.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="secret123"
+        )
+
+    def _login(self, password="secret123"):
+        return Client().post(
+            "/api/v1/accounts/auth/token",
+            {"identifier": "ana", "password": password},
+            content_type="application/json",
+        )
+
+    @override_settings(PASSWORD_HASHERS=[SCRYPT, MD5])
+    def test_login_upgrades_hash_to_preferred_hasher(self):
+        self.assertTrue(self.user.password.startswith("md5$"))
+
+        self.assertEqual(self._login().status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$1024$"))
+        self.assertTrue(self.user.check_password("secret123"))
+        self.assertEqual(hash_metrics()["auth_token"]["rehashes"], 1)
+
+        self._login()
+        self.assertEqual(hash_metrics()["auth_token"]["rehashes"], 1)
+
+    @override_settings(PASSWORD_HASHERS=[SCRYPT, MD5])
+    def test_parameter_change_triggers_rehash(self):
+        self._login()
+        with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2**11):
+            self._login()
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$2048$"))
+
+    @override_settings(PASSWORD_HASHERS=[SCRYPT, MD5])
+    def test_failed_login_does_not_rehash(self):
+        self.assertEqual(self._login(password="wrong").status_code, 401)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("md5$"))
+
+
+# scrypt barato como preferido e PBKDF2 caro nas contas ainda não migradas:
+# o mesmo desnível (mais brando) de trocar o padrão para scrypt em produção
+@override_settings(
+    PASSWORD_HASHERS=[SCRYPT, PBKDF2],
+    PASSWORD_SCRYPT_WORK_FACTOR=2**10,
+    PASSWORD_PBKDF2_ITERATIONS=100_000,
+)
+class UnknownIdentifierCostTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="ana", email="ana@orgst.dev")
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password("secret123", hasher="pbkdf2_sha256")
+        )
+        self.user.refresh_from_db()
+
+    @staticmethod
+    def _cpu(fn) -> float:
+        timings = []
+        for _ in range(3):
+            start = time.thread_time()
+            fn()
+            timings.append(time.thread_time() - start)
+        return min(timings)
+
+    def test_dummy_hash_uses_the_algorithm_most_accounts_still_have(self):
+        self.assertTrue(dummy_password_hash().startswith("pbkdf2_sha256$100000$"))
+
+    def test_dummy_hash_follows_preferred_hasher_without_accounts(self):
+        User.objects.all().delete()
+        with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2**11):
+            self.assertTrue(dummy_password_hash().startswith("scrypt$2048$"))
+
+    def test_unknown_and_existing_identifiers_cost_the_same(self):
+        unknown = self._cpu(lambda: check_password_constant_cost(None, "wrong"))
+        existing = self._cpu(lambda: check_password_constant_cost(self.user, "wrong"))
+        # um make_password com o scrypt preferido sairia dezenas de vezes mais
+        # barato que conferir o PBKDF2 salvo
+        self.assertLess(max(unknown, existing) / min(unknown, existing), 2)
+
+
+@override_settings(
+    PASSWORD_HASHERS=[SCRYPT, PBKDF2],
+    PASSWORD_SCRYPT_WORK_FACTOR=2**10,
+    PASSWORD_PBKDF2_ITERATIONS=1000,
+)
+class BenchmarkHashersCommandTests(TestCase):
+    def test_reports_hashers_and_suggestions(self):
+        out = io.StringIO()
+
+        call_command("benchmark_hashers", "--rounds=1", "--target-ms=1", stdout=out)
+
+        text = out.getvalue()
+        self.assertIn("Preferred hasher: scrypt", text)
+        self.assertIn("PASSWORD_SCRYPT_WORK_FACTOR=", text)
+        self.assertIn("PASSWORD_PBKDF2_ITERATIONS=", text)
+        self.assertIn("Stored hashes", text)
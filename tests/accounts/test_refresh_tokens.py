@@ -0,0 +1,94 @@
+import jwt
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+from apps.accounts.auth import create_refresh_token, purge_refresh_tokens
+from apps.accounts.models import RefreshToken, User
+
+BASE = "/api/v1/accounts"
+
+
+class RefreshTokenTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="secret123"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def _post(self, path, data):
+        return self.client.post(f"{BASE}{path}", data, content_type="application/json")
+
+    def _refresh(self, token):
+        return self._post("/auth/refresh", {"refresh": token})
+
+    def test_login_returns_refresh_that_rotates(self):
+        login = self._post(
+            "/auth/token", {"identifier": "ana", "password": "secret123"}
+        ).json()
+
+        res = self._refresh(login["refresh"])
+
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertNotEqual(body["refresh"], login["refresh"])
+        me = Client(HTTP_AUTHORIZATION=f"Bearer {body['access']}").get(f"{BASE}/me")
+        self.assertEqual(me.status_code, 200)
+
+        old = RefreshToken.objects.get(revoked_at__isnull=False)
+        new = RefreshToken.objects.get(revoked_at__isnull=True)
+        self.assertEqual(old.replaced_by, new.jti)
+        self.assertEqual(old.family, new.family)
+
+    def test_reuse_revokes_the_whole_family(self):
+        first = create_refresh_token(self.user)
+        second = self._refresh(first).json()["refresh"]
+
+        reused = self._refresh(first)
+
+        self.assertEqual(reused.status_code, 401)
+        self.assertEqual(reused.json()["detail"], "REFRESH_TOKEN_REUSED")
+        self.assertEqual(self._refresh(second).status_code, 401)
+        self.assertFalse(RefreshToken.objects.filter(revoked_at__isnull=True).exists())
+
+    def test_refresh_token_is_not_accepted_as_access(self):
+        token = create_refresh_token(self.user)
+
+        res = Client(HTTP_AUTHORIZATION=f"Bearer {token}").get(f"{BASE}/me")
+
+        self.assertEqual(res.status_code, 401)
+
+    def test_access_token_is_not_accepted_as_refresh(self):
+        login = self._post(
+            "/auth/token", {"identifier": "ana", "password": "secret123"}
+        ).json()
+
+        res = self._refresh(login["access"])
+
+        self.assertEqual(res.status_code, 401)
+        self.assertEqual(res.json()["detail"], "INVALID_REFRESH_TOKEN")
+
+    def test_inactive_user_cannot_refresh(self):
+        token = create_refresh_token(self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertEqual(self._refresh(token).status_code, 401)
+
+    def test_logout_revokes_family(self):
+        token = create_refresh_token(self.user)
+
+        res = self._post("/auth/logout", {"refresh": token})
+
+        self.assertEqual(res.status_code, 204)
+        self.assertEqual(self._refresh(token).status_code, 401)
+
+    def test_purge_removes_expired_tokens(self):
+        token = create_refresh_token(self.user)
+        jti = jwt.decode(token, options={"verify_signature": False})["jti"]
+        RefreshToken.objects.filter(jti=jti).update(expires_at="2000-01-01T00:00Z")
+
+        self.assertEqual(purge_refresh_tokens(), 1)
+        self.assertFalse(RefreshToken.objects.exists())
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import (
+    Invitation,
+    InvitationStatus,
+    Profile,
+    Role,
+    User,
+    UserRole,
+)
+from apps.accounts.services import register_from_invitation
+
+PAYLOAD = {
+    "password": "Str0ng-pass!",
+    "display_name": "Ana",
+    "github_url": "https://github.com/ana",
+    "linkedin_url": "https://linkedin.com/in/ana",
+}
+
+
+class RegistrationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.mentor = Role.objects.create(key="mentor", label="Mentor")
+        cls.member = Role.objects.create(key="member", label="Member")
+        cls.owner = User.objects.create_user(
+            username="owner", email="owner@orgst.dev", password="x"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.token = Invitation.build_token()
+        self.inv = Invitation.objects.create(
+            email="ana@orgst.dev",
+            invitee_name="Ana",
+            token_hash=Invitation.hash_token(self.token),
+            invited_by=self.owner,
+            status=InvitationStatus.PENDING,
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        self.inv.roles.add(self.mentor, self.member)
+
+    def test_registers_user_with_hashed_password_roles_and_profile(self):
+        registration = register_from_invitation(token=self.token, **PAYLOAD)
+
+        user = User.objects.get(pk=registration.user.pk)
+        self.assertTrue(user.check_password(PAYLOAD["password"]))
+        self.assertTrue(user.is_staff)  # mentor é papel de staff
+        self.assertEqual(sorted(registration.role_keys), ["member", "mentor"])
+        self.assertEqual(
+            set(UserRole.objects.filter(user=user).values_list("role__key", flat=True)),
+            {"member", "mentor"},
+        )
+        self.assertEqual(Profile.objects.get(user=user).display_name, "Ana")
+
+        self.inv.refresh_from_db()
+        self.assertEqual(self.inv.status, InvitationStatus.ACCEPTED)
+        self.assertEqual(self.inv.accepted_by_id, user.id)
+        self.assertIsNotNone(self.inv.used_at)
+
+    def test_single_write_per_table(self):
+        with CaptureQueriesContext(connection) as ctx:
+            register_from_invitation(token=self.token, **PAYLOAD)
+
+        sql = [q["sql"] for q in ctx.captured_queries]
+        self.assertEqual(
+            sum(s.startswith('INSERT INTO "accounts_user"') for s in sql), 1
+        )
+        self.assertEqual(
+            sum(s.startswith('INSERT INTO "accounts_userrole"') for s in sql), 1
+        )
+        self.assertFalse(any(s.startswith('UPDATE "accounts_user"') for s in sql))
+        role_reads = [
+            s for s in sql if s.startswith("SELECT") and '"accounts_role"' in s
+        ]
+        self.assertEqual(len(role_reads), 1)
+
+    def test_invitation_cannot_be_accepted_twice(self):
+        register_from_invitation(token=self.token, **PAYLOAD)
+
+        with self.assertRaisesMessage(ValueError, "INVALID_OR_EXPIRED_INVITATION"):
+            register_from_invitation(token=self.token, **PAYLOAD)
+        self.assertEqual(User.objects.filter(email="ana@orgst.dev").count(), 1)
+
+    def test_api_returns_roles_without_requerying(self):
+        res = Client().post(
+            "/api/v1/accounts/register",
+            {"invite_token": self.token, **PAYLOAD},
+            content_type="application/json",
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(sorted(res.json()["roles"]), ["member", "mentor"])
@@ -0,0 +1,72 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Max
+from django.test import TestCase
+
+from apps.accounts.models import Profile, User
+from apps.docs.models import Document, DocumentVersion
+from apps.kanban.models import Column, Task, TaskComment
+from apps.projects.models import Project
+
+
+def seed(**options):
+    defaults = {"users": 40, "tasks": 300, "docs": 15, "stdout": StringIO()}
+    call_command("seed_scale", **{**defaults, **options})
+
+
+def snapshot(prefix):
+    tasks = Task.objects.filter(project__name__startswith=f"{prefix} ").order_by("id")
+    comments = TaskComment.objects.filter(task__in=tasks).order_by("id")
+    versions = DocumentVersion.objects.filter(
+        document__slug__startswith=f"{prefix}-"
+    ).order_by("id")
+    return (
+        list(tasks.values_list("title", "position", "priority")),
+        list(comments.values_list("content", flat=True)),
+        list(versions.values_list("version_number", "body_md")),
+        list(
+            Profile.objects.filter(user__username__startswith=f"{prefix}-")
+            .order_by("user_id")
+            .values_list("display_name", "bio")
+        ),
+    )
+
+
+class SeedScaleTests(TestCase):
+    def test_generates_requested_scale(self):
+        seed(prefix="s", projects=3)
+
+        self.assertEqual(User.objects.filter(username__startswith="s-").count(), 40)
+        self.assertEqual(Profile.objects.count(), 40)
+        self.assertEqual(Project.objects.count(), 3)
+        self.assertEqual(Column.objects.count(), 15)
+        self.assertEqual(Task.objects.count(), 300)
+        self.assertEqual(Document.objects.count(), 15)
+        self.assertTrue(TaskComment.objects.exists())
+        self.assertTrue(User.objects.first().check_password("scale-Password-1"))
+
+        # posições compactas (1..N) em cada coluna
+        for row in Task.objects.values("column").annotate(
+            n=Count("id"), top=Max("position")
+        ):
+            self.assertEqual(row["n"], row["top"])
+
+    def test_same_seed_same_data_regardless_of_batch_size(self):
+        seed(prefix="a", batch_size=7)
+        seed(prefix="b", batch_size=500)
+
+        self.assertEqual(snapshot("a"), snapshot("b"))
+
+    def test_other_seed_changes_data(self):
+        seed(prefix="a")
+        seed(prefix="b", seed=7)
+
+        self.assertNotEqual(snapshot("a"), snapshot("b"))
+
+    def test_refuses_reused_prefix(self):
+        seed(prefix="dup", tasks=0, docs=0)
+
+        with self.assertRaisesMessage(CommandError, "already used"):
+            seed(prefix="dup", tasks=0, docs=0)
@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+from django.db import IntegrityError
+from django.test import TestCase
+
+from apps.accounts import services
+from apps.accounts.models import User
+from apps.accounts.services import _create_user, allocate_usernames
+
+
+class AllocateUsernamesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for username in ("joao", "joao1", "joao7", "joaopedro", "joao-silva"):
+            User.objects.create(username=username, email=f"{username}@orgst.dev")
+
+    def test_continues_after_highest_numeric_suffix_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(allocate_usernames(["joao@gmail.com"]), ["joao8"])
+
+    def test_free_base_is_used_as_is(self):
+        self.assertEqual(allocate_usernames(["contato@empresa.com"]), ["contato"])
+
+    def test_bulk_allocation_is_sequential_within_the_batch(self):
+        with self.assertNumQueries(1):
+            usernames = allocate_usernames(
+                ["joao@a.com", "joao@b.com", "maria@a.com", "maria@b.com"]
+            )
+        self.assertEqual(usernames, ["joao8", "joao9", "maria", "maria1"])
+
+    def test_empty_local_part_falls_back_to_user(self):
+        self.assertEqual(allocate_usernames(["@orgst.dev"]), ["user"])
+
+
+class CreateUserRetryTests(TestCase):
+    def test_retries_when_a_concurrent_insert_takes_the_username(self):
+        User.objects.create(username="ana", email="ana@other.dev")
+        # simula a corrida: a primeira alocação ainda não via "ana"
+        allocations = iter([["ana"], ["ana1"]])
+
+        with patch.object(
+            services, "allocate_usernames", side_effect=lambda e: next(allocations)
+        ):
+            user = _create_user(email="ana@orgst.dev")
+
+        self.assertEqual(user.username, "ana1")
+
+    def test_duplicate_email_is_not_retried(self):
+        User.objects.create(username="bia", email="bia@orgst.dev")
+        with self.assertRaises(IntegrityError):
+            _create_user(email="bia@orgst.dev")
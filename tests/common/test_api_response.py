@@ -0,0 +1,131 @@
+import gzip
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import User
+from apps.docs.services import create_document
+from orgst.common import http
+from orgst.common.http import accepted_codings, preferred_coding
+
+ORIGIN = "http://localhost:3000"
+
+
+class AcceptEncodingTests(SimpleTestCase):
+    def test_refused_codings_are_dropped(self):
+        self.assertEqual(
+            accepted_codings("gzip;q=0.5, br;q=0, deflate ; q=0.0, identity"),
+            {"gzip", "identity"},
+        )
+
+    def test_prefers_brotli_when_available(self):
+        with mock.patch.object(http, "brotli", None):
+            self.assertEqual(preferred_coding("br, gzip"), "gzip")
+            self.assertIsNone(preferred_coding("br"))
+        if http.brotli is not None:
+            self.assertEqual(preferred_coding("gzip, br"), "br")
+            self.assertEqual(preferred_coding("br;q=0, gzip"), "gzip")
+        self.assertIsNone(preferred_coding("identity"))
+
+
+class ApiResponseMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="x"
+        )
+        create_document(title="Guia", body_md="# Guia", created_by=self.user)
+        self.headers = {"Authorization": f"Bearer {create_access_token(self.user)}"}
+
+    def _get(self, path, **headers):
+        return self.client.get(path, headers={**self.headers, **headers})
+
+    def test_listing_gets_weak_etag_and_revalidates(self):
+        response = self._get("/api/v1/docs/docs")
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+
+        revalidated = self._get("/api/v1/docs/docs", **{"If-None-Match": etag})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b"")
+        self.assertEqual(revalidated["ETag"], etag)
+
+    def test_endpoint_validator_skips_body_hash(self):
+        with mock.patch("orgst.common.middleware.weak_etag") as hashed:
+            response = self._get("/api/v1/accounts/me")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        hashed.assert_not_called()
+
+    def test_small_responses_are_not_compressed(self):
+        response = self._get("/api/v1/docs/docs", **{"Accept-Encoding": "gzip"})
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertFalse(response.has_header("Vary"))
+
+    @override_settings(API_COMPRESS_MIN_BYTES=0)
+    def test_gzip_above_threshold(self):
+        plain = self._get("/api/v1/docs/docs")
+        with mock.patch.object(http, "brotli", None):
+            response = self._get("/api/v1/docs/docs", **{"Accept-Encoding": "gzip"})
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        # o ETag é do corpo sem compressão: vale para as duas representações
+        self.assertEqual(response["ETag"], plain["ETag"])
+
+    @override_settings(API_COMPRESS_MIN_BYTES=0)
+    def test_brotli_when_client_accepts_it(self):
+        if http.brotli is None:
+            self.skipTest("brotli not installed")
+        response = self._get("/api/v1/docs/docs", **{"Accept-Encoding": "gzip, br"})
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(
+            json.loads(http.brotli.decompress(response.content))[0]["title"], "Guia"
+        )
+
+    @override_settings(API_COMPRESS_MIN_BYTES=0)
+    def test_strong_etag_is_weakened_when_compressed(self):
+        strong = self._get("/api/v1/accounts/me")["ETag"]
+        response = self._get("/api/v1/accounts/me", **{"Accept-Encoding": "gzip"})
+        self.assertEqual(response["ETag"], f"W/{strong}")
+
+        # a comparação do If-None-Match é fraca: as duas formas revalidam
+        for etag in (strong, f"W/{strong}"):
+            with self.subTest(etag=etag):
+                revalidated = self._get(
+                    "/api/v1/accounts/me",
+                    **{"Accept-Encoding": "gzip", "If-None-Match": etag},
+                )
+                self.assertEqual(revalidated.status_code, 304)
+
+    @override_settings(API_COMPRESS_MIN_BYTES=0, CORS_ALLOWED_ORIGINS=[ORIGIN])
+    def test_vary_keeps_origin_and_accept_encoding(self):
+        response = self._get(
+            "/api/v1/docs/docs", **{"Accept-Encoding": "gzip", "Origin": ORIGIN}
+        )
+        self.assertEqual(response["Access-Control-Allow-Origin"], ORIGIN)
+        vary = {v.strip() for v in response["Vary"].split(",")}
+        self.assertLessEqual({"Origin", "Accept-Encoding"}, vary)
+
+    def test_other_paths_are_untouched(self):
+        response = self.client.get("/admin/login/")
+        self.assertFalse(response.has_header("ETag"))
+
+    @override_settings(API_COMPRESS_MIN_BYTES=0)
+    async def test_async_path(self):
+        client = AsyncClient()
+        response = await client.get(
+            "/api/v1/docs/docs", headers={**self.headers, "Accept-Encoding": "gzip"}
+        )
+        self.assertIn(response["Content-Encoding"], ("gzip", "br"))
+
+        revalidated = await client.get(
+            "/api/v1/docs/docs",
+            headers={**self.headers, "If-None-Match": response["ETag"]},
+        )
+        self.assertEqual(revalidated.status_code, 304)
@@ -0,0 +1,224 @@
+import importlib
+import inspect
+import json
+import sys
+import types
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import path as url_path
+from django.urls import resolve
+
+from apps.accounts.auth import create_access_token, create_token_pair
+from apps.community.catalog import invalidate_skill_catalog
+from apps.docs.services import create_document
+from orgst.api.v1.router import api
+from orgst.common.db_router import _state, sticky_cache_key
+
+User = get_user_model()
+
+_API_MODULES = (
+    "apps.accounts.views",
+    "apps.community.views",
+    "apps.docs.views",
+    "orgst.api.v1.router",
+)
+
+
+def _load_async_api():
+    """
+    Monta a API de novo com API_ASYNC_VIEWS ligado: a escolha entre view
+    síncrona e async é feita no import das views. Os módulos do processo
+    (sys.modules e atributos dos pacotes) voltam ao que eram.
+    """
+    packages = {}
+    for name in _API_MODULES:
+        parent, _, child = name.rpartition(".")
+        packages[name] = (sys.modules[parent], child, sys.modules[name])
+
+    with override_settings(API_ASYNC_VIEWS=True), mock.patch.dict(sys.modules):
+        for name in _API_MODULES:
+            del sys.modules[name]
+        fresh = {name: importlib.import_module(name) for name in _API_MODULES}
+
+    for package, child, module in packages.values():
+        setattr(package, child, module)
+    return fresh
+
+
+class AsgiReadPathTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="x"
+        )
+        self.doc = create_document(title="Guia", body_md="# Guia", created_by=self.user)
+        self.refresh = create_token_pair(self.user).refresh
+
+    async def _get(self, path, token=None):
+        # headers passados no construtor do AsyncClient não chegam ao escopo
+        token = token or create_access_token(self.user)
+        return await AsyncClient().get(
+            path, headers={"Authorization": f"Bearer {token}"}
+        )
+
+    @override_settings(DEBUG=True)
+    def test_middleware_chain_runs_without_sync_adapters(self):
+        # com DEBUG o Django loga cada middleware que precisou de adaptação
+        with self.assertNoLogs("django.request", "DEBUG"):
+            ASGIHandler()
+
+    async def test_endpoints_serve_reads_under_asgi(self):
+        for path in (
+            "/api/v1/accounts/me",
+            "/api/v1/docs/docs",
+            f"/api/v1/docs/docs/{self.doc.id}",
+            "/api/v1/community/members",
+            "/api/v1/community/skills",
+        ):
+            with self.subTest(path=path):
+                res = await self._get(path)
+                self.assertEqual(res.status_code, 200)
+
+        res = await self._get("/api/v1/docs/docs")
+        self.assertEqual([d["slug"] for d in res.json()], [self.doc.slug])
+
+    async def test_auth_rejects_refresh_and_inactive_users_under_asgi(self):
+        res = await self._get("/api/v1/docs/docs", self.refresh)
+        self.assertEqual(res.status_code, 401)
+
+        self.user.is_active = False
+        await self.user.asave(update_fields=["is_active"])
+        res = await self._get("/api/v1/docs/docs")
+        self.assertEqual(res.status_code, 401)
+
+    async def test_metrics_count_queries_under_asgi(self):
+        with self.assertLogs("orgst.metrics", "INFO") as logs:
+            await self._get("/api/v1/docs/docs")
+
+        (line,) = logs.output
+        record = json.loads(line.split(":", 2)[2])
+        self.assertEqual(record["route"], "api/v1/docs/docs")
+        # usuário do JWT, papéis do leitor, documentos, tags
+        self.assertEqual(record["queries"], 4)
+
+
+class AsyncViewsTests(TestCase):
+    """Variantes async das leituras quentes (API_ASYNC_VIEWS)."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.modules = _load_async_api()
+        cls.urlconf = types.ModuleType("async_api_urls")
+        cls.urlconf.urlpatterns = [
+            url_path("api/v1/", cls.modules["orgst.api.v1.router"].api.urls)
+        ]
+        cls.enterClassContext(override_settings(ROOT_URLCONF=cls.urlconf))
+        super().setUpClass()
+
+    def setUp(self):
+        cache.clear()
+        invalidate_skill_catalog()
+        self.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="x"
+        )
+        self.doc = create_document(title="Guia", body_md="# Guia", created_by=self.user)
+        self.paths = (
+            "/api/v1/accounts/me",
+            "/api/v1/docs/docs",
+            f"/api/v1/docs/docs/{self.doc.id}",
+            "/api/v1/community/members",
+            "/api/v1/community/skills",
+        )
+        self.refresh = create_token_pair(self.user).refresh
+
+    async def _get(self, path, token=None, **headers):
+        token = token or create_access_token(self.user)
+        return await AsyncClient().get(
+            path, headers={"Authorization": f"Bearer {token}", **headers}
+        )
+
+    def test_hot_reads_are_registered_async(self):
+        for path in self.paths:
+            with self.subTest(path=path):
+                self.assertTrue(inspect.iscoroutinefunction(resolve(path).func))
+        # o resto da API continua síncrono
+        self.assertFalse(
+            inspect.iscoroutinefunction(resolve("/api/v1/accounts/auth/jwks").func)
+        )
+
+    def test_openapi_operations_are_unchanged(self):
+        def operations(schema):
+            # só o nome do esquema de segurança muda (AsyncJWTAuth, também Bearer)
+            return {
+                (route, method): (
+                    op["operationId"],
+                    op.get("parameters"),
+                    op["responses"],
+                )
+                for route, methods in schema["paths"].items()
+                for method, op in methods.items()
+            }
+
+        async_api = self.modules["orgst.api.v1.router"].api
+        self.assertEqual(
+            operations(async_api.get_openapi_schema()),
+            operations(api.get_openapi_schema()),
+        )
+
+    async def test_responses_match_the_sync_views(self):
+        sync_client = AsyncClient()
+        headers = {"Authorization": f"Bearer {create_access_token(self.user)}"}
+        for path in self.paths:
+            with self.subTest(path=path):
+                res = await self._get(path)
+                self.assertEqual(res.status_code, 200)
+                with override_settings(ROOT_URLCONF="orgst.urls"):
+                    expected = await sync_client.get(path, headers=headers)
+                self.assertEqual(res.json(), expected.json())
+
+    async def test_conditional_get_under_async_views(self):
+        for path in ("/api/v1/accounts/me", "/api/v1/community/skills"):
+            with self.subTest(path=path):
+                etag = (await self._get(path))["ETag"]
+                res = await self._get(path, **{"If-None-Match": etag})
+                self.assertEqual(res.status_code, 304)
+
+    async def test_async_auth_rejects_refresh_and_inactive_users(self):
+        res = await self._get("/api/v1/docs/docs", self.refresh)
+        self.assertEqual(res.status_code, 401)
+
+        self.user.is_active = False
+        await self.user.asave(update_fields=["is_active"])
+        res = await self._get("/api/v1/docs/docs")
+        self.assertEqual(res.status_code, 401)
+
+    async def test_metrics_count_queries_of_async_views(self):
+        with self.assertLogs("orgst.metrics", "INFO") as logs:
+            await self._get("/api/v1/docs/docs")
+
+        (line,) = logs.output
+        record = json.loads(line.split(":", 2)[2])
+        self.assertEqual(record["route"], "api/v1/docs/docs")
+        # usuário do JWT, papéis do leitor, documentos, tags
+        self.assertEqual(record["queries"], 4)
+
+    @mock.patch("orgst.common.db_router.replica_configured", return_value=True)
+    async def test_async_views_enter_replica_reads(self, _):
+        seen = []
+
+        async def record(**kwargs):
+            state = _state.get()
+            seen.append((state.replica_reads, state.sticky))
+            return []
+
+        views = self.modules["apps.docs.views"]
+        with mock.patch.object(views, "alist_documents", side_effect=record):
+            await self._get("/api/v1/docs/docs")
+            # escrita recente do usuário: lê do primário
+            await cache.aset(sticky_cache_key(self.user.pk), 1)
+            await self._get("/api/v1/docs/docs")
+        self.assertEqual(seen, [(True, False), (True, True)])
@@ -0,0 +1,159 @@
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from apps.accounts.models import User
+from apps.docs.models import Document
+from orgst.common.benchmark import (
+    HttpClient,
+    compare_reports,
+    percentile,
+    run_scenario,
+)
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como o HttpClient espera
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.dumps(
+            {
+                "method": self.command,
+                "path": self.path,
+                "authorization": self.headers.get("Authorization"),
+                "content_type": self.headers.get("Content-Type"),
+                "body": self.rfile.read(length).decode(),
+            }
+        ).encode()
+        self.send_response(201 if self.command == "POST" else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class BenchmarkRunnerTests(SimpleTestCase):
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_run_scenario_counts_errors_by_kind(self):
+        def call(i):
+            if i % 4 == 0:
+                raise RuntimeError("boom")
+            return i % 4 != 1
+
+        result = run_scenario("x", call, requests=8, concurrency=2)
+
+        self.assertEqual(result.requests, 8)
+        self.assertEqual(result.errors, 4)
+        self.assertEqual(
+            result.error_kinds,
+            {"RuntimeError: boom": 2, "unsuccessful response": 2},
+        )
+        self.assertGreater(result.throughput_rps, 0)
+
+    def test_http_client_reuses_connection_and_sends_headers(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = HttpClient(f"http://127.0.0.1:{server.server_port}/api")
+
+        res = client.get("/v1/me", headers={"Authorization": "Bearer t"})
+        conn = client._local.conn
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            json.loads(res.content)["path"],
+            "/api/v1/me",
+        )
+        self.assertEqual(json.loads(res.content)["authorization"], "Bearer t")
+
+        res = client.post("/v1/x", {"a": 1}, content_type="application/json")
+        echoed = json.loads(res.content)
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(echoed["content_type"], "application/json")
+        self.assertEqual(json.loads(echoed["body"]), {"a": 1})
+        self.assertIs(client._local.conn, conn)
+
+    def test_compare_reports_percent_change(self):
+        base = {
+            "results": [
+                {
+                    "name": "a",
+                    "p50_ms": 10,
+                    "p95_ms": 20,
+                    "p99_ms": 0,
+                    "throughput_rps": 100,
+                }
+            ]
+        }
+        head = {
+            "results": [
+                {
+                    "name": "a",
+                    "p50_ms": 5,
+                    "p95_ms": 30,
+                    "p99_ms": 1,
+                    "throughput_rps": 150,
+                }
+            ]
+        }
+
+        [row] = compare_reports(base, head)
+
+        self.assertEqual(
+            row,
+            {
+                "name": "a",
+                "p50_ms": -50.0,
+                "p95_ms": 50.0,
+                "p99_ms": None,
+                "throughput_rps": 50.0,
+            },
+        )
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_runs_scenarios_writes_json_and_cleans_up(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "report.json"
+            call_command(
+                "benchmark_api",
+                users=5,
+                docs=5,
+                versions=2,
+                tasks=10,
+                requests=4,
+                concurrency=1,
+                warmup=0,
+                only="accounts_me,docs_versions,kanban_move_task",
+                output=str(output),
+                stdout=StringIO(),
+            )
+            report = json.loads(output.read_text())
+
+        self.assertEqual(report["database"], "sqlite")
+        self.assertEqual(report["scale"]["users"], 5)
+        self.assertEqual(
+            [r["name"] for r in report["results"]],
+            ["accounts_me", "docs_versions", "kanban_move_task"],
+        )
+        self.assertTrue(all(r["errors"] == 0 for r in report["results"]))
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Document.objects.exists())
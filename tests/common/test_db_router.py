@@ -0,0 +1,115 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+from django.test import Client, TransactionTestCase
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import User
+from apps.docs.models import Document
+from orgst.common.db_router import (
+    REPLICA_DB_ALIAS,
+    STICKY_COOKIE,
+    PrimaryReplicaRouter,
+    _RoutingState,
+    _state,
+    sticky_cache_key,
+)
+
+
+# TestCase envolve cada teste numa transação, e leituras em transação ficam
+# no primário; aqui as views precisam rodar fora dela.
+@mock.patch("orgst.common.db_router.replica_configured", return_value=True)
+class ReplicaRoutingTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="x"
+        )
+        self.token = create_access_token(self.user)
+
+    def _client(self):
+        return Client(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def _list_docs_alias(self, client) -> str:
+        """Alias que o router escolhe para ler Document dentro da listagem."""
+        seen = []
+
+        def record(**kwargs):
+            seen.append(router.db_for_read(Document))
+            return []
+
+        with mock.patch("apps.docs.views.list_documents", side_effect=record):
+            response = client.get("/api/v1/docs/docs")
+        self.assertEqual(response.status_code, 200)
+        return seen[0]
+
+    def test_marked_views_read_from_replica(self, _):
+        self.assertEqual(self._list_docs_alias(self._client()), REPLICA_DB_ALIAS)
+
+    def test_other_reads_and_writes_use_primary(self, _):
+        state = _RoutingState(replica_reads=False)
+        token = _state.set(state)
+        try:
+            self.assertEqual(router.db_for_read(Document), DEFAULT_DB_ALIAS)
+            state.replica_reads = True
+            self.assertEqual(router.db_for_write(Document), DEFAULT_DB_ALIAS)
+            # escreveu no request: o resto das leituras fica no primário
+            self.assertEqual(router.db_for_read(Document), DEFAULT_DB_ALIAS)
+        finally:
+            _state.reset(token)
+
+    def test_reads_inside_transaction_use_primary(self, _):
+        token = _state.set(_RoutingState(replica_reads=True))
+        try:
+            self.assertEqual(router.db_for_read(Document), REPLICA_DB_ALIAS)
+            with transaction.atomic():
+                self.assertEqual(router.db_for_read(Document), DEFAULT_DB_ALIAS)
+        finally:
+            _state.reset(token)
+
+    def test_write_sticks_client_to_primary(self, _):
+        client = self._client()
+        response = client.post(
+            "/api/v1/docs/docs",
+            {"title": "Guia", "body_md": "# Guia"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+        self.assertEqual(self._list_docs_alias(client), DEFAULT_DB_ALIAS)
+        # sem o cookie (cliente de API), a chave do usuário no cache basta
+        self.assertEqual(self._list_docs_alias(self._client()), DEFAULT_DB_ALIAS)
+
+        cache.delete(sticky_cache_key(self.user.pk))
+        self.assertEqual(self._list_docs_alias(self._client()), REPLICA_DB_ALIAS)
+
+    def test_failed_write_does_not_stick(self, _):
+        client = self._client()
+        response = client.post(
+            "/api/v1/docs/docs", {"title": "Guia"}, content_type="application/json"
+        )
+        self.assertGreaterEqual(response.status_code, 400)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+        self.assertEqual(self._list_docs_alias(client), REPLICA_DB_ALIAS)
+
+    def test_replica_is_never_migrated(self, _):
+        self.assertFalse(PrimaryReplicaRouter().allow_migrate(REPLICA_DB_ALIAS, "docs"))
+        self.assertTrue(PrimaryReplicaRouter().allow_migrate(DEFAULT_DB_ALIAS, "docs"))
+
+
+class WithoutReplicaTests(TransactionTestCase):
+    def test_no_cookie_and_primary_reads(self):
+        user = User.objects.create_user(
+            username="bia", email="bia@orgst.dev", password="x"
+        )
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {create_access_token(user)}")
+        response = client.post(
+            "/api/v1/docs/docs",
+            {"title": "Guia", "body_md": "# Guia"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+        self.assertEqual(client.get("/api/v1/docs/docs").status_code, 200)
@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import Client, SimpleTestCase, override_settings
+
+
+class FakePool:
+    min_size = 2
+    max_size = 10
+
+    def __init__(self, **stats):
+        self.stats = stats
+
+    def get_stats(self):
+        return self.stats
+
+
+class HealthTests(SimpleTestCase):
+    def _health(self, pool=None):
+        with mock.patch.object(connection, "pool", pool, create=True):
+            return Client().get("/api/v1/health").json()
+
+    def test_without_pool(self):
+        body = self._health()
+
+        self.assertEqual(body["status"], "ok")
+        self.assertEqual(body["database"], {"vendor": "sqlite", "pool": None})
+
+    def test_reports_pool_usage(self):
+        body = self._health(FakePool(pool_size=4, pool_available=1))
+
+        self.assertEqual(body["status"], "ok")
+        self.assertEqual(
+            body["database"]["pool"],
+            {
+                "min_size": 2,
+                "max_size": 10,
+                "size": 4,
+                "available": 1,
+                "in_use": 3,
+                "waiting": 0,
+                "timeouts": 0,
+                "saturation": 0.3,
+            },
+        )
+
+    @override_settings(DB_POOL_SATURATION_WARNING=0.8)
+    def test_degraded_when_saturated_or_waiting(self):
+        full = FakePool(pool_size=10, pool_available=1)
+        waiting = FakePool(pool_size=5, pool_available=0, requests_waiting=3)
+
+        self.assertEqual(self._health(full)["status"], "degraded")
+        self.assertEqual(self._health(waiting)["status"], "degraded")
@@ -0,0 +1,121 @@
+import itertools
+
+import pytest
+from conftest import QueryBudgetExceeded, check_query_budget
+from django.test import Client
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import Profile, Role, User, UserRole
+from apps.community.models import Skill, UserSkill
+from apps.docs.models import Document, DocumentTag, DocumentVisibility, Tag
+
+# queries por request, independentes do número de linhas
+QUERY_BUDGETS = {
+    # usuário do JWT, papéis do leitor, documentos, tags
+    "GET /api/v1/docs/docs": 4,
+    # usuário do JWT, membros + profile, papéis, skills
+    "GET /api/v1/community/members": 4,
+}
+
+_seq = itertools.count()
+
+
+def _bulk_users(n: int) -> list[User]:
+    ids = [next(_seq) for _ in range(n)]
+    users = User.objects.bulk_create(
+        User(username=f"m{i}", email=f"m{i}@orgst.dev", password="!") for i in ids
+    )
+    Profile.objects.bulk_create(
+        Profile(
+            user=u,
+            display_name=u.username,
+            github_url="https://github.com/x",
+            linkedin_url="https://linkedin.com/in/x",
+        )
+        for u in users
+    )
+    return users
+
+
+@pytest.fixture
+def reader():
+    user = User.objects.create_user(
+        username="reader", email="reader@orgst.dev", password="x"
+    )
+    UserRole.objects.create(
+        user=user, role=Role.objects.create(key="mentor", label="Mentor")
+    )
+    return user
+
+
+@pytest.fixture
+def api(reader):
+    return Client(HTTP_AUTHORIZATION=f"Bearer {create_access_token(reader)}")
+
+
+def test_list_documents_within_budget(query_budget, reader, api):
+    tags = Tag.objects.bulk_create(Tag(name=f"tag{i}") for i in range(3))
+    visibilities = list(DocumentVisibility.values)
+
+    def seed(n):
+        docs = Document.objects.bulk_create(
+            Document(
+                title=f"Doc {i}",
+                slug=f"doc-{i}",
+                visibility=visibilities[i % len(visibilities)],
+                created_by=reader,
+            )
+            for i in (next(_seq) for _ in range(n))
+        )
+        DocumentTag.objects.bulk_create(
+            DocumentTag(document=d, tag=t) for d in docs for t in tags[:2]
+        )
+
+    counts = query_budget(
+        "GET /api/v1/docs/docs",
+        budget=QUERY_BUDGETS["GET /api/v1/docs/docs"],
+        seed=seed,
+        call=lambda: api.get("/api/v1/docs/docs"),
+    )
+    assert set(counts) == {10, 100, 1000}
+
+
+def test_members_within_budget(query_budget, api):
+    roles = [Role.objects.create(key=k, label=k) for k in ("member", "coach")]
+    skills = Skill.objects.bulk_create(Skill(name=f"skill{i}") for i in range(3))
+
+    def seed(n):
+        users = _bulk_users(n)
+        UserRole.objects.bulk_create(
+            UserRole(user=u, role=r) for u in users for r in roles
+        )
+        UserSkill.objects.bulk_create(
+            UserSkill(user=u, skill=s) for u in users for s in skills
+        )
+
+    query_budget(
+        "GET /api/v1/community/members",
+        budget=QUERY_BUDGETS["GET /api/v1/community/members"],
+        seed=seed,
+        call=lambda: api.get("/api/v1/community/members"),
+    )
+
+
+@pytest.mark.django_db
+def test_harness_reports_counts_when_queries_grow_with_rows():
+    def per_row_queries():
+        for user in User.objects.all():
+            list(user.user_roles.all())
+
+    with pytest.raises(QueryBudgetExceeded) as exc:
+        check_query_budget(
+            "users loop",
+            budget=5,
+            seed=_bulk_users,
+            call=per_row_queries,
+            scales=(2, 5),
+        )
+
+    message = str(exc.value)
+    assert "2 rows=3, 5 rows=6" in message
+    assert "x5" in message
@@ -0,0 +1,96 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+
+from orgst.common.metrics import registry
+from orgst.common.middleware import RequestMetricsMiddleware
+
+User = get_user_model()
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+
+    def _records(self, logs):
+        return [json.loads(line.split(":", 2)[2]) for line in logs.output]
+
+    def test_logs_route_queries_and_serialization(self):
+        with self.assertLogs("orgst.metrics", "INFO") as logs:
+            res = Client().get("/api/v1/health")
+
+        self.assertEqual(res.status_code, 200)
+        (record,) = self._records(logs)
+        self.assertEqual(record["route"], "api/v1/health")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["queries"], 0)
+        self.assertEqual(record["response_bytes"], len(res.content))
+        self.assertGreater(record["serialization_ms"], 0)
+
+    def test_counts_sql_per_request(self):
+        User.objects.create_user(username="ana", email="ana@orgst.dev", password="x")
+
+        with self.assertLogs("orgst.metrics", "INFO") as logs:
+            Client().post(
+                "/api/v1/accounts/auth/token",
+                {"identifier": "ana", "password": "wrong"},
+                content_type="application/json",
+            )
+
+        (record,) = self._records(logs)
+        self.assertEqual(record["route"], "api/v1/accounts/auth/token")
+        self.assertGreaterEqual(record["queries"], 1)
+
+    @override_settings(METRICS_N_PLUS_ONE_THRESHOLD=3)
+    def test_flags_repeated_queries_as_n_plus_one(self):
+        users = [
+            User.objects.create_user(username=f"u{i}", email=f"u{i}@orgst.dev")
+            for i in range(4)
+        ]
+
+        def view(request):
+            for user in users:
+                User.objects.filter(pk=user.pk).exists()
+            return JsonResponse({})
+
+        middleware = RequestMetricsMiddleware(view)
+        with self.assertLogs("orgst.metrics", "WARNING") as logs:
+            middleware(RequestFactory().get("/api/v1/fake"))
+
+        (record,) = self._records(logs)
+        self.assertEqual(record["queries"], 4)
+        self.assertEqual(record["duplicate_queries"], 3)
+        self.assertEqual(record["n_plus_one"]["count"], 4)
+        self.assertIn("orgst_n_plus_one_requests_total", registry.render())
+
+    def test_ignores_paths_outside_the_api(self):
+        with self.assertNoLogs("orgst.metrics", "INFO"):
+            Client().get("/admin/login/")
+
+    @override_settings(DEBUG=True)
+    def test_metrics_endpoint_renders_prometheus_text(self):
+        Client().get("/api/v1/health")
+
+        res = Client().get("/api/v1/metrics")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain"))
+        body = res.content.decode()
+        self.assertIn(
+            'orgst_http_requests_total{method="GET",route="api/v1/health",status="200"} 1',
+            body,
+        )
+        self.assertIn("orgst_http_request_duration_seconds_bucket", body)
+        self.assertIn('orgst_invitation_outbox_emails{status="pending"} 0', body)
+        self.assertIn('orgst_password_hash_total{endpoint="auth_token"}', body)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_metrics_endpoint_requires_token_when_configured(self):
+        self.assertEqual(Client().get("/api/v1/metrics").status_code, 401)
+        res = Client(HTTP_AUTHORIZATION="Bearer s3cret").get("/api/v1/metrics")
+        self.assertEqual(res.status_code, 200)
+
+    def test_metrics_endpoint_is_closed_without_token_outside_debug(self):
+        self.assertEqual(Client().get("/api/v1/metrics").status_code, 404)
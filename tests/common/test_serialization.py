@@ -0,0 +1,96 @@
+import json
+from datetime import UTC, datetime
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from ninja import Schema
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import User
+from apps.docs.services import create_document
+from orgst.common import serialization
+from orgst.common.serialization import (
+    TrustedOutputMismatch,
+    stdlib_dumps,
+    trusted_output,
+)
+
+
+class ItemOut(Schema):
+    id: int
+    name: str
+    created_at: datetime
+
+
+NOW = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=UTC)
+
+
+def upper_dumps(data):
+    return json.dumps(data, default=str).upper().encode()
+
+
+class TrustedOutputTests(SimpleTestCase):
+    def _view(self, rows):
+        @trusted_output(list[ItemOut])
+        def view(request):
+            return rows
+
+        return view
+
+    def test_serializes_like_the_ninja_renderer(self):
+        rows = [{"id": 1, "name": "a", "created_at": NOW}]
+        response = self._view(rows)(None)
+
+        self.assertEqual(response["Content-Type"], "application/json; charset=utf-8")
+        self.assertEqual(
+            json.loads(response.content),
+            [{"id": 1, "name": "a", "created_at": "2026-01-02T03:04:05.678Z"}],
+        )
+
+    def test_validates_against_schema_when_enabled(self):
+        bad_rows = (
+            [{"id": "x", "name": "a", "created_at": NOW}],
+            # campo extra: o Ninja o removeria, então a saída divergiria
+            [{"id": 1, "name": "a", "created_at": NOW, "secret": "s"}],
+            # conversão silenciosa ("1" -> 1) também diverge
+            [{"id": "1", "name": "a", "created_at": NOW}],
+        )
+        for rows in bad_rows:
+            with self.subTest(rows=rows), self.assertRaises(TrustedOutputMismatch):
+                self._view(rows)(None)
+
+    @override_settings(API_VALIDATE_TRUSTED_OUTPUT=False)
+    def test_skips_validation_when_disabled(self):
+        rows = [{"id": 1, "name": "a", "created_at": NOW, "secret": "s"}]
+        self.assertIn(b"secret", self._view(rows)(None).content)
+
+    @override_settings(API_JSON_DUMPS="tests.common.test_serialization.upper_dumps")
+    def test_json_dumps_is_pluggable(self):
+        rows = [{"id": 1, "name": "a", "created_at": NOW}]
+        self.assertIn(b'"NAME": "A"', self._view(rows)(None).content)
+
+    def test_orjson_output_matches_stdlib(self):
+        if serialization.orjson is None:
+            self.skipTest("orjson not installed")
+        rows = [{"id": 1, "name": "ã", "created_at": NOW, "tags": [None, 1.5]}]
+        self.assertEqual(
+            json.loads(serialization.orjson_dumps(rows)),
+            json.loads(stdlib_dumps(rows)),
+        )
+
+
+class TrustedEndpointsTests(TestCase):
+    def test_list_endpoints_match_their_schemas(self):
+        user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="x"
+        )
+        create_document(
+            title="Guia", body_md="# Guia", created_by=user, tag_names=["a"]
+        )
+        headers = {"Authorization": f"Bearer {create_access_token(user)}"}
+
+        # API_VALIDATE_TRUSTED_OUTPUT está ligado nos testes: divergência = erro
+        for path in ("/api/v1/docs/docs", "/api/v1/community/members"):
+            with self.subTest(path=path):
+                response = self.client.get(path, headers=headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()), 1)
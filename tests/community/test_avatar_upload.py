@@ -0,0 +1,118 @@
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import Profile, User
+from apps.community.uploads import (
+    AvatarUploadError,
+    AvatarUploadHandler,
+    sniff_image_type,
+)
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class SniffImageTypeTests(TestCase):
+    def test_known_signatures(self):
+        self.assertEqual(sniff_image_type(PNG_BYTES), "image/png")
+        self.assertEqual(
+            sniff_image_type(b"\xff\xd8\xff\xe0" + b"\x00" * 8), "image/jpeg"
+        )
+        self.assertEqual(sniff_image_type(b"GIF89a" + b"\x00" * 6), "image/gif")
+        self.assertEqual(sniff_image_type(b"RIFF\x00\x00\x00\x00WEBP"), "image/webp")
+
+    def test_unknown_signature(self):
+        self.assertIsNone(sniff_image_type(b"<svg xmlns=..."))
+
+
+class AvatarUploadHandlerTests(TestCase):
+    def _handler(self, max_bytes=1024):
+        handler = AvatarUploadHandler(max_bytes=max_bytes)
+        handler.new_file("file", "me.png", "image/png", None)
+        return handler
+
+    def test_aborts_once_limit_is_crossed(self):
+        handler = self._handler(max_bytes=100)
+        handler.receive_data_chunk(PNG_BYTES, 0)
+        with self.assertRaises(AvatarUploadError) as ctx:
+            handler.receive_data_chunk(b"\x00" * 64, len(PNG_BYTES))
+        self.assertEqual(ctx.exception.message, "IMAGE_TOO_LARGE")
+
+    def test_rejects_by_content_length_before_reading(self):
+        handler = AvatarUploadHandler(max_bytes=100)
+        with self.assertRaises(AvatarUploadError):
+            handler.handle_raw_input(None, {}, 10 * 1024 * 1024, b"x")
+
+    def test_trusts_magic_bytes_over_declared_content_type(self):
+        handler = AvatarUploadHandler()
+        handler.new_file("file", "me.png", "image/png", None)
+        with self.assertRaises(AvatarUploadError) as ctx:
+            handler.receive_data_chunk(b"GIF-but-not-really", 0)
+        self.assertEqual(ctx.exception.message, "INVALID_IMAGE")
+
+    def test_complete_returns_sniffed_file(self):
+        handler = AvatarUploadHandler()
+        handler.new_file("file", "me.bin", "application/octet-stream", None)
+        handler.receive_data_chunk(PNG_BYTES, 0)
+        uploaded = handler.file_complete(len(PNG_BYTES))
+        self.assertEqual(uploaded.content_type, "image/png")
+        self.assertEqual(uploaded.name, "me.png")
+        self.assertEqual(uploaded.read(), PNG_BYTES)
+        uploaded.close()
+
+
+class AvatarUploadEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="x"
+        )
+        Profile.objects.create(
+            user=cls.user,
+            display_name="Ana",
+            github_url="https://github.com/ana",
+            linkedin_url="https://linkedin.com/in/ana",
+        )
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.client = Client(
+            HTTP_AUTHORIZATION=f"Bearer {create_access_token(self.user)}"
+        )
+        self.url = f"/api/v1/community/members/{self.user.id}/avatar"
+
+    def test_upload_saves_sniffed_image(self):
+        upload = SimpleUploadedFile("me.txt", PNG_BYTES, content_type="text/plain")
+        with override_settings(MEDIA_ROOT=self.media_root):
+            response = self.client.post(self.url, {"file": upload})
+
+        self.assertEqual(response.status_code, 200)
+        profile = Profile.objects.get(user=self.user)
+        self.assertTrue(profile.avatar.name.endswith(".png"))
+
+    def test_upload_rejects_non_image_even_with_image_content_type(self):
+        upload = SimpleUploadedFile(
+            "me.png", b"#!/bin/sh\necho nope\n", content_type="image/png"
+        )
+        with override_settings(MEDIA_ROOT=self.media_root):
+            response = self.client.post(self.url, {"file": upload})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "INVALID_IMAGE"})
+
+    def test_upload_rejects_oversized_file(self):
+        upload = SimpleUploadedFile(
+            "big.png",
+            PNG_BYTES + b"\x00" * (5 * 1024 * 1024),
+            content_type="image/png",
+        )
+        with override_settings(MEDIA_ROOT=self.media_root):
+            response = self.client.post(self.url, {"file": upload})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "IMAGE_TOO_LARGE"})
+        self.assertFalse(Profile.objects.get(user=self.user).avatar)
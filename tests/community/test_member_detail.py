@@ -0,0 +1,128 @@
+import json
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import Profile, Role, User, UserRole
+from apps.community.models import Skill, SkillCategory, UserSkill
+
+
+class MemberDetailEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="x"
+        )
+        Profile.objects.create(
+            user=cls.user,
+            display_name="Ana",
+            github_url="https://github.com/ana",
+            linkedin_url="https://linkedin.com/in/ana",
+        )
+        cls.role = Role.objects.create(key="mentor", label="Mentor")
+        UserRole.objects.create(user=cls.user, role=cls.role)
+        cls.python = Skill.objects.create(name="Python", category=SkillCategory.BACKEND)
+        cls.sql = Skill.objects.create(name="SQL", category=SkillCategory.SQL)
+        UserSkill.objects.create(user=cls.user, skill=cls.python, level=3)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(
+            HTTP_AUTHORIZATION=f"Bearer {create_access_token(self.user)}"
+        )
+        self.url = f"/api/v1/community/members/{self.user.id}"
+
+    def test_member_detail_is_routed(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["display_name"], "Ana")
+        self.assertEqual(payload["roles"], ["mentor"])
+        self.assertEqual(payload["skills"][0]["skill"]["name"], "Python")
+        self.assertTrue(response["ETag"])
+        self.assertTrue(response["Last-Modified"])
+
+    def test_unknown_member_is_404(self):
+        response = self.client.get("/api/v1/community/members/999999")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"detail": "MEMBER_NOT_FOUND"})
+
+    def test_query_count_cold_and_warm(self):
+        # 1 query do JWTAuth + 3 (user/profile, roles, skills)
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+        # cache quente: só a query de autenticação
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_patch_profile_invalidates_cache(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"{self.url}/profile",
+                data=json.dumps({"display_name": "Ana Maria"}),
+                content_type="application/json",
+            )
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["display_name"], "Ana Maria")
+
+    def test_put_skills_invalidates_cache_and_changes_validator(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(
+                f"{self.url}/skills",
+                data=json.dumps([{"skill_id": self.sql.id, "level": 2}]),
+                content_type="application/json",
+            )
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [s["skill"]["name"] for s in response.json()["skills"]], ["SQL"]
+        )
+
+    def _assert_revalidates_after(self, change):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return response.json()
+
+    def test_email_change_changes_validator(self):
+        def change():
+            self.user.email = "ana.maria@orgst.dev"
+            self.user.save()
+
+        self.assertEqual(
+            self._assert_revalidates_after(change)["email"], "ana.maria@orgst.dev"
+        )
+
+    def test_skill_and_role_renames_change_validator(self):
+        def rename_skill():
+            self.python.name = "Python 3"
+            self.python.save()
+
+        def rename_role():
+            self.role.key = "mentora"
+            self.role.save()
+
+        payload = self._assert_revalidates_after(rename_skill)
+        self.assertEqual(payload["skills"][0]["skill"]["name"], "Python 3")
+        payload = self._assert_revalidates_after(rename_role)
+        self.assertEqual(payload["roles"], ["mentora"])
+
+    def test_deleting_a_skill_refreshes_its_members(self):
+        payload = self._assert_revalidates_after(self.python.delete)
+        self.assertEqual(payload["skills"], [])
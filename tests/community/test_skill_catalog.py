@@ -0,0 +1,132 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import User
+from apps.community.catalog import (
+    CATALOG_VERSION_TIMEOUT,
+    get_skill_catalog,
+    invalidate_skill_catalog,
+)
+from apps.community.models import Skill, SkillCategory
+
+
+class SkillCatalogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Skill.objects.create(name="Python", category=SkillCategory.BACKEND)
+        Skill.objects.create(name="PostgreSQL", category=SkillCategory.SQL)
+        Skill.objects.create(name="React", category=SkillCategory.FRONTEND)
+        Skill.objects.create(name="pytest", category=SkillCategory.QA)
+
+    def setUp(self):
+        cache.clear()
+        invalidate_skill_catalog()
+
+    def test_catalog_is_served_from_memory_after_first_load(self):
+        get_skill_catalog()
+        with self.assertNumQueries(0):
+            catalog = get_skill_catalog()
+        self.assertEqual(len(catalog.skills), 4)
+
+    def test_prefix_lookup_is_case_insensitive_and_ordered(self):
+        catalog = get_skill_catalog()
+        names = [s["name"] for s in catalog.filter(prefix="p")]
+        self.assertEqual(names, ["PostgreSQL", "Python", "pytest"])
+        self.assertEqual(
+            [s["name"] for s in catalog.filter(prefix="pyt")], ["Python", "pytest"]
+        )
+
+    def test_category_and_prefix_combined(self):
+        catalog = get_skill_catalog()
+        names = [
+            s["name"]
+            for s in catalog.filter(category=SkillCategory.BACKEND, prefix="py")
+        ]
+        self.assertEqual(names, ["Python"])
+        self.assertEqual(catalog.filter(category="design"), [])
+
+    def test_save_signal_publishes_new_version_on_commit(self):
+        before = get_skill_catalog()
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name="Docker", category=SkillCategory.DEVOPS)
+
+        after = get_skill_catalog()
+        self.assertNotEqual(before.version, after.version)
+        self.assertIn("Docker", [s["name"] for s in after.skills])
+
+    def test_delete_signal_publishes_new_version_on_commit(self):
+        before = get_skill_catalog()
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.filter(name="React").delete()
+
+        after = get_skill_catalog()
+        self.assertNotEqual(before.version, after.version)
+        self.assertNotIn("React", [s["name"] for s in after.skills])
+
+    def test_version_expires_so_other_processes_see_edits(self):
+        before = get_skill_catalog()
+        # update() não dispara signals: equivale à escrita de outro processo
+        # com cache locmem próprio
+        Skill.objects.filter(name="React").update(name="Vue")
+        self.assertIs(get_skill_catalog(), before)
+
+        later = time.time() + CATALOG_VERSION_TIMEOUT + 1
+        with mock.patch("django.core.cache.backends.locmem.time.time") as now:
+            now.return_value = later
+            after = get_skill_catalog()
+        self.assertNotEqual(before.version, after.version)
+        self.assertIn("Vue", [s["name"] for s in after.skills])
+
+    def test_recheck_keeps_version_when_nothing_changed(self):
+        before = get_skill_catalog()
+        invalidate_skill_catalog()
+        self.assertEqual(get_skill_catalog().version, before.version)
+
+
+class SkillCatalogEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="x"
+        )
+        Skill.objects.create(name="Django", category=SkillCategory.BACKEND)
+        Skill.objects.create(name="Docker", category=SkillCategory.DEVOPS)
+
+    def setUp(self):
+        cache.clear()
+        invalidate_skill_catalog()
+        self.client = Client(
+            HTTP_AUTHORIZATION=f"Bearer {create_access_token(self.user)}"
+        )
+
+    def test_list_skills_returns_etag_and_honors_if_none_match(self):
+        response = self.client.get("/api/v1/community/skills", {"prefix": "do"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([s["name"] for s in response.json()], ["Docker"])
+        etag = response["ETag"]
+
+        revalidated = self.client.get(
+            "/api/v1/community/skills",
+            {"prefix": "do"},
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated["ETag"], etag)
+
+    def test_etag_changes_after_catalog_edit(self):
+        etag = self.client.get("/api/v1/community/skills")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name="Kubernetes", category=SkillCategory.DEVOPS)
+
+        response = self.client.get("/api/v1/community/skills", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()), 3)
+
+    def test_q_keeps_substring_semantics(self):
+        response = self.client.get("/api/v1/community/skills", {"q": "ang"})
+        self.assertEqual([s["name"] for s in response.json()], ["Django"])
@@ -0,0 +1,183 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+from apps.accounts.auth import create_access_token
+from apps.accounts.models import Profile, User
+from apps.community import typeahead
+from apps.community.catalog import invalidate_skill_catalog
+from apps.community.models import Skill, SkillCategory
+from apps.community.typeahead import (
+    TYPEAHEAD_LOG_WINDOW,
+    TYPEAHEAD_VERSION_KEY,
+    TYPEAHEAD_VERSION_TIMEOUT,
+    MemberPrefixIndex,
+    get_member_index,
+    refresh_member,
+    reset_member_index,
+)
+
+
+class MemberPrefixIndexTests(TestCase):
+    def setUp(self):
+        self.index = MemberPrefixIndex()
+        self.index.upsert(user_id=1, username="ana", display_name="Ana Silva")
+        self.index.upsert(user_id=2, username="anderson", display_name=None)
+        self.index.upsert(user_id=3, username="bia", display_name="Beatriz Silveira")
+
+    def test_matches_full_name_words_and_username(self):
+        self.assertEqual([m["id"] for m in self.index.search("an", limit=10)], [1, 2])
+        self.assertEqual([m["id"] for m in self.index.search("sil", limit=10)], [1, 3])
+        self.assertEqual(
+            self.index.search("BIA", limit=10)[0]["display_name"], "Beatriz Silveira"
+        )
+
+    def test_limit_and_dedupe(self):
+        # "ana" casa com display_name completo, palavra e username do mesmo membro
+        self.assertEqual(len(self.index.search("ana", limit=10)), 1)
+        self.assertEqual(len(self.index.search("a", limit=1)), 1)
+
+    def test_upsert_replaces_old_terms(self):
+        self.index.upsert(user_id=1, username="ana", display_name="Ana Costa")
+        self.assertEqual([m["id"] for m in self.index.search("silva", limit=10)], [])
+        self.assertEqual([m["id"] for m in self.index.search("costa", limit=10)], [1])
+
+    def test_discard(self):
+        self.index.discard(3)
+        self.assertEqual(self.index.search("bea", limit=10), [])
+        self.assertEqual(len(self.index), 2)
+
+
+class TypeaheadEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="ana", email="ana@orgst.dev", password="x"
+        )
+        cls.profile = Profile.objects.create(
+            user=cls.user,
+            display_name="Ana Silva",
+            github_url="https://github.com/ana",
+            linkedin_url="https://linkedin.com/in/ana",
+        )
+        Skill.objects.create(name="Angular", category=SkillCategory.FRONTEND)
+        Skill.objects.create(name="Python", category=SkillCategory.BACKEND)
+
+    def setUp(self):
+        cache.clear()
+        invalidate_skill_catalog()
+        reset_member_index()
+        self.client = Client(
+            HTTP_AUTHORIZATION=f"Bearer {create_access_token(self.user)}"
+        )
+
+    def test_returns_members_and_skills_by_prefix(self):
+        response = self.client.get("/api/v1/community/typeahead", {"q": "an"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "members": [
+                    {"id": self.user.id, "username": "ana", "display_name": "Ana Silva"}
+                ],
+                "skills": [
+                    {
+                        "id": Skill.objects.get(name="Angular").id,
+                        "name": "Angular",
+                        "category": "frontend",
+                    }
+                ],
+            },
+        )
+
+    def test_warm_lookup_does_not_hit_the_index_tables(self):
+        self.client.get("/api/v1/community/typeahead", {"q": "an"})
+        # só a query do JWTAuth
+        with self.assertNumQueries(1):
+            self.client.get("/api/v1/community/typeahead", {"q": "si"})
+
+    def test_profile_change_refreshes_index_incrementally(self):
+        index = get_member_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.display_name = "Ana Costa"
+            self.profile.save()
+
+        self.assertIs(get_member_index(), index)
+        self.assertEqual(index.search("silva", limit=5), [])
+        self.assertEqual(
+            [m["id"] for m in index.search("costa", limit=5)], [self.user.id]
+        )
+
+    def test_deactivated_user_leaves_the_index(self):
+        index = get_member_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save(update_fields=["is_active"])
+
+        self.assertIs(get_member_index(), index)
+        self.assertEqual(index.search("ana", limit=5), [])
+
+    def _ids(self, index, prefix):
+        return [m["id"] for m in index.search(prefix, limit=5)]
+
+    def test_concurrent_writers_reach_every_index_without_rebuild(self):
+        index = get_member_index()
+        bia = User.objects.create_user(username="bia", email="bia@orgst.dev")
+        # update() não dispara signals: as publicações abaixo fazem o papel
+        # de dois outros processos que escreveram ao mesmo tempo
+        Profile.objects.filter(user=self.user).update(display_name="Ana Costa")
+        refresh_member(self.user.id)
+        refresh_member(bia.id)
+
+        with mock.patch.object(typeahead, "_build_index") as build:
+            self.assertIs(get_member_index(), index)
+        build.assert_not_called()
+        self.assertEqual(self._ids(index, "costa"), [self.user.id])
+        self.assertEqual(self._ids(index, "bia"), [bia.id])
+
+    def test_rebuilds_when_out_of_the_log_window(self):
+        index = get_member_index()
+        cache.set(TYPEAHEAD_VERSION_KEY, index.version + TYPEAHEAD_LOG_WINDOW + 1)
+        self.assertIsNot(get_member_index(), index)
+
+    def test_rebuilds_when_a_log_entry_is_missing(self):
+        index = get_member_index()
+        refresh_member(self.user.id)
+        cache.delete(typeahead._change_key(index.version + 1))
+        self.assertIsNot(get_member_index(), index)
+
+    def test_counter_restart_forces_rebuild(self):
+        index = get_member_index()
+        cache.delete(TYPEAHEAD_VERSION_KEY)
+        refresh_member(self.user.id)
+        self.assertIsNot(get_member_index(), index)
+
+    def test_version_expires_so_other_processes_see_edits(self):
+        index = get_member_index()
+        # update() não dispara signals e publicar no locmem de outro processo
+        # não chega aqui: só a expiração da versão traz a mudança
+        Profile.objects.filter(user=self.user).update(display_name="Ana Costa")
+        self.assertIs(get_member_index(), index)
+        self.assertEqual(self._ids(index, "costa"), [])
+
+        later = time.time() + TYPEAHEAD_VERSION_TIMEOUT + 1
+        with mock.patch("django.core.cache.backends.locmem.time.time") as now:
+            now.return_value = later
+            rebuilt = get_member_index()
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual(self._ids(rebuilt, "costa"), [self.user.id])
+
+    def test_writes_do_not_postpone_the_expiry(self):
+        index = get_member_index()
+        start = time.time()
+        with mock.patch("django.core.cache.backends.locmem.time.time") as now:
+            # um processo que só escreve também precisa ver os outros
+            now.return_value = start + TYPEAHEAD_VERSION_TIMEOUT - 1
+            refresh_member(self.user.id)
+            self.assertIs(get_member_index(), index)
+
+            now.return_value = start + TYPEAHEAD_VERSION_TIMEOUT + 1
+            self.assertIsNot(get_member_index(), index)
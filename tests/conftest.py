@@ -0,0 +1,82 @@
+"""
+Harness de orçamento de queries por endpoint.
+
+`query_budget` executa a mesma chamada com a base semeada em escalas
+crescentes (10, 100, 1000 linhas por padrão) e falha se o número de queries
+crescer com as linhas (N+1) ou passar do orçamento declarado. A mensagem de
+falha traz a contagem por escala e o SQL repetido da maior escala.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Iterable
+
+import pytest
+from django.db import connection
+
+QUERY_BUDGET_SCALES = (10, 100, 1000)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class _SQLCounter:
+    """`execute_wrapper` que agrupa por template de SQL (sem os parâmetros)."""
+
+    def __init__(self) -> None:
+        self.templates: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.templates[sql] += 1
+        return execute(sql, params, many, context)
+
+    @property
+    def total(self) -> int:
+        return sum(self.templates.values())
+
+
+def _report(label: str, budget: int, counts: dict[int, int], sql: _SQLCounter) -> str:
+    per_scale = ", ".join(f"{rows} rows={n}" for rows, n in counts.items())
+    lines = [f"{label}: budget {budget} queries; got {per_scale}"]
+    for template, n in sql.templates.most_common(3):
+        if n > 1:
+            lines.append(f"  x{n} {template[:200]}")
+    return "\n".join(lines)
+
+
+def check_query_budget(
+    label: str,
+    *,
+    budget: int,
+    seed: Callable[[int], object],
+    call: Callable[[], object],
+    scales: Iterable[int] = QUERY_BUDGET_SCALES,
+) -> dict[int, int]:
+    """
+    `seed(n)` recebe quantas linhas acrescentar para chegar à próxima escala;
+    `call()` faz o request (respostas com status >= 400 falham o teste).
+    Retorna {escala: queries}.
+    """
+    counts: dict[int, int] = {}
+    seeded = 0
+    for rows in sorted(scales):
+        seed(rows - seeded)
+        seeded = rows
+        sql = _SQLCounter()
+        with connection.execute_wrapper(sql):
+            response = call()
+        status = getattr(response, "status_code", 200)
+        assert status < 400, f"{label}: status {status} at {rows} rows"
+        counts[rows] = sql.total
+
+    if len(set(counts.values())) > 1 or max(counts.values()) > budget:
+        raise QueryBudgetExceeded(_report(label, budget, counts, sql))
+    return counts
+
+
+@pytest.fixture
+def query_budget(db):
+    """Fixture: `query_budget("GET /x", budget=3, seed=..., call=...)`."""
+    return check_query_budget
@@ -0,0 +1,59 @@
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.kanban.models import Column, Task
+from apps.kanban.services import create_default_board, move_task, reorder_columns
+from apps.projects.models import Project
+
+
+class PositionShiftTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(username="owner", password="x")
+        cls.project = Project.objects.create(name="Kanban", owner=owner)
+        cls.board = create_default_board(cls.project)
+        cls.backlog, cls.doing, cls.done = cls.board.columns.order_by("position")
+        cls.tasks = Task.objects.bulk_create(
+            Task(
+                project=cls.project,
+                column=cls.backlog,
+                position=i,
+                title=f"T{i}",
+                created_by=owner,
+            )
+            for i in range(1, 6)
+        )
+
+    def _titles(self, column):
+        return list(
+            Task.objects.filter(column=column)
+            .order_by("position")
+            .values_list("title", "position")
+        )
+
+    def test_move_within_column_keeps_positions_compact(self):
+        move_task(self.tasks[0].id, self.backlog.id, 4)
+
+        self.assertEqual(
+            self._titles(self.backlog),
+            [("T2", 1), ("T3", 2), ("T4", 3), ("T1", 4), ("T5", 5)],
+        )
+
+    def test_move_to_other_column_shifts_both_columns(self):
+        move_task(self.tasks[1].id, self.doing.id, 1)
+        move_task(self.tasks[2].id, self.doing.id, 1)
+
+        self.assertEqual(self._titles(self.backlog), [("T1", 1), ("T4", 2), ("T5", 3)])
+        self.assertEqual(self._titles(self.doing), [("T3", 1), ("T2", 2)])
+
+    def test_reorder_columns_swaps_positions(self):
+        reorder_columns(self.board, [self.done.id, self.backlog.id, self.doing.id])
+
+        self.assertEqual(
+            list(
+                Column.objects.filter(board=self.board)
+                .order_by("position")
+                .values_list("name", flat=True)
+            ),
+            ["Done", "Backlog", "Doing"],
+        )